@@ -1,9 +1,12 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify
+import queue
 import threading
 from datetime import datetime, timezone
 
 from backend.database import db, User, SyncJob, ActivityLog
 from backend.sync.orchestrator import SyncOrchestrator
+from backend.sync.events import job_events, format_sse, TERMINAL_EVENTS
+from backend.sync.progress import job_progress
 from backend.auth.token_manager import TokenManager
 from backend.scheduler.manager import SchedulerManager
 
@@ -13,6 +16,9 @@ api_bp = Blueprint('api', __name__, url_prefix='/api')
 # Global scheduler instance
 scheduler_manager = SchedulerManager()
 
+# Comment line sent on idle event streams so proxies keep the connection open
+SSE_KEEPALIVE_SECONDS = 15
+
 
 @api_bp.route('/health', methods=['GET'])
 def health():
@@ -107,14 +113,14 @@ def sync_ytmusic_to_spotify():
     })
 
 
-@api_bp.route('/jobs/<job_id>', methods=['GET'])
-def get_job(job_id):
-    """Get sync job status"""
-    job = db.session.get(SyncJob, job_id)
-    if not job:
-        return jsonify({"error": "Job not found"}), 404
-    
-    return jsonify({
+def _job_details(job):
+    """
+    Full status of a sync job, as returned by /jobs/<job_id>
+
+    While the job runs, its current track and latest counters come from the
+    in-memory progress registry; the row only holds periodically flushed counters.
+    """
+    details = {
         "id": job.id,
         "status": job.status,
         "job_type": job.job_type,
@@ -132,6 +138,61 @@ def get_job(job_id):
         "current_track_name": job.current_track_name,
         "current_track_artist": job.current_track_artist,
         "current_track_image_url": job.current_track_image_url,
+    }
+    details.update(job_progress.get(job.id))
+    return details
+
+
+@api_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Get sync job status"""
+    job = db.session.get(SyncJob, job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    
+    return jsonify(_job_details(job))
+
+
+@api_bp.route('/jobs/<job_id>/events', methods=['GET'])
+def job_events_stream(job_id):
+    """
+    Stream live sync job events (Server-Sent Events)
+
+    The first event is a 'snapshot' of the job; after that the orchestrator's
+    progress, track, matched, failed and log events follow as they happen,
+    until the final 'status' event. The database is only read once.
+    """
+    # Subscribe before reading the job so nothing published in between is lost
+    subscriber = job_events.subscribe(job_id)
+    job = db.session.get(SyncJob, job_id)
+    if not job:
+        job_events.unsubscribe(job_id, subscriber)
+        return jsonify({"error": "Job not found"}), 404
+    
+    snapshot = _job_details(job)
+    
+    def generate():
+        try:
+            yield format_sse('snapshot', snapshot)
+            if snapshot['status'] not in ('pending', 'running'):
+                return
+            
+            while True:
+                try:
+                    event, data = subscriber.get(timeout=SSE_KEEPALIVE_SECONDS)
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+                    continue
+                
+                yield format_sse(event, data)
+                if event in TERMINAL_EVENTS:
+                    return
+        finally:
+            job_events.unsubscribe(job_id, subscriber)
+    
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',
     })
 
 
@@ -152,7 +213,9 @@ def get_user_jobs(user_id):
         "added_tracks": job.added_tracks,
         "failed_tracks": job.failed_tracks,
         "started_at": job.started_at.isoformat() if job.started_at else None,
-        "completed_at": job.completed_at.isoformat() if job.completed_at else None
+        "completed_at": job.completed_at.isoformat() if job.completed_at else None,
+        # Live counters and current track of running jobs
+        **(job_progress.get(job.id) if job.status in ('pending', 'running') else {})
     } for job in jobs])
 
 
@@ -1,26 +1,79 @@
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from collections import OrderedDict
 import base64
 import os
-from backend.config import MASTER_PASSWORD
+import sys
+import threading
+import time
+from backend.config import (
+    MASTER_PASSWORD,
+    ENCRYPTION_KEY,
+    ENCRYPTION_KEY_FILE,
+    TOKEN_DECRYPT_CACHE_SIZE,
+    TOKEN_DECRYPT_CACHE_TTL_SECONDS,
+)
+
+SALT = b'musync_salt_2024'
+KDF_ITERATIONS = 100000
+
+
+def derive_key(password: str) -> bytes:
+    """Derive the Fernet key for a master password (slow by design)"""
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=SALT,
+        iterations=KDF_ITERATIONS,
+    )
+    return base64.urlsafe_b64encode(kdf.derive(password.encode()))
+
+
+def load_configured_key() -> bytes:
+    """Pre-derived key from ENCRYPTION_KEY or ENCRYPTION_KEY_FILE, if either is set"""
+    if ENCRYPTION_KEY:
+        return ENCRYPTION_KEY.strip().encode()
+    if ENCRYPTION_KEY_FILE:
+        with open(ENCRYPTION_KEY_FILE, 'rb') as f:
+            return f.read().strip()
+    return None
+
 
 class TokenEncryptor:
-    """Encrypt and decrypt OAuth tokens"""
+    """
+    Encrypt and decrypt OAuth tokens
+
+    The key is only derived on first use, so importing this module stays cheap.
+    Recently decrypted tokens are kept in a small TTL cache keyed by ciphertext,
+    so hot refresh paths skip the Fernet decrypt.
+    """
     
-    def __init__(self, master_password: str = None):
-        password = master_password or MASTER_PASSWORD
-        salt = b'musync_salt_2024'
-        
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-        )
-        
-        key = base64.urlsafe_b64encode(kdf.derive(password.encode()))
-        self.fernet = Fernet(key)
+    def __init__(self, master_password: str = None, key: bytes = None):
+        """
+        Args:
+            master_password: Password to derive the key from (default: MASTER_PASSWORD,
+                unless a pre-derived key is configured)
+            key: Pre-derived Fernet key; skips PBKDF2 entirely
+        """
+        self._master_password = master_password
+        self._key = key
+        self._fernet = None
+        self._lock = threading.Lock()
+        self._decrypted = OrderedDict()
+    
+    @property
+    def fernet(self) -> Fernet:
+        if self._fernet is None:
+            with self._lock:
+                if self._fernet is None:
+                    key = self._key
+                    if key is None and self._master_password is None:
+                        key = load_configured_key()
+                    if key is None:
+                        key = derive_key(self._master_password or MASTER_PASSWORD)
+                    self._fernet = Fernet(key)
+        return self._fernet
     
     def encrypt(self, token: str) -> str:
         """Encrypt a token string"""
@@ -29,7 +82,32 @@ class TokenEncryptor:
     
     def decrypt(self, encrypted_token: str) -> str:
         """Decrypt a token string"""
+        now = time.monotonic()
+        with self._lock:
+            cached = self._decrypted.get(encrypted_token)
+            if cached and cached[1] > now:
+                self._decrypted.move_to_end(encrypted_token)
+                return cached[0]
+        
         encrypted_bytes = base64.urlsafe_b64decode(encrypted_token)
-        return self.fernet.decrypt(encrypted_bytes).decode()
+        token = self.fernet.decrypt(encrypted_bytes).decode()
+        
+        if TOKEN_DECRYPT_CACHE_SIZE > 0:
+            with self._lock:
+                self._decrypted[encrypted_token] = (token, now + TOKEN_DECRYPT_CACHE_TTL_SECONDS)
+                self._decrypted.move_to_end(encrypted_token)
+                while len(self._decrypted) > TOKEN_DECRYPT_CACHE_SIZE:
+                    self._decrypted.popitem(last=False)
+        return token
+    
+    def clear_cache(self):
+        """Forget all decrypted tokens"""
+        with self._lock:
+            self._decrypted.clear()
 
 encryptor = TokenEncryptor()
+
+
+if __name__ == '__main__':
+    # Print the key for MASTER_PASSWORD, to be set as ENCRYPTION_KEY or stored in ENCRYPTION_KEY_FILE
+    sys.stdout.write(derive_key(MASTER_PASSWORD).decode() + "\n")
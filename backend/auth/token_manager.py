@@ -1,4 +1,5 @@
 import requests
+import threading
 import time
 from datetime import datetime, timedelta, timezone
 from backend.database import db, Credential
@@ -7,6 +8,16 @@ from backend.config import SPOTIFY_CLIENT_ID, SPOTIFY_CLIENT_SECRET
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 
+# Cached access tokens are refreshed this long before they expire
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+# Lifetime assumed when a provider does not report one
+DEFAULT_TOKEN_LIFETIME = timedelta(hours=1)
+
+# Process-local access token cache: (user_id, service) -> (access token, expiry)
+_access_tokens = {}
+_refresh_locks = {}
+_cache_lock = threading.Lock()
+
 
 class TokenManager:
     """Handle OAuth token refresh and validation"""
@@ -37,6 +48,10 @@ class TokenManager:
             db.session.add(credential)
         
         db.session.commit()
+        
+        # A re-linked account (or new scopes) must not keep using the old access token
+        with _cache_lock:
+            _access_tokens.pop((user_id, service), None)
         return credential
     
     @staticmethod
@@ -69,8 +84,72 @@ class TokenManager:
         return credential.access_token_expiry > (datetime.now(timezone.utc).replace(tzinfo=None) - expiry_buffer)
     
     @staticmethod
-    def refresh_spotify_token(user_id: str):
+    def _cached_access_token(user_id: str, service: str) -> str:
+        """Cached access token, or None if missing or about to expire"""
+        with _cache_lock:
+            cached = _access_tokens.get((user_id, service))
+        if not cached:
+            return None
+        access_token, expiry = cached
+        if expiry - TOKEN_REFRESH_MARGIN <= datetime.now(timezone.utc).replace(tzinfo=None):
+            return None
+        return access_token
+    
+    @staticmethod
+    def _refresh_lock(user_id: str, service: str) -> threading.Lock:
+        with _cache_lock:
+            return _refresh_locks.setdefault((user_id, service), threading.Lock())
+    
+    @staticmethod
+    def clear_token_cache(user_id: str = None):
+        """Forget cached access tokens (for one user, or everyone)"""
+        with _cache_lock:
+            for key in list(_access_tokens):
+                if user_id is None or key[0] == user_id:
+                    del _access_tokens[key]
+    
+    @staticmethod
+    def refresh_access_token(user_id: str, service: str, stale_token: str = None) -> str:
+        """
+        Refresh an access token, collapsing concurrent refreshes into one
+        
+        Callers that arrive while a refresh is in flight wait for it and reuse
+        its token instead of starting their own.
+        
+        Args:
+            stale_token: The token that was just rejected, if any. A fresh cached
+                token different from it is returned without refreshing again.
+        """
+        with TokenManager._refresh_lock(user_id, service):
+            cached = TokenManager._cached_access_token(user_id, service)
+            if cached and cached != stale_token:
+                return cached
+            
+            if service == 'spotify':
+                access_token, expiry = TokenManager._refresh_spotify(user_id)
+            elif service == 'ytmusic':
+                access_token, expiry = TokenManager._refresh_youtube(user_id)
+            else:
+                raise ValueError(f"Unknown service: {service}")
+            
+            expiry = expiry or datetime.now(timezone.utc).replace(tzinfo=None) + DEFAULT_TOKEN_LIFETIME
+            with _cache_lock:
+                _access_tokens[(user_id, service)] = (access_token, expiry)
+            return access_token
+    
+    @staticmethod
+    def refresh_spotify_token(user_id: str, stale_token: str = None):
         """Refresh Spotify access token"""
+        return TokenManager.refresh_access_token(user_id, 'spotify', stale_token)
+    
+    @staticmethod
+    def refresh_youtube_token(user_id: str, stale_token: str = None):
+        """Refresh YouTube Music access token"""
+        return TokenManager.refresh_access_token(user_id, 'ytmusic', stale_token)
+    
+    @staticmethod
+    def _refresh_spotify(user_id: str):
+        """Exchange the Spotify refresh token; returns (access token, expiry)"""
         refresh_token = TokenManager.get_refresh_token(user_id, 'spotify')
         if not refresh_token:
             raise ValueError("No refresh token found for Spotify")
@@ -105,11 +184,11 @@ class TokenManager:
             access_token_expiry=expiry
         )
         
-        return access_token
+        return access_token, expiry
     
     @staticmethod
-    def refresh_youtube_token(user_id: str):
-        """Refresh YouTube Music access token"""
+    def _refresh_youtube(user_id: str):
+        """Exchange the YouTube Music refresh token; returns (access token, expiry)"""
         refresh_token = TokenManager.get_refresh_token(user_id, 'ytmusic')
         if not refresh_token:
             raise ValueError("No refresh token found for YouTube Music")
@@ -136,19 +215,17 @@ class TokenManager:
             access_token_expiry=expiry
         )
         
-        return access_token
+        return access_token, expiry
     
     @staticmethod
     def get_access_token(user_id: str, service: str) -> str:
-        """Get valid access token, refresh if needed"""
-        if not TokenManager.is_token_valid(user_id, service):
-            if service == 'spotify':
-                return TokenManager.refresh_spotify_token(user_id)
-            elif service == 'ytmusic':
-                return TokenManager.refresh_youtube_token(user_id)
-            else:
-                raise ValueError(f"Unknown service: {service}")
-        
-        # Token still valid, return current
-        credential = TokenManager.get_credential(user_id, service)
-        return credential.access_token if hasattr(credential, 'access_token') else None
+        """
+        Get valid access token, refresh if needed
+        
+        Tokens are served from the in-memory cache without touching the database,
+        and refreshed proactively once they are within TOKEN_REFRESH_MARGIN of expiry.
+        """
+        access_token = TokenManager._cached_access_token(user_id, service)
+        if access_token:
+            return access_token
+        return TokenManager.refresh_access_token(user_id, service)
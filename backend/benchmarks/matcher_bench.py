@@ -0,0 +1,266 @@
+"""
+Offline micro-benchmark for backend.sync.matcher
+
+Generates a synthetic catalogue (Latin and non-Latin scripts, feat. credits,
+remasters, live versions, covers) and reports throughput, per-query latency
+percentiles and precision/recall at the match threshold.
+
+Usage:
+    python -m backend.benchmarks.matcher_bench --pairs 100000
+    python -m backend.benchmarks.matcher_bench --pairs 1000000 --modes batch matrix --json
+"""
+import argparse
+import json
+import random
+import sys
+import time
+
+import numpy as np
+
+from backend.sync.matcher import (
+    calculate_match_score,
+    clear_normalize_cache,
+    find_best_matches,
+    normalize_cache_info,
+    score_candidates,
+)
+
+MODES = ('scalar', 'batch', 'matrix')
+
+# Word pools per script so titles and artists are not all ASCII
+WORDS = {
+    'latin': [
+        'love', 'night', 'heart', 'fire', 'dream', 'summer', 'blue', 'river', 'light', 'dance',
+        'gold', 'shadow', 'rain', 'city', 'wild', 'echo', 'stars', 'ocean', 'young', 'forever',
+        'corazón', 'canción', 'señorita', 'café', 'été', 'liebe', 'nacht', 'größer',
+    ],
+    'cyrillic': ['любовь', 'ночь', 'город', 'звезда', 'небо', 'кино', 'группа', 'крови', 'весна', 'река'],
+    'japanese': ['夜', '駆ける', '恋', '花火', '桜', '東京', '夢', '青い', '空', '群青'],
+    'korean': ['사랑', '밤', '꿈', '별', '하늘', '너', '봄날', '눈물', '시간', '바다'],
+    'arabic': ['حبيبي', 'ليل', 'قلب', 'نور', 'بحر', 'سماء', 'عيون', 'حلم'],
+    'devanagari': ['दिल', 'प्यार', 'रात', 'सपना', 'चाँद', 'तेरे', 'बिना', 'गाना'],
+}
+SCRIPTS = list(WORDS)
+SCRIPT_WEIGHTS = [0.55, 0.1, 0.1, 0.1, 0.075, 0.075]
+
+FEAT_FORMATS = ['{title} (feat. {artist})', '{title} [ft. {artist}]', '{title} feat. {artist}']
+REMASTER_FORMATS = ['{title} - Remastered {year}', '{title} - {year} Remaster', '{title} (Remastered)']
+
+
+def _phrase(rng, script: str, low: int, high: int) -> str:
+    words = rng.choices(WORDS[script], k=rng.randint(low, high))
+    if script == 'latin':
+        words = [w.capitalize() for w in words]
+    return ' '.join(words)
+
+
+def _song(rng) -> dict:
+    script = rng.choices(SCRIPTS, SCRIPT_WEIGHTS)[0]
+    return {
+        'name': _phrase(rng, script, 1, 4),
+        'artists': [_phrase(rng, script, 1, 2) for _ in range(rng.choice([1, 1, 1, 2, 3]))],
+        'duration_ms': rng.randint(120000, 420000),
+        'script': script,
+    }
+
+
+def _true_variant(rng, song: dict) -> dict:
+    """Same recording as listed on the other service, with cosmetic differences"""
+    name = song['name']
+    artists = list(song['artists'])
+    roll = rng.random()
+    if roll < 0.2 and len(artists) > 1:
+        # Featured artist moved from the artist list into the title
+        name = rng.choice(FEAT_FORMATS).format(title=name, artist=artists.pop())
+    elif roll < 0.35:
+        name = rng.choice(REMASTER_FORMATS).format(title=name, year=rng.randint(1995, 2020))
+    elif roll < 0.5:
+        name = name.upper() if rng.random() < 0.5 else name.lower()
+    return {
+        'name': name,
+        'artists': artists,
+        'duration_ms': song['duration_ms'] + rng.randint(-2500, 2500),
+    }
+
+
+def _hard_negative(rng, song: dict) -> dict:
+    """A different recording that looks similar"""
+    roll = rng.random()
+    if roll < 0.35:
+        # Live version: different recording, usually longer
+        return {
+            'name': f"{song['name']} (Live)",
+            'artists': list(song['artists']),
+            'duration_ms': song['duration_ms'] + rng.randint(15000, 90000),
+        }
+    if roll < 0.7:
+        # Cover by someone else
+        return {
+            'name': song['name'],
+            'artists': [_phrase(rng, song['script'], 1, 2)],
+            'duration_ms': song['duration_ms'] + rng.randint(-30000, 30000),
+        }
+    # Another song by the same artist
+    other = _song(rng)
+    other['artists'] = list(song['artists'])
+    return other
+
+
+def generate_catalogue(n_queries: int, candidates_per_query: int = 5,
+                       match_rate: float = 0.85, seed: int = 42):
+    """
+    Yield (query, candidates, true_index) tuples
+
+    true_index is the position of the real match in candidates, or None when
+    the search results do not contain the query track at all.
+    """
+    rng = random.Random(seed)
+    for _ in range(n_queries):
+        song = _song(rng)
+        query = {k: song[k] for k in ('name', 'artists', 'duration_ms')}
+
+        candidates = []
+        while len(candidates) < candidates_per_query:
+            candidates.append(_hard_negative(rng, song) if rng.random() < 0.7 else _song(rng))
+
+        true_index = None
+        if rng.random() < match_rate:
+            true_index = rng.randrange(candidates_per_query)
+            candidates[true_index] = _true_variant(rng, song)
+
+        for candidate in candidates:
+            candidate.pop('script', None)
+        yield query, candidates, true_index
+
+
+def _best_scalar(query, candidates, threshold):
+    best_index, best_score = None, 0
+    for i, candidate in enumerate(candidates):
+        score = calculate_match_score(query, candidate, threshold)
+        if score > best_score:
+            best_index, best_score = i, score
+    return best_index
+
+
+def _best_batch(query, candidates, threshold):
+    # score_candidates directly: find_best_match_with_score picks the scalar loop for short lists
+    scores = score_candidates(query, candidates, threshold)
+    if not len(scores):
+        return None
+    best = int(np.argmax(scores))
+    return best if scores[best] > 0 else None
+
+
+def run_mode(mode: str, n_queries: int, candidates_per_query: int, threshold: float,
+             seed: int, chunk_size: int = 256) -> dict:
+    """Benchmark one matcher entry point over a freshly generated catalogue"""
+    clear_normalize_cache()
+    latencies = []
+    tp = fp = fn = 0
+    elapsed = 0.0
+
+    catalogue = generate_catalogue(n_queries, candidates_per_query, seed=seed)
+    while True:
+        chunk = [item for _, item in zip(range(chunk_size), catalogue)]
+        if not chunk:
+            break
+
+        if mode == 'matrix':
+            start = time.perf_counter()
+            results = find_best_matches([q for q, _, _ in chunk], [c for _, c, _ in chunk], threshold)
+            took = time.perf_counter() - start
+            elapsed += took
+            # Per-query latency is the chunk time amortized over its queries
+            latencies.extend([took / len(chunk)] * len(chunk))
+            predictions = [
+                None if match is None else next(i for i, c in enumerate(candidates) if c is match)
+                for (match, _), (_, candidates, _) in zip(results, chunk)
+            ]
+        else:
+            best = _best_scalar if mode == 'scalar' else _best_batch
+            predictions = []
+            for query, candidates, _ in chunk:
+                start = time.perf_counter()
+                predictions.append(best(query, candidates, threshold))
+                took = time.perf_counter() - start
+                elapsed += took
+                latencies.append(took)
+
+        for predicted, (_, _, true_index) in zip(predictions, chunk):
+            if predicted is not None and predicted == true_index:
+                tp += 1
+            else:
+                if predicted is not None:
+                    fp += 1
+                if true_index is not None:
+                    fn += 1
+
+    pairs = n_queries * candidates_per_query
+    latencies_us = np.array(latencies) * 1e6
+    cache = normalize_cache_info()
+    lookups = cache['hits'] + cache['misses']
+    return {
+        'mode': mode,
+        'queries': n_queries,
+        'pairs': pairs,
+        'seconds': round(elapsed, 4),
+        'pairs_per_second': round(pairs / elapsed, 1) if elapsed else None,
+        'latency_us': {
+            'p50': round(float(np.percentile(latencies_us, 50)), 1),
+            'p95': round(float(np.percentile(latencies_us, 95)), 1),
+            'p99': round(float(np.percentile(latencies_us, 99)), 1),
+        },
+        'precision': round(tp / (tp + fp), 4) if tp + fp else None,
+        'recall': round(tp / (tp + fn), 4) if tp + fn else None,
+        'normalize_cache_hit_rate': round(cache['hits'] / lookups, 4) if lookups else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the track matcher on a synthetic catalogue")
+    parser.add_argument('--pairs', type=int, default=10000, help="Query/candidate pairs (default: 10000)")
+    parser.add_argument('--candidates', type=int, default=5, help="Candidates per query (default: 5)")
+    parser.add_argument('--threshold', type=float, default=0.90, help="Match threshold (default: 0.90)")
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    parser.add_argument('--min-pairs-per-second', type=float, default=None,
+                        help="Exit non-zero if any mode is slower than this")
+    parser.add_argument('--min-precision', type=float, default=None,
+                        help="Exit non-zero if any mode has lower precision")
+    parser.add_argument('--min-recall', type=float, default=None,
+                        help="Exit non-zero if any mode has lower recall")
+    args = parser.parse_args(argv)
+
+    n_queries = max(args.pairs // args.candidates, 1)
+    results = [
+        run_mode(mode, n_queries, args.candidates, args.threshold, args.seed)
+        for mode in args.modes
+    ]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'mode':<8} {'pairs':>9} {'pairs/s':>11} {'p50 us':>9} {'p95 us':>9} "
+              f"{'p99 us':>9} {'precision':>10} {'recall':>8} {'cache hit':>10}")
+        for r in results:
+            print(f"{r['mode']:<8} {r['pairs']:>9} {r['pairs_per_second']:>11} "
+                  f"{r['latency_us']['p50']:>9} {r['latency_us']['p95']:>9} {r['latency_us']['p99']:>9} "
+                  f"{r['precision']!s:>10} {r['recall']!s:>8} {r['normalize_cache_hit_rate']!s:>10}")
+
+    failures = []
+    for r in results:
+        if args.min_pairs_per_second is not None and (r['pairs_per_second'] or 0) < args.min_pairs_per_second:
+            failures.append(f"{r['mode']}: {r['pairs_per_second']} pairs/s < {args.min_pairs_per_second}")
+        if args.min_precision is not None and (r['precision'] or 0) < args.min_precision:
+            failures.append(f"{r['mode']}: precision {r['precision']} < {args.min_precision}")
+        if args.min_recall is not None and (r['recall'] or 0) < args.min_recall:
+            failures.append(f"{r['mode']}: recall {r['recall']} < {args.min_recall}")
+
+    for failure in failures:
+        print(f"REGRESSION {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
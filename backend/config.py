@@ -28,6 +28,11 @@ GOOGLE_OAUTH_CLIENT_SECRET = os.getenv("GOOGLE_OAUTH_CLIENT_SECRET", "")
 # Encryption
 MASTER_PASSWORD = os.getenv("MASTER_PASSWORD", "change_me_in_production")
 SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-key-change-in-production")
+# Optional pre-derived Fernet key (skips PBKDF2 on startup); must match MASTER_PASSWORD's key
+ENCRYPTION_KEY = os.getenv("ENCRYPTION_KEY", "")
+ENCRYPTION_KEY_FILE = os.getenv("ENCRYPTION_KEY_FILE", "")
+TOKEN_DECRYPT_CACHE_SIZE = int(os.getenv("TOKEN_DECRYPT_CACHE_SIZE", 256))
+TOKEN_DECRYPT_CACHE_TTL_SECONDS = int(os.getenv("TOKEN_DECRYPT_CACHE_TTL_SECONDS", 300))
 
 # OAuth Scopes
 SPOTIFY_SCOPES = (
@@ -50,6 +55,21 @@ API_RATE_LIMIT_PERIOD_SECONDS = int(os.getenv("API_RATE_LIMIT_PERIOD_SECONDS", 6
 BATCH_PROCESS_SIZE = int(os.getenv("BATCH_PROCESS_SIZE", 20))
 MAX_CONCURRENT_WORKERS = int(os.getenv("MAX_CONCURRENT_WORKERS", 5))
 
+# HTTP connection pooling (keep-alive connections shared by all API clients)
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", 4))
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", 20))
+HTTP_CONNECT_TIMEOUT_SECONDS = float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", 5))
+HTTP_READ_TIMEOUT_SECONDS = float(os.getenv("HTTP_READ_TIMEOUT_SECONDS", 30))
+
+# Negative match cache (tracks with no match are retried with exponential backoff)
+NEGATIVE_CACHE_TTL_MINUTES = int(os.getenv("NEGATIVE_CACHE_TTL_MINUTES", 60))
+NEGATIVE_CACHE_MAX_TTL_MINUTES = int(os.getenv("NEGATIVE_CACHE_MAX_TTL_MINUTES", 10080))
+
+# Live job progress (current track etc. kept in memory; counters written to the DB at most this often)
+PROGRESS_FLUSH_SECONDS = float(os.getenv("PROGRESS_FLUSH_SECONDS", 5))
+# Optional directory on shared memory (e.g. /dev/shm/musync) so every worker process sees live progress
+LIVE_PROGRESS_DIR = os.getenv("LIVE_PROGRESS_DIR", "")
+
 # Logging
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 
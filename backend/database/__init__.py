@@ -1,11 +1,11 @@
 from .connection import db, init_db
 from .models import (
     User, Credential, SyncJob, FailedTrack,
-    PlaylistSnapshot, ScheduledJob, ActivityLog
+    PlaylistSnapshot, TrackMapping, NegativeMatch, ScheduledJob, ActivityLog
 )
 
 __all__ = [
     'db', 'init_db',
     'User', 'Credential', 'SyncJob', 'FailedTrack',
-    'PlaylistSnapshot', 'ScheduledJob', 'ActivityLog'
+    'PlaylistSnapshot', 'TrackMapping', 'NegativeMatch', 'ScheduledJob', 'ActivityLog'
 ]
@@ -85,6 +85,10 @@ class PlaylistSnapshot(db.Model):
     playlist_id = db.Column(db.String(255), nullable=False)
     playlist_name = db.Column(db.String(255), nullable=False)
     tracks = db.Column(db.JSON, default=list)
+    source_snapshot_id = db.Column(db.String(255), nullable=True)
+    # Earliest negative-cache expiry among the tracks left unmatched; the unchanged
+    # playlist is fetched again from then on, so those tracks get retried
+    retry_at = db.Column(db.DateTime, nullable=True)
     synced_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None))
     
     __table_args__ = (
@@ -92,6 +96,42 @@ class PlaylistSnapshot(db.Model):
     )
 
 
+class TrackMapping(db.Model):
+    __tablename__ = 'track_mappings'
+    __table_args__ = (
+        db.UniqueConstraint('source_service', 'source_id', 'target_service', name='uq_track_mapping'),
+        db.Index('idx_track_mapping_target', 'target_service', 'target_id'),
+    )
+    
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    source_service = db.Column(db.String(50), nullable=False)
+    source_id = db.Column(db.String(255), nullable=False)
+    target_service = db.Column(db.String(50), nullable=False)
+    target_id = db.Column(db.String(255), nullable=False)
+    score = db.Column(db.Float)
+    matcher_version = db.Column(db.Integer, nullable=False)
+    isrc = db.Column(db.String(12), index=True)  # Recording code, when either side exposed one
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None))
+    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None), onupdate=datetime.utcnow)
+
+
+class NegativeMatch(db.Model):
+    __tablename__ = 'negative_matches'
+    __table_args__ = (
+        db.UniqueConstraint('match_key', 'target_service', name='uq_negative_match'),
+    )
+    
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    match_key = db.Column(db.String(40), nullable=False)
+    target_service = db.Column(db.String(50), nullable=False)
+    track_name = db.Column(db.String(255), nullable=False)
+    artist_names = db.Column(db.Text, nullable=False)
+    attempt_count = db.Column(db.Integer, default=1)
+    last_attempted_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None))
+    expires_at = db.Column(db.DateTime, nullable=False)
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None))
+
+
 class ScheduledJob(db.Model):
     __tablename__ = 'scheduled_jobs'
     
@@ -0,0 +1,107 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app, has_app_context
+from backend.config import BATCH_PROCESS_SIZE
+
+# Most items each provider accepts in a single playlist add call.
+# Services without a documented limit use BATCH_PROCESS_SIZE.
+PROVIDER_MAX_BATCH_SIZE = {
+    'spotify': 100,
+}
+
+
+class RejectedItemsError(Exception):
+    """The provider refused some items of a write; the request itself was valid"""
+
+
+def batch_size_for(service: str) -> int:
+    """Largest add batch to send to a service"""
+    return PROVIDER_MAX_BATCH_SIZE.get(service, BATCH_PROCESS_SIZE)
+
+
+class BatchWriter:
+    """
+    Buffer playlist additions and write them in full batches on a background thread
+
+    Batches are written one at a time in the order they were filled, while the
+    caller keeps matching. When the provider rejects items (RejectedItemsError),
+    the batch is split in half and each half retried, so only the items that
+    really fail are left out instead of the whole chunk. Any other error is
+    about the request itself (permissions, a deleted playlist, auth, outages),
+    so retrying would only spend the shared rate budget: that batch and every
+    later one fail without further calls.
+    """
+
+    def __init__(self, write, batch_size: int):
+        """
+        Args:
+            write: Callable taking a list of item IDs; raises on failure
+            batch_size: Items per write call
+        """
+        self.write = write
+        self.batch_size = max(1, batch_size)
+        self.buffer = []
+        self.failed = []
+        self.written = 0
+        self.error = None
+        self.lock = threading.Lock()
+        self.app = current_app._get_current_object() if has_app_context() else None
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.futures = []
+
+    def _fail(self, items: list, error: str):
+        with self.lock:
+            self.failed.extend((item, error) for item in items)
+    
+    def _write_batch(self, items: list):
+        """Write items, bisecting rejected batches until the rejected items are isolated"""
+        if self.error is not None:
+            return self._fail(items, self.error)
+        
+        try:
+            self.write(items)
+        except RejectedItemsError as e:
+            if len(items) == 1:
+                return self._fail(items, str(e))
+            middle = len(items) // 2
+            self._write_batch(items[:middle])
+            self._write_batch(items[middle:])
+            return
+        except Exception as e:
+            self.error = str(e)
+            return self._fail(items, self.error)
+
+        with self.lock:
+            self.written += len(items)
+
+    def _run(self, items: list):
+        if self.app is None:
+            return self._write_batch(items)
+        with self.app.app_context():
+            return self._write_batch(items)
+
+    def _dispatch(self):
+        batch, self.buffer = self.buffer, []
+        self.futures.append(self.executor.submit(self._run, batch))
+
+    def add(self, item) -> bool:
+        """Queue an item; returns True when this filled a batch and it was sent off"""
+        self.buffer.append(item)
+        if len(self.buffer) >= self.batch_size:
+            self._dispatch()
+            return True
+        return False
+
+    def close(self) -> list:
+        """
+        Write anything still buffered and wait for all batches
+
+        Returns:
+            list: (item, error message) for every item that could not be written
+        """
+        if self.buffer:
+            self._dispatch()
+        for future in self.futures:
+            future.result()
+        self.executor.shutdown(wait=True)
+        return self.failed
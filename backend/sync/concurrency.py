@@ -0,0 +1,42 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from flask import current_app, has_app_context
+
+
+def map_concurrently(func, items, max_workers: int, return_exceptions: bool = False):
+    """
+    Run func over items on a bounded worker pool, yielding results in input order
+
+    Items are consumed lazily and at most 2 * max_workers results are in flight
+    or buffered at once, so memory stays flat for long (or streamed) inputs.
+    Workers run inside the caller's Flask app context (if any) so API clients can
+    still read tokens. With return_exceptions, an exception raised by func is
+    yielded as that item's result instead of being raised.
+    """
+    app = current_app._get_current_object() if has_app_context() else None
+    max_workers = max(1, max_workers)
+    
+    def run(item):
+        try:
+            if app is None:
+                return func(item)
+            with app.app_context():
+                return func(item)
+        except Exception as e:
+            if not return_exceptions:
+                raise
+            return e
+    
+    items = iter(items)
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = deque(executor.submit(run, item) for item in islice(items, 2 * max_workers))
+        while futures:
+            result = futures.popleft().result()
+            # Keep the pool busy while the caller handles this result
+            for item in islice(items, 1):
+                futures.append(executor.submit(run, item))
+            yield result
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
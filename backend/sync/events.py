@@ -0,0 +1,67 @@
+import json
+import queue
+import threading
+
+# Events buffered per subscriber; the oldest are dropped when a client falls behind
+SUBSCRIBER_QUEUE_SIZE = 500
+# Event types after which a job publishes nothing more
+TERMINAL_EVENTS = ('status',)
+
+
+def format_sse(event: str, data: dict) -> str:
+    """Encode one Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class JobEventBus:
+    """
+    In-process publish/subscribe of sync job events
+
+    The orchestrator publishes progress, track, matched, failed, log and status
+    events for its job; every subscriber of that job (one per open SSE stream)
+    gets its own bounded queue. Publishing never blocks the sync: a subscriber
+    that stops reading loses its oldest events instead.
+    """
+
+    def __init__(self, queue_size: int = SUBSCRIBER_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self.subscribers = {}
+        self.lock = threading.Lock()
+
+    def subscribe(self, job_id: str) -> queue.Queue:
+        """Start receiving a job's events as (event, data) tuples"""
+        subscriber = queue.Queue(maxsize=self.queue_size)
+        with self.lock:
+            self.subscribers.setdefault(job_id, []).append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, job_id: str, subscriber: queue.Queue):
+        """Stop receiving a job's events"""
+        with self.lock:
+            subscribers = self.subscribers.get(job_id, [])
+            if subscriber in subscribers:
+                subscribers.remove(subscriber)
+            if not subscribers:
+                self.subscribers.pop(job_id, None)
+
+    def has_subscribers(self, job_id: str) -> bool:
+        return bool(self.subscribers.get(job_id))
+
+    def publish(self, job_id: str, event: str, data: dict):
+        """Send an event to everyone subscribed to job_id"""
+        with self.lock:
+            subscribers = list(self.subscribers.get(job_id, ()))
+
+        for subscriber in subscribers:
+            while True:
+                try:
+                    subscriber.put_nowait((event, data))
+                    break
+                except queue.Full:
+                    try:
+                        subscriber.get_nowait()
+                    except queue.Empty:
+                        pass
+
+
+job_events = JobEventBus()
@@ -0,0 +1,51 @@
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from backend.config import (
+    HTTP_POOL_CONNECTIONS,
+    HTTP_POOL_MAXSIZE,
+    HTTP_CONNECT_TIMEOUT_SECONDS,
+    HTTP_READ_TIMEOUT_SECONDS,
+)
+
+# (connect, read) timeout passed to every API request
+DEFAULT_TIMEOUT = (HTTP_CONNECT_TIMEOUT_SECONDS, HTTP_READ_TIMEOUT_SECONDS)
+
+_adapter = None
+_adapter_lock = threading.Lock()
+_local = threading.local()
+
+
+def get_adapter() -> HTTPAdapter:
+    """Process-wide adapter whose urllib3 pool keeps connections alive between requests"""
+    global _adapter
+    if _adapter is None:
+        with _adapter_lock:
+            if _adapter is None:
+                _adapter = HTTPAdapter(
+                    pool_connections=HTTP_POOL_CONNECTIONS,
+                    pool_maxsize=HTTP_POOL_MAXSIZE
+                )
+    return _adapter
+
+
+def get_session() -> requests.Session:
+    """
+    Get this thread's HTTP session
+
+    Sessions are per thread (requests.Session is not thread-safe) but all of
+    them share one connection pool, so warm connections are reused across
+    pages, searches and sync workers.
+    """
+    session = getattr(_local, 'session', None)
+    if session is None:
+        session = requests.Session()
+        session.headers.update({
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive"
+        })
+        adapter = get_adapter()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _local.session = session
+    return session
@@ -1,26 +1,117 @@
-from rapidfuzz import fuzz
+from functools import lru_cache
+from rapidfuzz import fuzz, process
+import numpy as np
 import re
+import unicodedata
 
+# Bump whenever scoring changes so cached matches from older versions are ignored
+MATCHER_VERSION = 1
 
-def normalize_text(text: str) -> str:
-    """Normalize text for matching while preserving important info"""
-    if not text:
-        return ""
+# Score weights (name 60%, artists 35%, duration 5%)
+NAME_WEIGHT = 0.60
+ARTIST_WEIGHT = 0.35
+DURATION_WEIGHT = 0.05
+
+# Distinct strings kept in the normalization memo
+NORMALIZE_CACHE_SIZE = 65536
+
+# Slack (0 - 100 scale) subtracted from pruning cutoffs; rapidfuzz's cdist
+# applies score_cutoff slightly inexactly, so exact bounds can drop borderline matches
+CUTOFF_SLACK = 0.01
+
+# Below this many candidates the per-candidate loop beats cdist's setup cost
+# (measured with backend.benchmarks.matcher_bench: scalar wins at 40, batch at 50)
+BATCH_MIN_CANDIDATES = 50
+
+_NON_WORD_RE = re.compile(r'[^\w\s]')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# "(feat. X)", "[Remastered 2011]", "- 2011 Remaster", "feat. X" at the end of a title
+_TAG_RES = (
+    re.compile(r'\s*[\(\[][^\)\]]*\b(?:feat|ft|featuring|remaster(?:ed)?)\b[^\)\]]*[\)\]]', re.IGNORECASE),
+    re.compile(r'\s+-\s+(?:\d{4}\s+)?(?:digital(?:ly)?\s+)?remaster(?:ed)?\b.*$', re.IGNORECASE),
+    re.compile(r'\s+(?:feat|ft|featuring)\b\.?\s+.*$', re.IGNORECASE),
+)
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _normalize_cached(text: str, unicode_fold: bool, strip_tags: bool) -> str:
+    """Memoized body of normalize_text"""
+    if strip_tags:
+        for pattern in _TAG_RES:
+            text = pattern.sub('', text)
     
-    # Convert to lowercase
-    text = text.lower()
+    if unicode_fold:
+        # Decompose, drop combining accents and fold case ("Beyoncé" -> "beyonce")
+        text = unicodedata.normalize('NFKD', text)
+        text = ''.join(c for c in text if not unicodedata.combining(c)).casefold()
+    else:
+        # Convert to lowercase
+        text = text.lower()
     
     # Remove common separators but keep words
-    text = re.sub(r'[^\w\s]', ' ', text)
+    text = _NON_WORD_RE.sub(' ', text)
     
     # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text).strip()
+    return _WHITESPACE_RE.sub(' ', text).strip()
+
+
+def normalize_text(text: str, unicode_fold: bool = False, strip_tags: bool = False) -> str:
+    """
+    Normalize text for matching while preserving important info
+    
+    Args:
+        text: Text to normalize
+        unicode_fold: Apply NFKD, drop accents and casefold instead of lower()
+        strip_tags: Remove feat./remaster tags from titles
+    """
+    if not text:
+        return ""
+    
+    return _normalize_cached(text, unicode_fold, strip_tags)
+
+
+def normalize_cache_info() -> dict:
+    """Hit/miss counters of the normalization memo"""
+    info = _normalize_cached.cache_info()
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "max_size": info.maxsize,
+    }
+
+
+def clear_normalize_cache():
+    """Empty the normalization memo and reset its counters"""
+    _normalize_cached.cache_clear()
+
+
+def _min_name_ratio(threshold: float) -> float:
+    """Lowest name ratio (0 - 100) that can still reach threshold with perfect artists and duration"""
+    needed = (threshold - ARTIST_WEIGHT - DURATION_WEIGHT) / NAME_WEIGHT * 100
+    return min(max(needed - CUTOFF_SLACK, 0), 100)
+
+
+def _min_artist_pair_ratio(score_cutoff: float, artist_count: int) -> float:
+    """
+    Lowest per-artist ratio (0 - 100) that can still reach an average of score_cutoff
     
-    return text
+    The other artists contribute at most 1.0 each, so any single best match
+    below this bound keeps the average under score_cutoff.
+    """
+    needed = (artist_count * score_cutoff - (artist_count - 1)) * 100
+    return min(max(needed - CUTOFF_SLACK, 0), 100)
 
 
-def calculate_artist_similarity(query_artists: list, candidate_artists: list) -> float:
-    """Calculate artist similarity score (0.0 - 1.0)"""
+def calculate_artist_similarity(query_artists: list, candidate_artists: list,
+                                score_cutoff: float = 0.0) -> float:
+    """
+    Calculate artist similarity score (0.0 - 1.0)
+    
+    Like rapidfuzz, scores below score_cutoff are returned as 0.0, which lets
+    hopeless pairs be skipped early.
+    """
     if not query_artists or not candidate_artists:
         return 0.0
     
@@ -28,17 +119,22 @@ def calculate_artist_similarity(query_artists: list, candidate_artists: list) ->
     q_artists = [normalize_text(a) for a in query_artists]
     c_artists = [normalize_text(a) for a in candidate_artists]
     
+    pair_cutoff = _min_artist_pair_ratio(score_cutoff, len(q_artists))
+    
     # Calculate best match for each query artist
     scores = []
     for qa in q_artists:
         best_match = 0
         for ca in c_artists:
-            score = fuzz.partial_ratio(qa, ca) / 100.0
+            score = fuzz.partial_ratio(qa, ca, score_cutoff=pair_cutoff) / 100.0
             best_match = max(best_match, score)
+        if best_match * 100 < pair_cutoff:
+            return 0.0
         scores.append(best_match)
     
     # Return average similarity
-    return sum(scores) / len(scores)
+    similarity = sum(scores) / len(scores)
+    return similarity if similarity >= score_cutoff else 0.0
 
 
 def calculate_match_score(query_track, candidate_track, threshold: float = 0.90) -> float:
@@ -58,13 +154,26 @@ def calculate_match_score(query_track, candidate_track, threshold: float = 0.90)
     candidate_name = normalize_text(candidate_track.get('name', ''))
     
     # Use token_sort_ratio for better name matching
-    name_score = fuzz.token_sort_ratio(query_name, candidate_name) / 100.0
+    name_score = fuzz.token_sort_ratio(
+        query_name, candidate_name, score_cutoff=_min_name_ratio(threshold)
+    ) / 100.0
+    
+    # Stop if perfect artist and duration scores still cannot reach the threshold
+    if (name_score * NAME_WEIGHT) + ARTIST_WEIGHT + DURATION_WEIGHT < threshold:
+        return 0.0
     
     # 2. Artist matching (35% weight)
     query_artists = query_track.get('artists', [])
     candidate_artists = candidate_track.get('artists', [])
     
-    artist_score = calculate_artist_similarity(query_artists, candidate_artists)
+    min_artist_score = (threshold - (name_score * NAME_WEIGHT) - DURATION_WEIGHT) / ARTIST_WEIGHT
+    artist_score = calculate_artist_similarity(
+        query_artists, candidate_artists, score_cutoff=max(min_artist_score - 1e-9, 0.0)
+    )
+    
+    # Same bound again with the artist score known
+    if (name_score * NAME_WEIGHT) + (artist_score * ARTIST_WEIGHT) + DURATION_WEIGHT < threshold:
+        return 0.0
     
     # 3. Duration check (5% weight)
     query_duration = query_track.get('duration_ms', 0)
@@ -79,27 +188,176 @@ def calculate_match_score(query_track, candidate_track, threshold: float = 0.90)
     
     # Weighted combination
     total_score = (
-        (name_score * 0.60) +
-        (artist_score * 0.35) +
-        (duration_score * 0.05)
+        (name_score * NAME_WEIGHT) +
+        (artist_score * ARTIST_WEIGHT) +
+        (duration_score * DURATION_WEIGHT)
     )
     
     # Return 0 if below threshold
     return total_score if total_score >= threshold else 0.0
 
 
-def find_best_match(query_track, search_results, threshold: float = 0.90):
+def _duration_scores(query_duration, candidate_durations: np.ndarray) -> np.ndarray:
+    """Vectorized duration component: 1.0 within 5 seconds, 0.5 otherwise or if unknown"""
+    query_duration = query_duration or 0
+    scores = np.full(len(candidate_durations), 0.5)
+    if query_duration > 0:
+        known = candidate_durations > 0
+        close = np.abs(candidate_durations - query_duration) < 5000
+        scores[known & close] = 1.0
+    return scores
+
+
+def _artist_scores(query_artists: list, candidates: list, score_cutoff: float = 0.0) -> np.ndarray:
     """
-    Find best matching track from search results
+    Vectorized calculate_artist_similarity of one query against every candidate
+    
+    Scores below score_cutoff are not exact (pairs under the per-artist bound are zeroed).
+    """
+    scores = np.zeros(len(candidates))
+    if not query_artists:
+        return scores
+    
+    q_artists = [normalize_text(a) for a in query_artists]
+    pair_cutoff = _min_artist_pair_ratio(score_cutoff, len(q_artists))
+    
+    # Flatten candidate artists into one row so a single cdist covers all pairs
+    flat_artists = []
+    offsets = []
+    has_artists = []
+    for i, candidate in enumerate(candidates):
+        artists = candidate.get('artists', [])
+        if artists:
+            has_artists.append(i)
+            offsets.append(len(flat_artists))
+            flat_artists.extend(normalize_text(a) for a in artists)
+    
+    if not flat_artists:
+        return scores
+    
+    pair_scores = process.cdist(
+        q_artists, flat_artists, scorer=fuzz.partial_ratio, dtype=np.float64,
+        score_cutoff=pair_cutoff
+    ) / 100.0
+    
+    # Best candidate artist per query artist, then the average over query artists
+    best_per_query = np.maximum.reduceat(pair_scores, offsets, axis=1)
+    scores[has_artists] = best_per_query.sum(axis=0) / len(q_artists)
+    return scores
+
+
+def score_candidates(query_track, candidates: list, threshold: float = 0.90) -> np.ndarray:
+    """
+    Score every candidate against one query track in a single pass
+    
+    The query is normalized once and names are compared with one rapidfuzz
+    cdist call. Candidates whose name score rules out the threshold are pruned
+    before artist scoring. Same weights and threshold semantics as
+    calculate_match_score.
     
     Args:
         query_track: Dict with 'name', 'artists', 'duration_ms'
-        search_results: List of candidate track dicts
-        threshold: Minimum confidence threshold
+        candidates: List of candidate track dicts
+        threshold: Minimum score to consider a match
     
     Returns:
-        Best matching track dict or None if no confident match
+        np.ndarray: Match score per candidate, 0.0 where below threshold
+    """
+    if not candidates:
+        return np.zeros(0)
+    
+    query_name = normalize_text(query_track.get('name', ''))
+    candidate_names = [normalize_text(c.get('name', '')) for c in candidates]
+    name_scores = process.cdist(
+        [query_name], candidate_names,
+        scorer=fuzz.token_sort_ratio, dtype=np.float64, score_cutoff=_min_name_ratio(threshold)
+    )[0] / 100.0
+    
+    # Only candidates that can still reach the threshold get artist scoring
+    alive = np.flatnonzero((name_scores * NAME_WEIGHT) + ARTIST_WEIGHT + DURATION_WEIGHT >= threshold)
+    artist_scores = np.zeros(len(candidates))
+    if len(alive):
+        min_artist_scores = (threshold - (name_scores[alive] * NAME_WEIGHT) - DURATION_WEIGHT) / ARTIST_WEIGHT
+        artist_scores[alive] = _artist_scores(
+            query_track.get('artists', []),
+            [candidates[i] for i in alive],
+            score_cutoff=max(float(min_artist_scores.min()) - 1e-9, 0.0)
+        )
+    
+    candidate_durations = np.array(
+        [c.get('duration_ms', 0) or 0 for c in candidates], dtype=np.float64
+    )
+    duration_scores = _duration_scores(query_track.get('duration_ms', 0), candidate_durations)
+    
+    total_scores = (
+        (name_scores * NAME_WEIGHT) +
+        (artist_scores * ARTIST_WEIGHT) +
+        (duration_scores * DURATION_WEIGHT)
+    )
+    
+    total_scores[total_scores < threshold] = 0.0
+    return total_scores
+
+
+def score_matrix(query_tracks: list, candidate_lists: list, threshold: float = 0.90) -> np.ndarray:
     """
+    Score many queries against their own candidate lists
+    
+    A convenience wrapper that calls score_candidates once per query; it is no
+    faster than scoring the queries one at a time.
+    
+    Args:
+        query_tracks: List of query track dicts
+        candidate_lists: One list of candidate dicts per query track
+        threshold: Minimum score to consider a match
+    
+    Returns:
+        np.ndarray: (len(query_tracks), longest candidate list) score matrix,
+        0.0 where below threshold or where a row has fewer candidates
+    """
+    width = max((len(c) for c in candidate_lists), default=0)
+    matrix = np.zeros((len(query_tracks), width))
+    
+    for row, (query_track, candidates) in enumerate(zip(query_tracks, candidate_lists)):
+        matrix[row, :len(candidates)] = score_candidates(query_track, candidates, threshold)
+    
+    return matrix
+
+
+def find_best_matches(query_tracks: list, candidate_lists: list, threshold: float = 0.90) -> list:
+    """
+    Find the best match for each of many queries
+    
+    Convenience wrapper over score_matrix; the queries are still scored one by one.
+    
+    Returns:
+        List of (best matching track dict, score) tuples, (None, 0.0) where no confident match
+    """
+    matrix = score_matrix(query_tracks, candidate_lists, threshold)
+    results = []
+    
+    for row, candidates in enumerate(candidate_lists):
+        if not candidates:
+            results.append((None, 0.0))
+            continue
+        
+        best = int(np.argmax(matrix[row, :len(candidates)]))
+        best_score = float(matrix[row, best])
+        results.append((candidates[best], best_score) if best_score > 0 else (None, 0.0))
+    
+    return results
+
+
+def find_best_match_with_score(query_track, search_results, threshold: float = 0.90):
+    """
+    Find best matching track from search results along with its score
+    
+    Returns:
+        Tuple of (best matching track dict, score), or (None, 0.0) if no confident match
+    """
+    if len(search_results) >= BATCH_MIN_CANDIDATES:
+        return find_best_matches([query_track], [search_results], threshold)[0]
+    
     best_match = None
     best_score = 0
     
@@ -110,4 +368,21 @@ def find_best_match(query_track, search_results, threshold: float = 0.90):
             best_score = score
             best_match = candidate
     
-    return best_match if best_score >= threshold else None
+    if best_match is not None and best_score >= threshold:
+        return best_match, best_score
+    return None, 0.0
+
+
+def find_best_match(query_track, search_results, threshold: float = 0.90):
+    """
+    Find best matching track from search results
+    
+    Args:
+        query_track: Dict with 'name', 'artists', 'duration_ms'
+        search_results: List of candidate track dicts
+        threshold: Minimum confidence threshold
+    
+    Returns:
+        Best matching track dict or None if no confident match
+    """
+    return find_best_match_with_score(query_track, search_results, threshold)[0]
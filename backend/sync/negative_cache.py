@@ -0,0 +1,94 @@
+import hashlib
+from datetime import datetime, timedelta, timezone
+from backend.config import NEGATIVE_CACHE_TTL_MINUTES, NEGATIVE_CACHE_MAX_TTL_MINUTES
+from backend.database import db, NegativeMatch
+from backend.sync.matcher import normalize_text
+from sqlalchemy.exc import IntegrityError
+
+# Durations within the same bucket share a cache entry
+DURATION_BUCKET_MS = 10000
+
+
+def negative_cache_key(query_track) -> str:
+    """Hash of normalized name, sorted artists and duration bucket"""
+    name = normalize_text(query_track.get('name', ''))
+    artists = sorted(normalize_text(a) for a in query_track.get('artists', []))
+    bucket = int(query_track.get('duration_ms') or 0) // DURATION_BUCKET_MS
+    raw = f"{name}|{','.join(artists)}|{bucket}"
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+class NegativeMatchCache:
+    """Remember tracks that found no match so they are not searched on every run"""
+
+    @staticmethod
+    def backoff(attempt_count: int) -> timedelta:
+        """TTL doubles with every failed attempt, capped at the configured maximum"""
+        minutes = NEGATIVE_CACHE_TTL_MINUTES * (2 ** max(attempt_count - 1, 0))
+        return timedelta(minutes=min(minutes, NEGATIVE_CACHE_MAX_TTL_MINUTES))
+
+    @staticmethod
+    def lookup_many(keys: list, target_service: str) -> dict:
+        """
+        Look up negative cache entries
+
+        Returns:
+            dict: key → expiry for every known entry, expired or not
+        """
+        keys = list(set(keys))
+        if not keys:
+            return {}
+
+        entries = NegativeMatch.query.filter(
+            NegativeMatch.target_service == target_service,
+            NegativeMatch.match_key.in_(keys)
+        ).all()
+        return {e.match_key: e.expires_at for e in entries}
+
+    @staticmethod
+    def active_keys(known: dict) -> set:
+        """Keys from lookup_many whose entry has not expired yet"""
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return {key for key, expires_at in known.items() if expires_at and expires_at > now}
+
+    @staticmethod
+    def record_miss(query_track, target_service: str) -> NegativeMatch:
+        """Record a failed match and push the next retry out with exponential backoff"""
+        key = negative_cache_key(query_track)
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+
+        entry = NegativeMatch.query.filter_by(
+            match_key=key, target_service=target_service
+        ).first()
+
+        if entry:
+            entry.attempt_count = (entry.attempt_count or 0) + 1
+            entry.last_attempted_at = now
+            entry.expires_at = now + NegativeMatchCache.backoff(entry.attempt_count)
+            return entry
+
+        entry = NegativeMatch(
+            match_key=key,
+            target_service=target_service,
+            track_name=query_track.get('name', '')[:255],
+            artist_names=", ".join(query_track.get('artists', [])),
+            attempt_count=1,
+            last_attempted_at=now,
+            expires_at=now + NegativeMatchCache.backoff(1)
+        )
+
+        # Another job may have recorded the same miss concurrently
+        try:
+            with db.session.begin_nested():
+                db.session.add(entry)
+        except IntegrityError:
+            return None
+
+        return entry
+
+    @staticmethod
+    def clear(key: str, target_service: str):
+        """Forget a negative entry once the track has matched"""
+        NegativeMatch.query.filter_by(
+            match_key=key, target_service=target_service
+        ).delete()
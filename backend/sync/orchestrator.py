@@ -1,11 +1,23 @@
 import threading
 import time
+from functools import partial
 from datetime import datetime, timezone
+from backend.config import MAX_CONCURRENT_WORKERS, PROGRESS_FLUSH_SECONDS
 from backend.database import db, SyncJob, FailedTrack, PlaylistSnapshot
 from backend.sync.spotify_client import SpotifyClient
 from backend.sync.ytmusic_client import YTMusicClient
-from backend.sync.matcher import find_best_match
+from backend.sync.matcher import find_best_match_with_score
+from backend.sync.batch_writer import BatchWriter, batch_size_for
 from backend.sync.checkpoint import CheckpointManager
+from backend.sync.concurrency import map_concurrently
+from backend.sync.events import job_events
+from backend.sync.snapshot import SnapshotManager
+from backend.sync.track_cache import TrackMappingCache
+from backend.sync.negative_cache import NegativeMatchCache, negative_cache_key
+from backend.sync.progress import job_progress, LIVE_TRACK_FIELDS
+
+# Score recorded for exact ISRC matches (no fuzzy scoring involved)
+ISRC_MATCH_SCORE = 1.0
 
 
 def normalize_ytmusic_track(track):
@@ -26,9 +38,17 @@ def normalize_spotify_track(track):
         'artists': [a.get('name', '') for a in track.get('artists', []) if isinstance(a, dict)],
         'duration_ms': track.get('duration_ms', int(track.get('durationMs', 0))),
         'uri': track.get('uri'),
+        'isrc': (track.get('external_ids') or {}).get('isrc'),
     }
 
 
+def track_key(track_id, query_track) -> str:
+    """Stable key for a source track, used to diff against playlist snapshots"""
+    if track_id:
+        return track_id
+    return f"{query_track['name']}|{', '.join(query_track['artists'])}"
+
+
 class SyncOrchestrator:
     """Orchestrate sync operations between Spotify and YouTube Music"""
     
@@ -39,6 +59,9 @@ class SyncOrchestrator:
         self.sync_logs = []
         self.is_running = False
         self.lock = threading.Lock()
+        self.max_workers = max(1, MAX_CONCURRENT_WORKERS)
+        self.job_id = None
+        self.last_flush = 0.0
     
     def log(self, message: str, level: str = "INFO"):
         """Add log message"""
@@ -51,6 +74,157 @@ class SyncOrchestrator:
         
         with self.lock:
             self.sync_logs.append(log_entry)
+        
+        self._publish('log', **log_entry)
+    
+    def _publish(self, event: str, **data):
+        """Send a live event to the job's SSE subscribers (no-op when nobody listens)"""
+        if self.job_id and job_events.has_subscribers(self.job_id):
+            job_events.publish(self.job_id, event, data)
+    
+    def _report_progress(self, job):
+        """
+        Share the job's counters live, and write them to the database at most
+        every PROGRESS_FLUSH_SECONDS (playlist checkpoints commit them as well)
+        """
+        counters = {
+            'progress_percentage': job.progress_percentage,
+            'total_playlists': job.total_playlists,
+            'total_tracks': job.total_tracks,
+            'added_tracks': job.added_tracks,
+            'failed_tracks': job.failed_tracks,
+            'current_playlist_name': job.current_playlist_name,
+        }
+        job_progress.update(job.id, **counters)
+        self._publish('progress', **counters)
+        
+        now = time.monotonic()
+        if now - self.last_flush >= PROGRESS_FLUSH_SECONDS:
+            db.session.commit()
+            self.last_flush = now
+    
+    def _report_track(self, job, name: str, artist: str, image_url: str):
+        """Track being processed: kept in memory only, never written per track"""
+        job_progress.update(
+            job.id, current_track_name=name, current_track_artist=artist, current_track_image_url=image_url
+        )
+        self._publish('track', name=name, artist=artist, image_url=image_url)
+    
+    def _save_live_fields(self, job):
+        """Copy a finished job's last live fields onto its row (one write per job)"""
+        live = job_progress.pop(job.id)
+        for field in LIVE_TRACK_FIELDS:
+            if field in live:
+                setattr(job, field, live[field])
+    
+    def _publish_status(self, job):
+        """Final event of a job: its outcome and counters"""
+        self._publish(
+            'status',
+            status=job.status,
+            error_message=job.error_message,
+            progress_percentage=job.progress_percentage,
+            added_tracks=job.added_tracks,
+            failed_tracks=job.failed_tracks,
+        )
+    
+    def _map_concurrently(self, func, items):
+        """
+        Run func over items on a bounded worker pool, yielding results in input order
+
+        Workers only talk to the remote APIs (each client call still goes through
+        its rate limiter); all database writes stay on the calling thread.
+        Exceptions raised by func are returned as the result instead of raised.
+        """
+        return map_concurrently(func, items, self.max_workers, return_exceptions=True)
+    
+    def _match_on_ytmusic(self, query_track):
+        """Search YouTube Music for a track and return (best match or None, score)"""
+        search_results = self.ytmusic.search(
+            f"{query_track['name']} {' '.join(query_track['artists'])}",
+            limit=5
+        )
+        
+        # Filter to video results
+        video_results = [
+            r for r in search_results
+            if r.get('videoType') == 'MUSIC_VIDEO_TYPE_ATV' or r.get('videoId')
+        ]
+        
+        # Normalize and find best match
+        normalized_results = [normalize_ytmusic_track(r) for r in video_results]
+        return find_best_match_with_score(query_track, normalized_results, threshold=0.90)
+    
+    def _match_on_spotify(self, query_track):
+        """Search Spotify for a track and return (best match or None, score)"""
+        search_results = self.spotify.search_track(
+            f"{query_track['name']} {' '.join(query_track['artists'])}",
+            limit=5
+        )
+        
+        tracks_list = search_results.get('tracks', {}).get('items', [])
+        
+        # Normalize and find best match
+        normalized_results = [normalize_spotify_track(r) for r in tracks_list]
+        return find_best_match_with_score(query_track, normalized_results, threshold=0.90)
+    
+    def _match_on_spotify_isrc(self, isrc: str):
+        """Exact Spotify lookup by ISRC, accepted without fuzzy scoring; None if not found"""
+        track = self.spotify.search_isrc(isrc)
+        if not track:
+            return None
+        return normalize_spotify_track(track), ISRC_MATCH_SCORE
+    
+    def _record_failed_track(self, job, query_track, reason: str):
+        """Record a failed track, bumping attempt_count if it already failed for this user"""
+        artist_names = ", ".join(query_track['artists'])
+        failed_track = FailedTrack.query.join(SyncJob).filter(
+            SyncJob.user_id == self.user_id,
+            SyncJob.source_service == job.source_service,
+            FailedTrack.track_name == query_track['name'],
+            FailedTrack.artist_names == artist_names
+        ).first()
+        
+        if failed_track:
+            failed_track.sync_job_id = job.id
+            failed_track.reason = reason
+            failed_track.attempt_count = (failed_track.attempt_count or 0) + 1
+            failed_track.last_attempted_at = datetime.now(timezone.utc).replace(tzinfo=None)
+        else:
+            failed_track = FailedTrack(
+                sync_job_id=job.id,
+                track_name=query_track['name'],
+                artist_names=artist_names,
+                reason=reason
+            )
+            db.session.add(failed_track)
+        
+        job.failed_tracks += 1
+        self._publish('failed', name=query_track['name'], artists=query_track['artists'], reason=reason)
+        return failed_track
+    
+    def _finish_writes(self, job, writer, queued, failed_keys):
+        """
+        Wait for the playlist's pending batch writes
+
+        Tracks whose item could not be added are recorded as failed (and kept
+        out of the snapshot) so the next run retries them.
+        """
+        for item_id, error in writer.close():
+            self.log(f"Could not add {item_id}: {error}", "ERROR")
+            job.added_tracks -= 1
+            for key, query_track in queued.get(item_id, []):
+                self._record_failed_track(job, query_track, f"Could not add to playlist: {error}")
+                failed_keys.add(key)
+        db.session.commit()
+    
+    @staticmethod
+    def _index_playlists(playlists, name_key: str) -> dict:
+        """Build a name → playlist index, keeping the first playlist for duplicate names"""
+        index = {}
+        for playlist in playlists:
+            index.setdefault(playlist.get(name_key), playlist)
+        return index
     
     def sync_spotify_to_ytmusic(self, job_id: str = None, resume_from: dict = None):
         """Sync Spotify playlists to YouTube Music"""
@@ -73,6 +247,7 @@ class SyncOrchestrator:
                 db.session.add(job)
                 db.session.commit()
                 job_id = job.id
+            self.job_id = job_id
             
             # Check for checkpoint
             checkpoint = resume_from or CheckpointManager.load_checkpoint(job_id)
@@ -84,29 +259,22 @@ class SyncOrchestrator:
             job.total_playlists = len(playlists)
             db.session.commit()
             
+            # Load the YouTube Music library once; created playlists are added as we go
+            self.log("Fetching YouTube Music playlists")
+            ytmusic_index = self._index_playlists(self.ytmusic.get_playlists(), 'title')
+            
             for playlist_idx, playlist in enumerate(playlists):
                 if playlist_idx < start_playlist_index:
                     continue  # Skip already processed playlists
                 
                 self.log(f"Processing playlist: {playlist['name']}")
                 job.current_playlist_name = playlist['name']
-                job.current_track_name = None
-                job.current_track_image_url = None
                 job.progress_percentage = int((playlist_idx / len(playlists)) * 100)
-                db.session.commit()
-                
-                # Get tracks from Spotify playlist
-                spotify_tracks = self.spotify.get_playlist_tracks(playlist['id'])
-                job.total_tracks += len(spotify_tracks)
+                job_progress.update(job.id, **dict.fromkeys(LIVE_TRACK_FIELDS))
+                self._report_progress(job)
                 
                 # Check if playlist already exists in YouTube Music
-                ytmusic_playlists = self.ytmusic.get_playlists()
-                existing_playlist = None
-                
-                for yt_pl in ytmusic_playlists:
-                    if yt_pl.get('title') == playlist['name']:
-                        existing_playlist = yt_pl
-                        break
+                existing_playlist = ytmusic_index.get(playlist['name'])
                 
                 # Create or use existing playlist
                 if not existing_playlist:
@@ -116,91 +284,156 @@ class SyncOrchestrator:
                         description=playlist.get('description', '')
                     )
                     playlist_id = new_playlist.get('playlistId')
+                    ytmusic_index[playlist['name']] = {
+                        'playlistId': playlist_id,
+                        'title': playlist['name']
+                    }
+                    snapshot = None
+                    existing_ids = set()
                 else:
                     playlist_id = existing_playlist.get('playlistId')
                     self.log(f"Using existing YouTube Music playlist: {playlist['name']}")
+                    snapshot = SnapshotManager.get_snapshot(self.user_id, 'spotify', playlist['id'])
+                    existing_ids = None  # Read on the first match, then kept for the playlist
                 
-                # Process tracks in batches
-                video_ids_to_add = []
+                # Skip fetching tracks if the playlist has not changed since the last sync,
+                # until a track that found no match is due for another search
+                snapshot_id = playlist.get('snapshot_id')
+                now = datetime.now(timezone.utc).replace(tzinfo=None)
+                if (snapshot and snapshot_id and snapshot.source_snapshot_id == snapshot_id
+                        and (snapshot.retry_at is None or snapshot.retry_at > now)):
+                    self.log(f"Playlist unchanged since last sync: {playlist['name']}")
+                    job.total_tracks += len(snapshot.tracks or [])
+                    CheckpointManager.save_checkpoint(job_id, {
+                        'playlist_index': playlist_idx + 1
+                    })
+                    continue
                 
-                for track_data in spotify_tracks:
-                    track = track_data.get('track', {})
-                    if not track:
+                synced_keys = set(snapshot.tracks or []) if snapshot else set()
+                
+                # Matched items are written in the provider's largest batches while matching continues
+                writer = BatchWriter(
+                    partial(self.ytmusic.add_playlist_items, playlist_id), batch_size_for('ytmusic')
+                )
+                queued = {}
+                
+                # Only tracks added since the last successful sync need matching
+                source_keys = []
+                failed_keys = set()
+                # Failed keys held back by the negative cache → when their entry expires
+                miss_expiries = {}
+                new_tracks = 0
+                
+                # Stream tracks from Spotify page by page; matching starts on the first page
+                for spotify_tracks in self.spotify.iter_playlist_tracks(playlist['id']):
+                    job.total_tracks += len(spotify_tracks)
+                    pending = []
+                    for track in spotify_tracks:
+                        # Extract track info
+                        query_track = {
+                            'name': track.name,
+                            'artists': list(track.artists),
+                            'duration_ms': track.duration_ms
+                        }
+                        key = track_key(track.uri, query_track)
+                        source_keys.append(key)
+                        if key not in synced_keys:
+                            pending.append((track, query_track, key, negative_cache_key(query_track)))
+                    
+                    new_tracks += len(pending)
+                    if not pending:
                         continue
-
-                    job.current_track_name = track.get('name', '')
-                    job.current_track_artist = ", ".join([a.get('name', '') for a in track.get('artists', [])])
-                    album = track.get('album', {})
-                    images = album.get('images', [])
-                    job.current_track_image_url = images[0].get('url') if images else None
                     
-                    # Extract track info
-                    query_track = {
-                        'name': track.get('name', ''),
-                        'artists': [a.get('name', '') for a in track.get('artists', [])],
-                        'duration_ms': track.get('duration_ms', 0)
-                    }
+                    # Previously confirmed matches and known-unmatchable tracks skip the search
+                    cached = TrackMappingCache.lookup_many(
+                        'spotify', [item[0].uri for item in pending], 'ytmusic'
+                    )
+                    known_misses = NegativeMatchCache.lookup_many([item[3] for item in pending], 'ytmusic')
+                    blocked = NegativeMatchCache.active_keys(known_misses)
                     
-                    # Search on YouTube Music
-                    try:
-                        search_results = self.ytmusic.search(
-                            f"{query_track['name']} {' '.join(query_track['artists'])}",
-                            limit=5
-                        )
-                        
-                        # Filter to video results
-                        video_results = [
-                            r for r in search_results
-                            if r.get('videoType') == 'MUSIC_VIDEO_TYPE_ATV' or r.get('videoId')
-                        ]
+                    def match(item):
+                        track, query_track, _, miss_key = item
+                        video_id = cached.get(track.uri)
+                        if video_id:
+                            return {'videoId': video_id}, None
+                        if miss_key in blocked:
+                            return None, None
+                        return self._match_on_ytmusic(query_track)
+                    
+                    # Search on YouTube Music concurrently, consume results in source order
+                    results = self._map_concurrently(match, pending)
+                    
+                    for (track, query_track, key, miss_key), result in zip(pending, results):
+                        self._report_track(job, track.name, ", ".join(track.artists), track.image_url)
                         
-                        # Normalize and find best match
-                        normalized_results = [normalize_ytmusic_track(r) for r in video_results]
-                        best_match = find_best_match(
-                            query_track,
-                            normalized_results,
-                            threshold=0.90
-                        )
+                        error = result if isinstance(result, Exception) else None
+                        best_match, score = (None, None) if error else result
                         
-                        if best_match:
+                        if error:
+                            self._record_failed_track(job, query_track, str(error))
+                            failed_keys.add(key)
+                            self.log(f"Error processing track: {query_track['name']}", "ERROR")
+                        elif best_match:
                             video_id = best_match.get('videoId')
-                            if video_id and video_id not in video_ids_to_add:
-                                video_ids_to_add.append(video_id)
-                                job.added_tracks += 1
-                                self.log(f"Matched: {query_track['name']}")
+                            if score is not None:
+                                TrackMappingCache.store(
+                                    'spotify', track.uri, 'ytmusic', video_id, score, isrc=track.isrc
+                                )
+                            if miss_key in known_misses:
+                                NegativeMatchCache.clear(miss_key, 'ytmusic')
+                            if video_id and existing_ids is None:
+                                existing_ids = self.ytmusic.get_playlist_video_ids(playlist_id)
+                            if video_id and video_id in existing_ids:
+                                self.log(f"Already in playlist: {query_track['name']}")
+                            elif video_id:
+                                if video_id not in queued:
+                                    queued[video_id] = []
+                                    job.added_tracks += 1
+                                    self.log(f"Matched: {query_track['name']}")
+                                    self._publish(
+                                        'matched', name=query_track['name'],
+                                        artists=query_track['artists'], id=video_id
+                                    )
+                                    writer.add(video_id)
+                                queued[video_id].append((key, query_track))
+                        elif miss_key in blocked:
+                            # Known unmatchable, not searched until the negative entry expires
+                            job.failed_tracks += 1
+                            failed_keys.add(key)
+                            miss_expiries[key] = known_misses[miss_key]
+                            self._publish(
+                                'failed', name=query_track['name'], artists=query_track['artists'],
+                                reason="No match last time"
+                            )
+                            self.log(f"Skipped (no match last time): {query_track['name']}", "WARNING")
                         else:
                             # Track not found
-                            failed_track = FailedTrack(
-                                sync_job_id=job_id,
-                                track_name=query_track['name'],
-                                artist_names=", ".join(query_track['artists']),
-                                reason="No match found"
-                            )
-                            db.session.add(failed_track)
-                            job.failed_tracks += 1
+                            miss = NegativeMatchCache.record_miss(query_track, 'ytmusic')
+                            self._record_failed_track(job, query_track, "No match found")
+                            failed_keys.add(key)
+                            if miss:
+                                miss_expiries[key] = miss.expires_at
                             self.log(f"Not found: {query_track['name']}", "WARNING")
                     
-                    except Exception as e:
-                        failed_track = FailedTrack(
-                            sync_job_id=job_id,
-                            track_name=query_track['name'],
-                            artist_names=", ".join(query_track['artists']),
-                            reason=str(e)
-                        )
-                        db.session.add(failed_track)
-                        job.failed_tracks += 1
-                        self.log(f"Error processing track: {query_track['name']}", "ERROR")
+                    self._report_progress(job)
                     
-                    # Add in batches of 20
-                    if len(video_ids_to_add) >= 20:
-                        self.ytmusic.add_playlist_items(playlist_id, video_ids_to_add[:20])
-                        video_ids_to_add = video_ids_to_add[20:]
-                        db.session.commit()
+                if synced_keys:
+                    self.log(f"{new_tracks} new tracks since last sync")
                 
                 # Add remaining tracks
-                if video_ids_to_add:
-                    self.ytmusic.add_playlist_items(playlist_id, video_ids_to_add)
-                    db.session.commit()
+                self._finish_writes(job, writer, queued, failed_keys)
+                
+                # Record synced tracks; failed ones are left out so the next run retries them.
+                # The snapshot_id is only kept when every failure is waiting on a negative
+                # cache entry, and only until the first of those entries expires; after any
+                # other failure the playlist is fetched again next run.
+                only_misses = not failed_keys - miss_expiries.keys()
+                SnapshotManager.save_snapshot(
+                    self.user_id, 'spotify', playlist['id'], playlist['name'],
+                    [k for k in dict.fromkeys(source_keys) if k not in failed_keys],
+                    source_snapshot_id=snapshot_id if only_misses else None,
+                    retry_at=min(miss_expiries.values()) if only_misses and miss_expiries else None
+                )
                 
                 # Save checkpoint
                 CheckpointManager.save_checkpoint(job_id, {
@@ -211,16 +444,20 @@ class SyncOrchestrator:
             job.status = 'success'
             job.completed_at = datetime.now(timezone.utc).replace(tzinfo=None)
             job.progress_percentage = 100
+            self._save_live_fields(job)
             db.session.commit()
             
             self.log(f"Sync complete: {job.added_tracks} added, {job.failed_tracks} failed")
+            self._publish_status(job)
             
         except Exception as e:
             self.log(f"Sync failed: {str(e)}", "ERROR")
             job.status = 'failed'
             job.error_message = str(e)
             job.completed_at = datetime.now(timezone.utc).replace(tzinfo=None)
+            self._save_live_fields(job)
             db.session.commit()
+            self._publish_status(job)
         
         finally:
             self.is_running = False
@@ -247,6 +484,7 @@ class SyncOrchestrator:
                 db.session.add(job)
                 db.session.commit()
                 job_id = job.id
+            self.job_id = job_id
             
             # Get YouTube Music playlists
             self.log("Fetching YouTube Music playlists")
@@ -254,28 +492,20 @@ class SyncOrchestrator:
             job.total_playlists = len(playlists)
             db.session.commit()
             
+            # Load the Spotify library once; created playlists are added as we go
+            self.log("Fetching Spotify playlists")
+            spotify_index = self._index_playlists(self.spotify.get_playlists(), 'name')
+            
             # Process each playlist
             for playlist_idx, playlist in enumerate(playlists):
                 self.log(f"Processing playlist: {playlist.get('title', 'Unknown')}")
                 job.current_playlist_name = playlist.get('title', 'Unknown')
-                job.current_track_name = None
-                job.current_track_image_url = None
                 job.progress_percentage = int((playlist_idx / len(playlists)) * 100)
-                db.session.commit()
-                
-                # Get playlist details
-                playlist_data = self.ytmusic.get_playlist(playlist.get('playlistId'))
-                tracks = playlist_data.get('tracks', [])
-                job.total_tracks += len(tracks)
+                job_progress.update(job.id, **dict.fromkeys(LIVE_TRACK_FIELDS))
+                self._report_progress(job)
                 
                 # Create or find Spotify playlist
-                spotify_playlists = self.spotify.get_playlists()
-                existing_playlist = None
-                
-                for sp_pl in spotify_playlists:
-                    if sp_pl.get('name') == playlist.get('title'):
-                        existing_playlist = sp_pl
-                        break
+                existing_playlist = spotify_index.get(playlist.get('title'))
                 
                 if not existing_playlist:
                     new_playlist = self.spotify.create_playlist(
@@ -283,87 +513,155 @@ class SyncOrchestrator:
                         description=playlist.get('description', '')
                     )
                     playlist_id = new_playlist.get('id')
+                    spotify_index[playlist.get('title')] = new_playlist
+                    synced_keys = set()
+                    existing_ids = set()
                 else:
                     playlist_id = existing_playlist.get('id')
+                    synced_keys = SnapshotManager.load_track_keys(
+                        self.user_id, 'ytmusic', playlist.get('playlistId')
+                    )
+                    existing_ids = None  # Read on the first match, then kept for the playlist
                 
-                # Process tracks
-                track_uris_to_add = []
+                # Process tracks; matched URIs are written in batches while matching continues
+                writer = BatchWriter(
+                    partial(self.spotify.add_tracks_to_playlist, playlist_id), batch_size_for('spotify')
+                )
+                queued = {}
                 
-                for track_data in tracks:
-                    query_track = {
-                        'name': track_data.get('title', ''),
-                        'artists': [a.get('name', '') for a in track_data.get('artists', [])],
-                        'duration_ms': track_data.get('durationMs', track_data.get('duration_seconds', 0) * 1000)
-                    }
-
-                    job.current_track_name = track_data.get('title', '')
-                    job.current_track_artist = ", ".join([a.get('name', '') for a in track_data.get('artists', [])])
-                    thumbnails = track_data.get('thumbnails', [])
-                    job.current_track_image_url = thumbnails[-1].get('url') if thumbnails else None
+                # Only tracks added since the last successful sync need matching
+                source_keys = []
+                failed_keys = set()
+                new_tracks = 0
+                
+                # Stream tracks from YouTube Music page by page
+                for tracks in self.ytmusic.iter_playlist_tracks(playlist.get('playlistId')):
+                    job.total_tracks += len(tracks)
+                    pending = []
+                    for track_data in tracks:
+                        query_track = {
+                            'name': track_data.get('title', ''),
+                            'artists': [a.get('name', '') for a in track_data.get('artists', [])],
+                            'duration_ms': track_data.get('durationMs', track_data.get('duration_seconds', 0) * 1000)
+                        }
+                        key = track_key(track_data.get('videoId'), query_track)
+                        source_keys.append(key)
+                        if key not in synced_keys:
+                            pending.append((track_data, query_track, key, negative_cache_key(query_track)))
+                    
+                    new_tracks += len(pending)
+                    if not pending:
+                        continue
+                    
+                    # Previously confirmed matches and known-unmatchable tracks skip the search
+                    # Mappings from an older matcher version are not reused, but their ISRC
+                    # gets an exact lookup before any fuzzy search
+                    cached, isrcs = TrackMappingCache.lookup_with_isrcs(
+                        'ytmusic', [item[0].get('videoId') for item in pending], 'spotify'
+                    )
+                    known_misses = NegativeMatchCache.lookup_many([item[3] for item in pending], 'spotify')
+                    blocked = NegativeMatchCache.active_keys(known_misses)
+                    
+                    def match(item):
+                        track_data, query_track, _, miss_key = item
+                        uri = cached.get(track_data.get('videoId'))
+                        if uri:
+                            return {'uri': uri}, None
+                        isrc = isrcs.get(track_data.get('videoId'))
+                        if isrc:
+                            try:
+                                exact = self._match_on_spotify_isrc(isrc)
+                            except Exception as e:
+                                # The exact lookup is only a shortcut; fuzzy search is the fallback
+                                self.log(f"ISRC lookup failed for {query_track['name']}: {e}", "WARNING")
+                                exact = None
+                            if exact:
+                                return exact
+                        if miss_key in blocked:
+                            return None, None
+                        return self._match_on_spotify(query_track)
+                    
+                    # Search on Spotify concurrently, consume results in source order
+                    results = self._map_concurrently(match, pending)
                     
-                    try:
-                        search_results = self.spotify.search_track(
-                            f"{query_track['name']} {' '.join(query_track['artists'])}",
-                            limit=5
+                    for (track_data, query_track, key, miss_key), result in zip(pending, results):
+                        thumbnails = track_data.get('thumbnails', [])
+                        self._report_track(
+                            job, track_data.get('title', ''),
+                            ", ".join([a.get('name', '') for a in track_data.get('artists', [])]),
+                            thumbnails[-1].get('url') if thumbnails else None
                         )
                         
-                        tracks_list = search_results.get('tracks', {}).get('items', [])
+                        error = result if isinstance(result, Exception) else None
+                        best_match, score = (None, None) if error else result
                         
-                        # Normalize and find best match
-                        normalized_results = [normalize_spotify_track(r) for r in tracks_list]
-                        best_match = find_best_match(
-                            query_track,
-                            normalized_results,
-                            threshold=0.90
-                        )
-                        
-                        if best_match:
+                        if error:
+                            self._record_failed_track(job, query_track, str(error))
+                            failed_keys.add(key)
+                        elif best_match:
                             uri = best_match.get('uri')
-                            if uri and uri not in track_uris_to_add:
-                                track_uris_to_add.append(uri)
-                                job.added_tracks += 1
-                        else:
-                            failed_track = FailedTrack(
-                                sync_job_id=job_id,
-                                track_name=query_track['name'],
-                                artist_names=", ".join(query_track['artists']),
-                                reason="No match found"
-                            )
-                            db.session.add(failed_track)
+                            if score is not None:
+                                TrackMappingCache.store(
+                                    'ytmusic', track_data.get('videoId'), 'spotify', uri, score,
+                                    isrc=best_match.get('isrc')
+                                )
+                            if miss_key in known_misses:
+                                NegativeMatchCache.clear(miss_key, 'spotify')
+                            if uri and existing_ids is None:
+                                existing_ids = self.spotify.get_playlist_track_uris(playlist_id)
+                            if uri and uri not in existing_ids:
+                                if uri not in queued:
+                                    queued[uri] = []
+                                    job.added_tracks += 1
+                                    self._publish(
+                                        'matched', name=query_track['name'],
+                                        artists=query_track['artists'], id=uri
+                                    )
+                                    writer.add(uri)
+                                queued[uri].append((key, query_track))
+                        elif miss_key in blocked:
+                            # Known unmatchable, not searched until the negative entry expires
                             job.failed_tracks += 1
+                            failed_keys.add(key)
+                            self._publish(
+                                'failed', name=query_track['name'], artists=query_track['artists'],
+                                reason="No match last time"
+                            )
+                        else:
+                            NegativeMatchCache.record_miss(query_track, 'spotify')
+                            self._record_failed_track(job, query_track, "No match found")
+                            failed_keys.add(key)
                     
-                    except Exception as e:
-                        failed_track = FailedTrack(
-                            sync_job_id=job_id,
-                            track_name=query_track['name'],
-                            artist_names=", ".join(query_track['artists']),
-                            reason=str(e)
-                        )
-                        db.session.add(failed_track)
-                        job.failed_tracks += 1
+                    self._report_progress(job)
                     
-                    if len(track_uris_to_add) >= 20:
-                        self.spotify.add_tracks_to_playlist(playlist_id, track_uris_to_add[:20])
-                        track_uris_to_add = track_uris_to_add[20:]
-                        db.session.commit()
+                if synced_keys:
+                    self.log(f"{new_tracks} new tracks since last sync")
                 
-                if track_uris_to_add:
-                    self.spotify.add_tracks_to_playlist(playlist_id, track_uris_to_add)
-                    db.session.commit()
+                self._finish_writes(job, writer, queued, failed_keys)
+                
+                # Record synced tracks; failed ones are left out so the next run retries them
+                SnapshotManager.save_snapshot(
+                    self.user_id, 'ytmusic', playlist.get('playlistId'), playlist.get('title', 'Unknown'),
+                    [k for k in dict.fromkeys(source_keys) if k not in failed_keys]
+                )
             
             job.status = 'success'
             job.completed_at = datetime.now(timezone.utc).replace(tzinfo=None)
             job.progress_percentage = 100
+            self._save_live_fields(job)
             db.session.commit()
             
             self.log(f"Sync complete: {job.added_tracks} added, {job.failed_tracks} failed")
+            self._publish_status(job)
             
         except Exception as e:
             self.log(f"Sync failed: {str(e)}", "ERROR")
             job.status = 'failed'
             job.error_message = str(e)
             job.completed_at = datetime.now(timezone.utc).replace(tzinfo=None)
+            self._save_live_fields(job)
             db.session.commit()
+            self._publish_status(job)
         
         finally:
             self.is_running = False
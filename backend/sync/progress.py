@@ -0,0 +1,76 @@
+import json
+import os
+import tempfile
+import threading
+from backend.config import LIVE_PROGRESS_DIR
+
+# SyncJob fields that only describe what a running job is doing right now
+LIVE_TRACK_FIELDS = ('current_track_name', 'current_track_artist', 'current_track_image_url')
+
+
+class JobProgressRegistry:
+    """
+    Process-local live state of running sync jobs
+
+    The orchestrator updates the current track (and its latest counters) here
+    instead of on the SyncJob row, and /jobs/<job_id> reads from here first.
+    With shared_dir set (ideally on tmpfs such as /dev/shm), every update is
+    also mirrored to a small JSON file so other worker processes on the same
+    host can read it.
+    """
+
+    def __init__(self, shared_dir: str = LIVE_PROGRESS_DIR):
+        self.shared_dir = shared_dir
+        self.jobs = {}
+        self.lock = threading.Lock()
+        if shared_dir:
+            os.makedirs(shared_dir, exist_ok=True)
+
+    def _path(self, job_id: str) -> str:
+        return os.path.join(self.shared_dir, f"{job_id}.json")
+
+    def _write_shared(self, job_id: str, fields: dict):
+        """Replace the job's file atomically so readers never see a partial write"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.shared_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(fields, f)
+        os.replace(tmp_path, self._path(job_id))
+
+    def _read_shared(self, job_id: str) -> dict:
+        try:
+            with open(self._path(job_id)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def update(self, job_id: str, **fields):
+        """Set live fields of a running job"""
+        with self.lock:
+            state = self.jobs.setdefault(job_id, {})
+            state.update(fields)
+            if self.shared_dir:
+                self._write_shared(job_id, state)
+
+    def get(self, job_id: str) -> dict:
+        """Live fields of a job; empty when it is not running (here or in another process)"""
+        with self.lock:
+            state = self.jobs.get(job_id)
+            if state is not None:
+                return dict(state)
+        if self.shared_dir:
+            return self._read_shared(job_id)
+        return {}
+
+    def pop(self, job_id: str) -> dict:
+        """Remove a finished job and return its last live fields"""
+        with self.lock:
+            state = self.jobs.pop(job_id, {})
+            if self.shared_dir:
+                try:
+                    os.remove(self._path(job_id))
+                except OSError:
+                    pass
+        return state
+
+
+job_progress = JobProgressRegistry()
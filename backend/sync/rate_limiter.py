@@ -1,38 +1,298 @@
 import time
 import threading
+from collections import deque
+from backend.config import API_RATE_LIMIT_REQUESTS, API_RATE_LIMIT_PERIOD_SECONDS
+
+# Pause applied when a provider throttles without sending Retry-After
+DEFAULT_RETRY_AFTER_SECONDS = 1.0
+# Retries of a throttled request before giving up
+MAX_THROTTLE_RETRIES = 3
+# Longer Retry-After values pause the bucket but fail the request instead of waiting
+MAX_RETRY_AFTER_SECONDS = 300
+# Multiplicative decrease applied to the window allowance on every throttle
+THROTTLE_DECREASE = 0.5
+
 
 class RateLimiter:
-    """Thread-safe rate limiter using token bucket algorithm (fixed - no recursion)"""
-    
-    def __init__(self, max_calls: int = 100, period_seconds: int = 60):
+    """
+    Thread-safe rate limiter: sliding window of max_calls per period, plus an
+    optional token bucket that limits bursts inside the window
+
+    Expired timestamps are popped from the left of a deque, so acquiring is
+    O(1) amortized instead of rebuilding the call list on every request.
+
+    The allowance adapts to provider feedback AIMD-style: throttle() pauses
+    the limiter and halves the allowance (once per throttle event, however many
+    in-flight calls report it), and recover() adds 1/limit per successful call,
+    i.e. about one call per window, until max_calls is reached again.
+    """
+
+    def __init__(self, max_calls: int = 100, period_seconds: int = 60, burst: int = None):
+        """
+        Args:
+            max_calls: Calls allowed in any window of period_seconds
+            period_seconds: Window length in seconds
+            burst: Calls allowed back to back (default: max_calls, i.e. no smoothing).
+                When lower than max_calls, tokens refill at max_calls / period_seconds.
+        """
         self.max_calls = max_calls
         self.period = period_seconds
-        self.calls = []
+        self.burst = min(burst or max_calls, max_calls)
+        self.calls = deque()
         self.lock = threading.Lock()
-    
-    def wait_if_needed(self):
-        """Wait if rate limit reached, using iterative approach"""
+
+        # Current allowance per window (lowered by throttle, raised by recover)
+        self.limit = max_calls
+        self.paused_until = 0.0
+
+        # Token bucket, only consulted when burst is lower than the window allowance
+        self.rate = max_calls / period_seconds
+        self.tokens = float(self.burst)
+        self.last_refill = time.monotonic()
+
+    def _refill(self, now: float):
+        """Add tokens earned since the last refill (lock held)"""
+        self.tokens = min(self.burst, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+    def _reserve(self, n: int, now: float) -> float:
+        """Take n slots if available and return 0, else return seconds to wait (lock held)"""
+        if now < self.paused_until:
+            return self.paused_until - now
+
+        # Remove old calls outside the window
+        while self.calls and now - self.calls[0] >= self.period:
+            self.calls.popleft()
+
+        wait_time = 0.0
+        excess = len(self.calls) + n - max(int(self.limit), n)
+        if excess > 0:
+            # Wait until enough of the oldest calls leave the window
+            wait_time = self.period - (now - self.calls[excess - 1])
+
+        if self.burst < self.max_calls:
+            self._refill(now)
+            if self.tokens < n:
+                wait_time = max(wait_time, (n - self.tokens) / self.rate)
+
+        if wait_time > 0:
+            return wait_time
+
+        self.calls.extend([now] * n)
+        if self.burst < self.max_calls:
+            self.tokens -= n
+        return 0.0
+
+    def _check_batch_size(self, n: int):
+        if n < 1 or n > self.burst:
+            raise ValueError(f"Cannot acquire {n} calls (burst is {self.burst})")
+
+    def reserve(self, n: int = 1) -> float:
+        """Take n calls if available and return 0.0, otherwise return seconds to wait"""
+        self._check_batch_size(n)
+        with self.lock:
+            return self._reserve(n, time.monotonic())
+
+    def try_acquire(self, n: int = 1) -> bool:
+        """Take n calls without blocking; returns False if the limit would be exceeded"""
+        return self.reserve(n) == 0.0
+
+    def acquire(self, n: int = 1, timeout: float = None) -> bool:
+        """
+        Block until n calls can be made (e.g. one batch request counting as n)
+
+        Returns:
+            bool: True once acquired, False if timeout (seconds) ran out first
+        """
+        self._check_batch_size(n)
+        deadline = None if timeout is None else time.monotonic() + timeout
+
         while True:
             with self.lock:
-                now = time.time()
-                
-                # Remove old calls outside the window
-                self.calls = [t for t in self.calls if now - t < self.period]
-                
-                if len(self.calls) < self.max_calls:
-                    # Can make the call
-                    self.calls.append(now)
-                    return  # Exit the loop
-                
-                # Calculate wait time
-                oldest_call = min(self.calls)
-                wait_time = self.period - (now - oldest_call) + 0.1
-            
+                now = time.monotonic()
+                wait_time = self._reserve(n, now)
+
+            if wait_time == 0.0:
+                return True
+
+            if deadline is not None:
+                remaining = deadline - now
+                if remaining <= 0:
+                    return False
+                wait_time = min(wait_time, remaining)
+
             # Wait outside the lock
-            if wait_time > 0:
-                time.sleep(wait_time)
-    
+            time.sleep(wait_time + 0.01)
+
+    def wait_if_needed(self):
+        """Wait if rate limit reached"""
+        self.acquire()
+
+    def throttle(self, retry_after: float = None):
+        """
+        Provider rejected a call: pause for retry_after seconds and halve the allowance
+
+        Rejections reported while already paused belong to the same event (calls
+        that were in flight together), so they only extend the pause.
+        """
+        if retry_after is None:
+            retry_after = DEFAULT_RETRY_AFTER_SECONDS
+        with self.lock:
+            now = time.monotonic()
+            if now >= self.paused_until:
+                self.limit = max(1.0, self.limit * THROTTLE_DECREASE)
+                self.rate = self.limit / self.period
+            self.paused_until = max(self.paused_until, now + retry_after)
+
+    def recover(self):
+        """Provider accepted a call: grow the allowance by 1/limit (about +1 per window)"""
+        if self.limit >= self.max_calls:
+            return
+        with self.lock:
+            self.limit = min(self.max_calls, self.limit + 1 / self.limit)
+            self.rate = self.limit / self.period
+
     def register_call(self):
         """Register a call for rate limiting"""
         with self.lock:
-            self.calls.append(time.time())
+            now = time.monotonic()
+            self.calls.append(now)
+            if self.burst < self.max_calls:
+                self._refill(now)
+                self.tokens = max(self.tokens - 1, 0.0)
+
+
+class SharedRateLimiter:
+    """
+    App-wide call budget shared fairly between the users currently using it
+
+    Every user that made a call in the last period counts as active, and each
+    active user may use at most max_calls / active_users of the window, so one
+    large sync cannot starve concurrent jobs on the same app credential.
+    """
+
+    def __init__(self, max_calls: int = API_RATE_LIMIT_REQUESTS,
+                 period_seconds: int = API_RATE_LIMIT_PERIOD_SECONDS):
+        self.max_calls = max_calls
+        self.period = period_seconds
+        self.limiter = RateLimiter(max_calls, period_seconds)
+        self.user_calls = {}
+        self.lock = threading.Lock()
+
+    def _user_wait(self, user_id: str, n: int, now: float) -> float:
+        """Seconds until user_id is back within its fair share (lock held)"""
+        for uid in list(self.user_calls):
+            calls = self.user_calls[uid]
+            while calls and now - calls[0] >= self.period:
+                calls.popleft()
+            if not calls:
+                del self.user_calls[uid]
+
+        calls = self.user_calls.get(user_id, ())
+        active_users = len(self.user_calls) + (0 if user_id in self.user_calls else 1)
+        share = max(int(self.limiter.limit) // active_users, n)
+
+        excess = len(calls) + n - share
+        if excess > 0:
+            return self.period - (now - calls[excess - 1])
+        return 0.0
+
+    def reserve(self, user_id: str = None, n: int = 1) -> float:
+        """Take n calls for user_id if allowed and return 0.0, otherwise return seconds to wait"""
+        if user_id is None:
+            return self.limiter.reserve(n)
+
+        with self.lock:
+            now = time.monotonic()
+            wait_time = self._user_wait(user_id, n, now)
+            if wait_time > 0:
+                return wait_time
+
+            wait_time = self.limiter.reserve(n)
+            if wait_time == 0.0:
+                self.user_calls.setdefault(user_id, deque()).extend([now] * n)
+            return wait_time
+
+    def acquire(self, user_id: str = None, n: int = 1, timeout: float = None) -> bool:
+        """Block until user_id may make n calls; False if timeout ran out first"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            wait_time = self.reserve(user_id, n)
+            if wait_time == 0.0:
+                return True
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait_time = min(wait_time, remaining)
+
+            time.sleep(wait_time + 0.01)
+
+    def throttle(self, retry_after: float = None):
+        """Pause every user of this credential after the provider throttled one of them"""
+        self.limiter.throttle(retry_after)
+
+    def recover(self):
+        """Ramp the shared allowance back up after a successful call"""
+        self.limiter.recover()
+
+    def for_user(self, user_id: str = None) -> 'UserRateLimiter':
+        """Limiter handle bound to one user"""
+        return UserRateLimiter(self, user_id)
+
+
+class UserRateLimiter:
+    """A user's view of a SharedRateLimiter, with the same interface as RateLimiter"""
+
+    def __init__(self, shared: SharedRateLimiter, user_id: str = None):
+        self.shared = shared
+        self.user_id = user_id
+
+    def try_acquire(self, n: int = 1) -> bool:
+        return self.shared.reserve(self.user_id, n) == 0.0
+
+    def acquire(self, n: int = 1, timeout: float = None) -> bool:
+        return self.shared.acquire(self.user_id, n, timeout)
+
+    def wait_if_needed(self):
+        """Wait if rate limit reached"""
+        self.shared.acquire(self.user_id)
+
+    def throttle(self, retry_after: float = None):
+        self.shared.throttle(retry_after)
+
+    def recover(self):
+        self.shared.recover()
+
+
+class RateLimiterRegistry:
+    """Process-wide shared limiters, one per (service, app client ID)"""
+
+    def __init__(self, max_calls: int = API_RATE_LIMIT_REQUESTS,
+                 period_seconds: int = API_RATE_LIMIT_PERIOD_SECONDS):
+        self.max_calls = max_calls
+        self.period = period_seconds
+        self.limiters = {}
+        self.lock = threading.Lock()
+
+    def get_shared(self, service: str, client_id: str = "") -> SharedRateLimiter:
+        """Get (or create) the app-wide limiter for a service credential"""
+        key = (service, client_id or "")
+        with self.lock:
+            if key not in self.limiters:
+                self.limiters[key] = SharedRateLimiter(self.max_calls, self.period)
+            return self.limiters[key]
+
+    def get(self, service: str, client_id: str = "", user_id: str = None) -> UserRateLimiter:
+        """Get a limiter handle for a user on a service credential"""
+        return self.get_shared(service, client_id).for_user(user_id)
+
+    def clear(self):
+        """Drop all shared limiters"""
+        with self.lock:
+            self.limiters.clear()
+
+
+rate_limiters = RateLimiterRegistry()
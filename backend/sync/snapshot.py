@@ -0,0 +1,49 @@
+from backend.database import db, PlaylistSnapshot
+from datetime import datetime, timezone
+
+
+class SnapshotManager:
+    """Persist the source track list of each synced playlist for incremental syncs"""
+
+    @staticmethod
+    def get_snapshot(user_id: str, service: str, playlist_id: str) -> PlaylistSnapshot:
+        """Get snapshot for a source playlist"""
+        return PlaylistSnapshot.query.filter_by(
+            user_id=user_id, service=service, playlist_id=playlist_id
+        ).first()
+
+    @staticmethod
+    def load_track_keys(user_id: str, service: str, playlist_id: str) -> set:
+        """Load the track keys recorded at the last successful sync"""
+        snapshot = SnapshotManager.get_snapshot(user_id, service, playlist_id)
+        if snapshot:
+            return set(snapshot.tracks or [])
+        return set()
+
+    @staticmethod
+    def save_snapshot(user_id: str, service: str, playlist_id: str,
+                      playlist_name: str, track_keys: list,
+                      source_snapshot_id: str = None, retry_at: datetime = None):
+        """Save or update the snapshot for a source playlist"""
+        snapshot = SnapshotManager.get_snapshot(user_id, service, playlist_id)
+
+        if snapshot:
+            snapshot.playlist_name = playlist_name
+            snapshot.tracks = list(track_keys)
+            snapshot.source_snapshot_id = source_snapshot_id
+            snapshot.retry_at = retry_at
+            snapshot.synced_at = datetime.now(timezone.utc).replace(tzinfo=None)
+        else:
+            snapshot = PlaylistSnapshot(
+                user_id=user_id,
+                service=service,
+                playlist_id=playlist_id,
+                playlist_name=playlist_name,
+                tracks=list(track_keys),
+                source_snapshot_id=source_snapshot_id,
+                retry_at=retry_at
+            )
+            db.session.add(snapshot)
+
+        db.session.commit()
+        return snapshot
@@ -1,6 +1,44 @@
 import requests
+from typing import NamedTuple, Optional, Tuple
 from backend.auth.token_manager import TokenManager
-from backend.sync.rate_limiter import RateLimiter
+from backend.config import SPOTIFY_CLIENT_ID, MAX_CONCURRENT_WORKERS
+from backend.sync.batch_writer import RejectedItemsError
+from backend.sync.concurrency import map_concurrently
+from backend.sync.http_session import get_session, DEFAULT_TIMEOUT
+from backend.sync.rate_limiter import rate_limiters, MAX_THROTTLE_RETRIES, MAX_RETRY_AFTER_SECONDS
+
+# Only the parts of a playlist item that SpotifyTrack keeps
+PLAYLIST_TRACK_FIELDS = (
+    "items(track(id,uri,name,duration_ms,artists(name),album(images(url)),external_ids(isrc))),total"
+)
+
+
+class SpotifyTrack(NamedTuple):
+    """Lightweight playlist track: just what the sync needs from a full track object"""
+    id: Optional[str]
+    uri: Optional[str]
+    name: str
+    artists: Tuple[str, ...]
+    duration_ms: int
+    image_url: Optional[str]
+    isrc: Optional[str] = None
+    
+    @classmethod
+    def from_item(cls, item: dict) -> Optional['SpotifyTrack']:
+        """Build from a playlist item; None for removed tracks"""
+        track = item.get('track')
+        if not track:
+            return None
+        images = (track.get('album') or {}).get('images') or []
+        return cls(
+            id=track.get('id'),
+            uri=track.get('uri'),
+            name=track.get('name') or '',
+            artists=tuple(a.get('name', '') for a in track.get('artists') or []),
+            duration_ms=track.get('duration_ms') or 0,
+            image_url=images[0].get('url') if images else None,
+            isrc=(track.get('external_ids') or {}).get('isrc')
+        )
 
 
 class SpotifyClient:
@@ -9,7 +47,7 @@ class SpotifyClient:
     def __init__(self, user_id: str):
         self.user_id = user_id
         self.base_url = "https://api.spotify.com/v1"
-        self.rate_limiter = RateLimiter(max_calls=100, period_seconds=60)
+        self.rate_limiter = rate_limiters.get('spotify', SPOTIFY_CLIENT_ID, user_id)
     
     def _get_headers(self):
         """Get authorization headers with fresh token"""
@@ -19,6 +57,21 @@ class SpotifyClient:
             "Content-Type": "application/json"
         }
     
+    @staticmethod
+    def _retry_after(response):
+        """Seconds from a Retry-After header, or None if missing or malformed"""
+        try:
+            return float(response.headers.get('Retry-After'))
+        except (TypeError, ValueError):
+            return None
+    
+    @staticmethod
+    def _send(method: str, url: str, headers: dict, **kwargs):
+        """Send one request over the pooled keep-alive session"""
+        return get_session().request(
+            method, url, headers=headers, timeout=DEFAULT_TIMEOUT, **kwargs
+        )
+    
     def _make_request(self, method: str, endpoint: str, **kwargs):
         """Make authenticated API request with retry logic"""
         self.rate_limiter.wait_if_needed()
@@ -27,51 +80,88 @@ class SpotifyClient:
         headers = self._get_headers()
         
         try:
-            response = requests.request(
-                method, url, headers=headers, timeout=30, **kwargs
-            )
+            response = self._send(method, url, headers, **kwargs)
             
             if response.status_code == 401:
-                # Token expired, refresh and retry
-                TokenManager.refresh_spotify_token(self.user_id)
+                # Token expired, refresh (unless another request already did) and retry
+                stale_token = headers["Authorization"].removeprefix("Bearer ")
+                TokenManager.refresh_spotify_token(self.user_id, stale_token=stale_token)
                 headers = self._get_headers()
-                response = requests.request(
-                    method, url, headers=headers, timeout=30, **kwargs
-                )
+                response = self._send(method, url, headers, **kwargs)
+            
+            retries = 0
+            while response.status_code == 429 and retries < MAX_THROTTLE_RETRIES:
+                # Throttled: pause the shared limiter for every job, then retry
+                retry_after = self._retry_after(response)
+                self.rate_limiter.throttle(retry_after)
+                if retry_after is not None and retry_after > MAX_RETRY_AFTER_SECONDS:
+                    break
+                
+                retries += 1
+                self.rate_limiter.wait_if_needed()
+                response = self._send(method, url, headers, **kwargs)
             
             response.raise_for_status()
+            self.rate_limiter.recover()
             return response.json()
             
         except requests.exceptions.RequestException as e:
-            raise Exception(f"Spotify API error: {str(e)}")
+            raise Exception(f"Spotify API error: {str(e)}") from e
     
-    def get_playlists(self, limit=50):
-        """Get all user playlists"""
-        playlists = []
-        url = f"me/playlists?limit={limit}"
+    def _iter_pages(self, endpoint: str, limit: int):
+        """
+        Yield the items of a paginated endpoint one page at a time
+
+        The first page gives the total; the remaining offsets are then fetched
+        concurrently (each request still goes through the shared rate limiter)
+        with a bounded read-ahead, and yielded in playlist order.
+        """
+        separator = '&' if '?' in endpoint else '?'
         
-        while url:
-            data = self._make_request('GET', url)
-            playlists.extend(data.get('items', []))
-            url = data.get('next')
-            if url:
-                url = url.replace("https://api.spotify.com/v1/", "")
+        def fetch(offset):
+            return self._make_request('GET', f"{endpoint}{separator}limit={limit}&offset={offset}")
         
-        return playlists
-    
-    def get_playlist_tracks(self, playlist_id: str):
-        """Get all tracks from a playlist"""
-        tracks = []
-        url = f"playlists/{playlist_id}/tracks?limit=100"
+        first = fetch(0)
+        yield first.get('items', [])
         
-        while url:
-            data = self._make_request('GET', url)
-            tracks.extend(data.get('items', []))
-            url = data.get('next')
-            if url:
-                url = url.replace("https://api.spotify.com/v1/", "")
+        offsets = range(limit, first.get('total') or 0, limit)
+        if not offsets:
+            return
         
-        return tracks
+        for page in map_concurrently(fetch, offsets, min(MAX_CONCURRENT_WORKERS, len(offsets))):
+            yield page.get('items', [])
+    
+    def get_playlists(self, limit=50):
+        """Get all user playlists"""
+        return [p for page in self._iter_pages("me/playlists", limit) for p in page]
+    
+    def iter_playlist_tracks(self, playlist_id: str):
+        """
+        Stream a playlist's tracks page by page
+
+        Only the fields in PLAYLIST_TRACK_FIELDS are requested, which keeps
+        album artwork lists, markets and external URLs out of the payload.
+
+        Yields:
+            list: SpotifyTrack records of one page (removed tracks are skipped)
+        """
+        pages = self._iter_pages(f"playlists/{playlist_id}/tracks?fields={PLAYLIST_TRACK_FIELDS}", 100)
+        for items in pages:
+            yield [t for t in map(SpotifyTrack.from_item, items) if t is not None]
+    
+    def get_playlist_tracks(self, playlist_id: str):
+        """Get all tracks from a playlist as SpotifyTrack records"""
+        return [t for page in self.iter_playlist_tracks(playlist_id) for t in page]
+    
+    def get_playlist_track_uris(self, playlist_id: str) -> set:
+        """URIs of the tracks already in a playlist (only the URI field is fetched)"""
+        pages = self._iter_pages(f"playlists/{playlist_id}/tracks?fields=items(track(uri)),total", 100)
+        return {
+            item['track']['uri']
+            for page in pages
+            for item in page
+            if item.get('track') and item['track'].get('uri')
+        }
     
     def search_track(self, query: str, limit=5):
         """Search for a track"""
@@ -79,6 +169,12 @@ class SpotifyClient:
         encoded_query = quote(query)
         return self._make_request('GET', f"search?q={encoded_query}&type=track&limit={limit}")
     
+    def search_isrc(self, isrc: str):
+        """Exact lookup of a recording by ISRC; returns the first track or None"""
+        data = self._make_request('GET', f"search?q=isrc:{isrc}&type=track&limit=1")
+        items = data.get('tracks', {}).get('items', [])
+        return items[0] if items else None
+    
     def create_playlist(self, name: str, description: str = "", public: bool = False):
         """Create a new playlist"""
         return self._make_request(
@@ -91,8 +187,15 @@ class SpotifyClient:
         )
     
     def add_tracks_to_playlist(self, playlist_id: str, track_uris: list):
-        """Add tracks to a playlist"""
-        return self._make_request(
-            'POST', f'playlists/{playlist_id}/tracks',
-            json={"uris": track_uris}
-        )
+        """Add tracks to a playlist; raises RejectedItemsError if Spotify refuses the URIs"""
+        try:
+            return self._make_request(
+                'POST', f'playlists/{playlist_id}/tracks',
+                json={"uris": track_uris}
+            )
+        except Exception as e:
+            # 400 means bad items (e.g. an invalid URI); anything else is about the request
+            response = getattr(e.__cause__, 'response', None)
+            if response is not None and response.status_code == 400:
+                raise RejectedItemsError(str(e)) from e
+            raise
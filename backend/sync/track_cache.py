@@ -0,0 +1,105 @@
+from backend.database import db, TrackMapping
+from backend.sync.matcher import MATCHER_VERSION
+from datetime import datetime, timezone
+from sqlalchemy.exc import IntegrityError
+
+
+class TrackMappingCache:
+    """Cross-job, cross-user cache of confirmed track matches between services"""
+
+    @staticmethod
+    def lookup_many(source_service: str, source_ids: list, target_service: str) -> dict:
+        """
+        Look up cached matches for a list of source track IDs
+
+        Mappings are usable in both directions: a Spotify → YouTube Music match
+        also answers a YouTube Music → Spotify lookup for the same pair.
+
+        Returns:
+            dict: source ID → target ID for every cached hit
+        """
+        return TrackMappingCache.lookup_with_isrcs(source_service, source_ids, target_service)[0]
+
+    @staticmethod
+    def lookup_with_isrcs(source_service: str, source_ids: list, target_service: str) -> tuple:
+        """
+        Look up cached matches, plus the ISRCs of mappings made by older matcher versions
+
+        Only current-version mappings count as matches. A track whose mappings all
+        predate a matcher upgrade can still reuse their ISRC, since it identifies
+        the recording itself. Both come from the same two queries.
+
+        Returns:
+            tuple: (source ID → target ID for every cached hit,
+                    source ID → ISRC for tracks with only stale mappings that carry one)
+        """
+        source_ids = list({i for i in source_ids if i})
+        if not source_ids:
+            return {}, {}
+
+        forward = TrackMapping.query.filter(
+            TrackMapping.source_service == source_service,
+            TrackMapping.target_service == target_service,
+            TrackMapping.source_id.in_(source_ids)
+        ).all()
+        reverse = TrackMapping.query.filter(
+            TrackMapping.source_service == target_service,
+            TrackMapping.target_service == source_service,
+            TrackMapping.target_id.in_(source_ids)
+        ).all()
+
+        matches = {}
+        isrcs = {}
+        # Forward mappings last so they win over reverse ones for the same track
+        pairs = [(m.target_id, m.source_id, m) for m in reverse]
+        pairs += [(m.source_id, m.target_id, m) for m in forward]
+        for track_id, other_id, mapping in pairs:
+            if mapping.matcher_version == MATCHER_VERSION:
+                matches[track_id] = other_id
+            elif mapping.isrc:
+                isrcs[track_id] = mapping.isrc
+
+        for track_id in matches:
+            isrcs.pop(track_id, None)
+        return matches, isrcs
+
+    @staticmethod
+    def store(source_service: str, source_id: str, target_service: str,
+              target_id: str, score: float = None, isrc: str = None):
+        """Record a confirmed match (flushed now, committed with the caller's session)"""
+        if not source_id or not target_id:
+            return None
+
+        mapping = TrackMapping.query.filter_by(
+            source_service=source_service,
+            source_id=source_id,
+            target_service=target_service
+        ).first()
+
+        if mapping:
+            mapping.target_id = target_id
+            mapping.score = score
+            mapping.matcher_version = MATCHER_VERSION
+            if isrc:
+                mapping.isrc = isrc
+            mapping.updated_at = datetime.now(timezone.utc).replace(tzinfo=None)
+            return mapping
+
+        mapping = TrackMapping(
+            source_service=source_service,
+            source_id=source_id,
+            target_service=target_service,
+            target_id=target_id,
+            score=score,
+            matcher_version=MATCHER_VERSION,
+            isrc=isrc
+        )
+
+        # Another job may have stored the same match concurrently
+        try:
+            with db.session.begin_nested():
+                db.session.add(mapping)
+        except IntegrityError:
+            return None
+
+        return mapping
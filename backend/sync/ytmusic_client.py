@@ -1,6 +1,76 @@
+import threading
+from contextlib import contextmanager
 from ytmusicapi import YTMusic
 from backend.auth.token_manager import TokenManager
-from backend.sync.rate_limiter import RateLimiter
+from backend.config import GOOGLE_OAUTH_CLIENT_ID, MAX_CONCURRENT_WORKERS
+from backend.sync.batch_writer import RejectedItemsError
+from backend.sync.rate_limiter import rate_limiters, MAX_THROTTLE_RETRIES
+
+# Substrings of ytmusicapi / Google API errors that mean we are being throttled
+QUOTA_ERROR_MARKERS = ('HTTP 429', 'quota', 'rateLimitExceeded', 'RESOURCE_EXHAUSTED')
+# Substrings that mean the access token was rejected
+AUTH_ERROR_MARKERS = ('HTTP 401', 'UNAUTHENTICATED', 'Invalid Credentials')
+
+
+def is_quota_error(error: Exception) -> bool:
+    """Whether an exception from ytmusicapi is a rate limit or quota error"""
+    message = str(error)
+    return any(marker in message for marker in QUOTA_ERROR_MARKERS)
+
+
+def is_auth_error(error: Exception) -> bool:
+    """Whether an exception from ytmusicapi means the access token is no longer valid"""
+    message = str(error)
+    return any(marker in message for marker in AUTH_ERROR_MARKERS)
+
+
+class YTMusicPool:
+    """
+    Process-wide, per-user pool of initialized YTMusic instances
+
+    Constructing YTMusic is expensive and its requests session is not safe to
+    share between threads, so each concurrent call checks an instance out and
+    returns it afterwards. The current access token is written into the
+    instance's headers on checkout, so a token refresh never rebuilds one.
+    """
+
+    def __init__(self, max_idle: int = MAX_CONCURRENT_WORKERS):
+        self.max_idle = max(1, max_idle)
+        self.idle = {}
+        self.lock = threading.Lock()
+
+    def acquire(self, user_id: str, access_token: str) -> YTMusic:
+        """Check out an instance authenticated with access_token"""
+        with self.lock:
+            idle = self.idle.get(user_id)
+            ytmusic = idle.pop() if idle else None
+
+        if ytmusic is None:
+            ytmusic = YTMusic()
+
+        ytmusic.headers.update({
+            "Authorization": f"Bearer {access_token}",
+            "X-Origin": "https://music.youtube.com"
+        })
+        return ytmusic
+
+    def release(self, user_id: str, ytmusic: YTMusic):
+        """Return an instance for reuse"""
+        with self.lock:
+            idle = self.idle.setdefault(user_id, [])
+            if len(idle) < self.max_idle:
+                idle.append(ytmusic)
+
+    def clear(self, user_id: str = None):
+        """Drop pooled instances (for one user, or everyone)"""
+        with self.lock:
+            if user_id is None:
+                self.idle.clear()
+            else:
+                self.idle.pop(user_id, None)
+
+
+ytmusic_pool = YTMusicPool()
 
 
 class YTMusicClient:
@@ -8,40 +78,52 @@ class YTMusicClient:
     
     def __init__(self, user_id: str):
         self.user_id = user_id
-        self.rate_limiter = RateLimiter(max_calls=100, period_seconds=60)
-        self._ytmusic = None
+        self.rate_limiter = rate_limiters.get('ytmusic', GOOGLE_OAUTH_CLIENT_ID, user_id)
+        self.pool = ytmusic_pool
+    
+    @contextmanager
+    def _get_ytmusic(self, access_token: str):
+        """Check out a YTMusic instance authenticated with access_token from the pool"""
+        ytmusic = self.pool.acquire(self.user_id, access_token)
+        try:
+            yield ytmusic
+        finally:
+            self.pool.release(self.user_id, ytmusic)
     
-    def _get_ytmusic(self):
-        """Get authenticated YTMusic instance"""
-        if self._ytmusic is None:
-            access_token = TokenManager.get_access_token(self.user_id, 'ytmusic')
+    def _call_with_backoff(self, access_token: str, method_name: str, *args, **kwargs):
+        """Call a YTMusic method, pausing the shared limiter and retrying on quota errors"""
+        retries = 0
+        while True:
+            try:
+                with self._get_ytmusic(access_token) as ytmusic:
+                    result = getattr(ytmusic, method_name)(*args, **kwargs)
+            except Exception as e:
+                if not is_quota_error(e) or retries >= MAX_THROTTLE_RETRIES:
+                    raise
+                # Throttled: pause the shared limiter for every job, then retry
+                self.rate_limiter.throttle()
+                retries += 1
+                self.rate_limiter.wait_if_needed()
+                continue
             
-            # Initialize with auth headers
-            self._ytmusic = YTMusic()
-            self._ytmusic.headers.update({
-                "Authorization": f"Bearer {access_token}",
-                "X-Origin": "https://music.youtube.com"
-            })
-        
-        return self._ytmusic
+            self.rate_limiter.recover()
+            return result
     
     def _make_request(self, method_name: str, *args, **kwargs):
         """Make API request with retry logic"""
         self.rate_limiter.wait_if_needed()
         
-        ytmusic = self._get_ytmusic()
-        
+        access_token = TokenManager.get_access_token(self.user_id, 'ytmusic')
         try:
-            method = getattr(ytmusic, method_name)
-            return method(*args, **kwargs)
+            return self._call_with_backoff(access_token, method_name, *args, **kwargs)
         except Exception as e:
-            # Try to refresh token and retry once
+            if not is_auth_error(e):
+                raise Exception(f"YouTube Music API error: {str(e)}")
+            
+            # Token rejected: refresh it (unless another request already did) and retry once
             try:
-                TokenManager.refresh_youtube_token(self.user_id)
-                self._ytmusic = None  # Reset instance
-                ytmusic = self._get_ytmusic()
-                method = getattr(ytmusic, method_name)
-                return method(*args, **kwargs)
+                access_token = TokenManager.refresh_youtube_token(self.user_id, stale_token=access_token)
+                return self._call_with_backoff(access_token, method_name, *args, **kwargs)
             except Exception as retry_e:
                 raise Exception(f"YouTube Music API error: {str(retry_e)}")
     
@@ -49,9 +131,29 @@ class YTMusicClient:
         """Get all user playlists"""
         return self._make_request('get_library_playlists')
     
-    def get_playlist(self, playlist_id: str):
-        """Get playlist details and tracks"""
-        return self._make_request('get_playlist', playlist_id)
+    def get_playlist(self, playlist_id: str, limit: int = None):
+        """Get playlist details and tracks (all of them unless limit is given)"""
+        return self._make_request('get_playlist', playlist_id, limit=limit)
+    
+    def iter_playlist_tracks(self, playlist_id: str, page_size: int = 100):
+        """
+        Yield a playlist's tracks in pages of page_size
+
+        ytmusicapi resolves playlist continuations internally, so the playlist
+        is fetched in one call; paging keeps the consumer identical to Spotify's.
+        """
+        tracks = self.get_playlist(playlist_id).get('tracks') or []
+        for start in range(0, len(tracks), page_size):
+            yield tracks[start:start + page_size]
+    
+    def get_playlist_video_ids(self, playlist_id: str) -> set:
+        """IDs of the videos already in a playlist"""
+        return {
+            track['videoId']
+            for page in self.iter_playlist_tracks(playlist_id)
+            for track in page
+            if track.get('videoId')
+        }
     
     def search(self, query: str, filter: str = "songs", limit=20):
         """Search for tracks"""
@@ -67,12 +169,18 @@ class YTMusicClient:
         )
     
     def add_playlist_items(self, playlist_id: str, video_ids: list):
-        """Add videos to a playlist"""
-        return self._make_request(
+        """Add videos to a playlist; raises RejectedItemsError if YouTube Music rejects the edit"""
+        result = self._make_request(
             'add_playlist_items',
             playlist_id,
             video_ids
         )
+        
+        # ytmusicapi returns the raw response instead of raising when the edit fails
+        if isinstance(result, dict) and 'SUCCEEDED' not in str(result.get('status', '')):
+            raise RejectedItemsError(f"YouTube Music API error: could not add items ({result.get('status', 'no status')})")
+        
+        return result
     
     def get_library_songs(self, limit=50):
         """Get library songs"""
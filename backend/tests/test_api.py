@@ -125,6 +125,67 @@ class TestJobEndpoints:
         assert data['current_track_artist'] is None
         assert data['current_track_image_url'] is None
 
+    def test_job_events_for_unknown_job_returns_404(self, client):
+        response = client.get('/api/jobs/nonexistent_id/events')
+        assert response.status_code == 404
+
+    def test_job_events_for_finished_job_sends_snapshot_only(self, client, app):
+        job_id = self._create_job(app, status='success')
+
+        response = client.get(f'/api/jobs/{job_id}/events')
+        assert response.status_code == 200
+        assert response.mimetype == 'text/event-stream'
+        body = response.get_data(as_text=True)
+        assert body.startswith('event: snapshot\n')
+        assert body.count('event: ') == 1
+
+    def test_job_events_stream_until_status(self, client, app):
+        from backend.sync.events import job_events
+
+        job_id = self._create_job(app, status='running')
+
+        response = client.get(f'/api/jobs/{job_id}/events', buffered=False)
+        assert job_events.has_subscribers(job_id)
+        job_events.publish(job_id, 'track', {'name': 'Song 1'})
+        job_events.publish(job_id, 'status', {'status': 'success'})
+
+        body = response.get_data(as_text=True)
+        events = [line.split(': ', 1)[1] for line in body.splitlines() if line.startswith('event: ')]
+        assert events == ['snapshot', 'track', 'status']
+        assert not job_events.has_subscribers(job_id)
+
+    @staticmethod
+    def _create_job(app, status):
+        from backend.database import db
+        from backend.database.models import SyncJob
+
+        with app.app_context():
+            job = SyncJob(
+                user_id='test_user',
+                job_type='sync',
+                source_service='spotify',
+                target_service='ytmusic',
+                status=status,
+            )
+            db.session.add(job)
+            db.session.commit()
+            return job.id
+
+    def test_get_job_prefers_live_progress(self, client, app):
+        from backend.sync.progress import job_progress
+
+        job_id = self._create_job(app, status='running')
+        job_progress.update(job_id, current_track_name='Live Track', added_tracks=7)
+        try:
+            data = client.get(f'/api/jobs/{job_id}').get_json()
+            user_jobs = client.get('/api/jobs/user/test_user').get_json()
+        finally:
+            job_progress.pop(job_id)
+
+        assert data['current_track_name'] == 'Live Track'
+        assert data['added_tracks'] == 7
+        assert user_jobs[0]['current_track_name'] == 'Live Track'
+
     def test_get_user_jobs_returns_empty_list(self, client):
         response = client.get('/api/jobs/user/test_user')
         assert response.status_code == 200
@@ -0,0 +1,77 @@
+import threading
+from backend.config import BATCH_PROCESS_SIZE
+from backend.sync.batch_writer import BatchWriter, RejectedItemsError, batch_size_for
+
+
+class TestBatchWriter:
+    """Test batched background playlist writes"""
+    
+    def test_provider_batch_sizes(self):
+        assert batch_size_for('spotify') == 100
+        assert batch_size_for('ytmusic') == BATCH_PROCESS_SIZE
+    
+    def test_writes_full_batches_in_order(self):
+        batches = []
+        writer = BatchWriter(batches.append, batch_size=3)
+        
+        dispatched = [writer.add(i) for i in range(7)]
+        failed = writer.close()
+        
+        assert dispatched == [False, False, True, False, False, True, False]
+        assert batches == [[0, 1, 2], [3, 4, 5], [6]]
+        assert failed == []
+        assert writer.written == 7
+    
+    def test_writes_do_not_block_caller(self):
+        release = threading.Event()
+        batches = []
+        
+        def slow_write(items):
+            release.wait(5)
+            batches.append(items)
+        
+        writer = BatchWriter(slow_write, batch_size=2)
+        writer.add('a')
+        writer.add('b')
+        writer.add('c')
+        
+        # The first batch is still being written while items keep coming
+        assert batches == []
+        release.set()
+        writer.close()
+        assert batches == [['a', 'b'], ['c']]
+    
+    def test_only_rejected_items_are_dropped(self):
+        batches = []
+        
+        def write(items):
+            if 'bad' in items:
+                raise RejectedItemsError("invalid item")
+            batches.append(items)
+        
+        writer = BatchWriter(write, batch_size=8)
+        for item in ['a', 'b', 'c', 'bad', 'd', 'e', 'f', 'g']:
+            writer.add(item)
+        failed = writer.close()
+        
+        assert failed == [('bad', 'invalid item')]
+        assert sorted(i for batch in batches for i in batch) == ['a', 'b', 'c', 'd', 'e', 'f', 'g']
+        assert writer.written == 7
+    
+    def test_request_errors_fail_the_rest_without_retrying(self):
+        calls = []
+        
+        def write(items):
+            calls.append(items)
+            raise Exception("Spotify API error: 403 Client Error: Forbidden")
+        
+        writer = BatchWriter(write, batch_size=100)
+        for i in range(250):
+            writer.add(i)
+        failed = writer.close()
+        
+        # One call finds the playlist unwritable; no bisection, no further batches sent
+        assert len(calls) == 1
+        assert [item for item, _ in failed] == list(range(250))
+        assert all('403' in error for _, error in failed)
+        assert writer.written == 0
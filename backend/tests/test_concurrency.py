@@ -0,0 +1,48 @@
+import time
+import pytest
+from backend.sync.concurrency import map_concurrently
+
+
+class TestMapConcurrently:
+    """Test the bounded worker pool helper"""
+    
+    def test_results_in_input_order(self):
+        def slow_square(n):
+            time.sleep(0.01 * (5 - n % 5))
+            return n * n
+        
+        assert list(map_concurrently(slow_square, range(20), 4)) == [n * n for n in range(20)]
+    
+    def test_input_consumed_lazily(self):
+        consumed = []
+        
+        def items():
+            for n in range(100):
+                consumed.append(n)
+                yield n
+        
+        results = map_concurrently(lambda n: n, items(), 2)
+        assert next(results) == 0
+        
+        # Only a bounded read-ahead has been pulled from the input
+        assert len(consumed) <= 5
+        results.close()
+    
+    def test_exceptions_raised_or_returned(self):
+        def fail_on_two(n):
+            if n == 2:
+                raise ValueError("boom")
+            return n
+        
+        results = list(map_concurrently(fail_on_two, range(4), 2, return_exceptions=True))
+        assert results[:2] == [0, 1]
+        assert isinstance(results[2], ValueError)
+        
+        with pytest.raises(ValueError):
+            list(map_concurrently(fail_on_two, range(4), 2))
+    
+    def test_runs_inside_app_context(self, app):
+        from flask import has_app_context
+        
+        with app.app_context():
+            assert all(map_concurrently(lambda _: has_app_context(), range(4), 2))
@@ -1,5 +1,7 @@
 import pytest
-from backend.auth.encryption import TokenEncryptor
+from unittest.mock import patch
+from cryptography.fernet import Fernet
+from backend.auth.encryption import TokenEncryptor, derive_key
 
 
 class TestTokenEncryptor:
@@ -67,3 +69,94 @@ class TestTokenEncryptor:
         decrypted = encryptor.decrypt(encrypted)
         
         assert decrypted == long_token
+
+
+class TestKeyLoading:
+    """Test lazy key derivation and pre-derived keys"""
+    
+    def test_key_not_derived_until_first_use(self):
+        with patch('backend.auth.encryption.derive_key', wraps=derive_key) as mock_derive:
+            encryptor = TokenEncryptor(master_password='test_password')
+            mock_derive.assert_not_called()
+            
+            encryptor.decrypt(encryptor.encrypt('token'))
+            encryptor.encrypt('token')
+            
+            mock_derive.assert_called_once_with('test_password')
+    
+    def test_pre_derived_key_matches_password(self):
+        encrypted = TokenEncryptor(master_password='test_password').encrypt('token')
+        
+        with patch('backend.auth.encryption.derive_key') as mock_derive:
+            encryptor = TokenEncryptor(key=derive_key('test_password'))
+            assert encryptor.decrypt(encrypted) == 'token'
+            mock_derive.assert_not_called()
+    
+    def test_key_from_environment(self):
+        key = derive_key('test_password')
+        encrypted = TokenEncryptor(key=key).encrypt('token')
+        
+        with patch('backend.auth.encryption.ENCRYPTION_KEY', key.decode()), \
+             patch('backend.auth.encryption.derive_key') as mock_derive:
+            assert TokenEncryptor().decrypt(encrypted) == 'token'
+            mock_derive.assert_not_called()
+    
+    def test_key_from_file(self, tmp_path):
+        key = derive_key('test_password')
+        keyfile = tmp_path / 'musync.key'
+        keyfile.write_bytes(key + b'\n')
+        encrypted = TokenEncryptor(key=key).encrypt('token')
+        
+        with patch('backend.auth.encryption.ENCRYPTION_KEY', ''), \
+             patch('backend.auth.encryption.ENCRYPTION_KEY_FILE', str(keyfile)):
+            assert TokenEncryptor().decrypt(encrypted) == 'token'
+    
+    def test_explicit_password_ignores_configured_key(self):
+        with patch('backend.auth.encryption.ENCRYPTION_KEY', derive_key('other').decode()):
+            encrypted = TokenEncryptor(master_password='test_password').encrypt('token')
+        
+        assert TokenEncryptor(master_password='test_password').decrypt(encrypted) == 'token'
+
+
+class TestDecryptCache:
+    """Test the TTL cache of decrypted tokens"""
+    
+    def test_repeated_decrypt_skips_fernet(self):
+        encryptor = TokenEncryptor(key=Fernet.generate_key())
+        encrypted = encryptor.encrypt('token')
+        
+        with patch.object(encryptor.fernet, 'decrypt', wraps=encryptor.fernet.decrypt) as mock_decrypt:
+            assert encryptor.decrypt(encrypted) == 'token'
+            assert encryptor.decrypt(encrypted) == 'token'
+            assert mock_decrypt.call_count == 1
+    
+    def test_expired_entries_are_decrypted_again(self):
+        encryptor = TokenEncryptor(key=Fernet.generate_key())
+        encrypted = encryptor.encrypt('token')
+        
+        with patch('backend.auth.encryption.TOKEN_DECRYPT_CACHE_TTL_SECONDS', 0), \
+             patch.object(encryptor.fernet, 'decrypt', wraps=encryptor.fernet.decrypt) as mock_decrypt:
+            encryptor.decrypt(encrypted)
+            encryptor.decrypt(encrypted)
+            assert mock_decrypt.call_count == 2
+    
+    def test_cache_is_bounded(self):
+        encryptor = TokenEncryptor(key=Fernet.generate_key())
+        
+        with patch('backend.auth.encryption.TOKEN_DECRYPT_CACHE_SIZE', 2):
+            tokens = [encryptor.encrypt(f'token{i}') for i in range(3)]
+            encryptor.decrypt(tokens[0])
+            encryptor.decrypt(tokens[1])
+            # Touch the oldest entry so the second one is evicted next
+            encryptor.decrypt(tokens[0])
+            encryptor.decrypt(tokens[2])
+        
+        assert list(encryptor._decrypted) == [tokens[0], tokens[2]]
+    
+    def test_clear_cache(self):
+        encryptor = TokenEncryptor(key=Fernet.generate_key())
+        encryptor.decrypt(encryptor.encrypt('token'))
+        
+        encryptor.clear_cache()
+        
+        assert not encryptor._decrypted
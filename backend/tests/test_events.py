@@ -0,0 +1,50 @@
+import json
+from backend.sync.events import JobEventBus, format_sse
+
+
+class TestJobEventBus:
+    """Test the in-process job event bus"""
+    
+    def test_subscribers_receive_their_job_events(self):
+        bus = JobEventBus()
+        first = bus.subscribe('job1')
+        second = bus.subscribe('job1')
+        other = bus.subscribe('job2')
+        
+        bus.publish('job1', 'progress', {'progress_percentage': 50})
+        
+        assert first.get_nowait() == ('progress', {'progress_percentage': 50})
+        assert second.get_nowait() == ('progress', {'progress_percentage': 50})
+        assert other.empty()
+    
+    def test_publish_without_subscribers_is_noop(self):
+        bus = JobEventBus()
+        bus.publish('job1', 'log', {'message': 'hello'})
+        assert not bus.has_subscribers('job1')
+    
+    def test_unsubscribe_stops_delivery(self):
+        bus = JobEventBus()
+        subscriber = bus.subscribe('job1')
+        
+        bus.unsubscribe('job1', subscriber)
+        bus.publish('job1', 'log', {'message': 'hello'})
+        
+        assert subscriber.empty()
+        assert not bus.has_subscribers('job1')
+    
+    def test_slow_subscriber_drops_oldest_events(self):
+        bus = JobEventBus(queue_size=2)
+        subscriber = bus.subscribe('job1')
+        
+        for i in range(4):
+            bus.publish('job1', 'track', {'index': i})
+        
+        assert subscriber.get_nowait() == ('track', {'index': 2})
+        assert subscriber.get_nowait() == ('track', {'index': 3})
+    
+    def test_format_sse(self):
+        message = format_sse('matched', {'name': 'Song 1'})
+        
+        assert message.startswith('event: matched\ndata: ')
+        assert message.endswith('\n\n')
+        assert json.loads(message.split('data: ', 1)[1]) == {'name': 'Song 1'}
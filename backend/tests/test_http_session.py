@@ -0,0 +1,26 @@
+import threading
+from backend.config import HTTP_CONNECT_TIMEOUT_SECONDS, HTTP_READ_TIMEOUT_SECONDS
+from backend.sync.http_session import get_session, get_adapter, DEFAULT_TIMEOUT
+
+
+class TestHttpSession:
+    """Test pooled keep-alive HTTP sessions"""
+    
+    def test_session_reused_within_thread(self):
+        assert get_session() is get_session()
+    
+    def test_threads_share_one_connection_pool(self):
+        sessions = []
+        thread = threading.Thread(target=lambda: sessions.append(get_session()))
+        thread.start()
+        thread.join()
+        
+        assert sessions[0] is not get_session()
+        assert sessions[0].get_adapter("https://api.spotify.com") is get_adapter()
+        assert get_session().get_adapter("https://api.spotify.com") is get_adapter()
+    
+    def test_session_requests_compression(self):
+        assert "gzip" in get_session().headers["Accept-Encoding"]
+    
+    def test_timeouts_from_config(self):
+        assert DEFAULT_TIMEOUT == (HTTP_CONNECT_TIMEOUT_SECONDS, HTTP_READ_TIMEOUT_SECONDS)
@@ -1,9 +1,17 @@
 import pytest
+import numpy as np
+from unittest.mock import patch
 from backend.sync.matcher import (
     normalize_text,
+    normalize_cache_info,
+    clear_normalize_cache,
     calculate_artist_similarity,
     calculate_match_score,
-    find_best_match
+    find_best_match,
+    find_best_match_with_score,
+    find_best_matches,
+    score_candidates,
+    score_matrix
 )
 
 
@@ -29,6 +37,46 @@ class TestNormalizeText:
         assert normalize_text(None) == ""
 
 
+class TestNormalizeOptions:
+    """Test optional Unicode folding, tag stripping and the memo"""
+    
+    def test_unicode_fold(self):
+        assert normalize_text("Beyoncé", unicode_fold=True) == "beyonce"
+        assert normalize_text("Ｆｕｌｌ Width", unicode_fold=True) == "full width"
+    
+    def test_unicode_fold_off_by_default(self):
+        assert normalize_text("Beyoncé") == "beyoncé"
+    
+    def test_non_latin_scripts_kept(self):
+        assert normalize_text("夜に駆ける", unicode_fold=True) != ""
+        assert normalize_text("Кино - Группа крови") == "кино группа крови"
+    
+    def test_strip_feat_tags(self):
+        assert normalize_text("Shape of You (feat. Someone)", strip_tags=True) == "shape of you"
+        assert normalize_text("Shape of You [ft. Someone]", strip_tags=True) == "shape of you"
+        assert normalize_text("Shape of You feat. Someone", strip_tags=True) == "shape of you"
+    
+    def test_strip_remaster_tags(self):
+        assert normalize_text("Hey Jude - Remastered 2015", strip_tags=True) == "hey jude"
+        assert normalize_text("Hey Jude - 2009 Remaster", strip_tags=True) == "hey jude"
+        assert normalize_text("Hey Jude (Remastered)", strip_tags=True) == "hey jude"
+    
+    def test_strip_tags_keeps_other_parentheses(self):
+        assert normalize_text("Left (Live)", strip_tags=True) == "left live"
+    
+    def test_cache_counters(self):
+        clear_normalize_cache()
+        normalize_text("Cached Title")
+        normalize_text("Cached Title")
+        normalize_text("Cached Title", strip_tags=True)
+        
+        info = normalize_cache_info()
+        assert info['hits'] == 1
+        assert info['misses'] == 2
+        assert info['size'] == 2
+        assert info['max_size'] > 0
+
+
 class TestArtistSimilarity:
     """Test artist similarity calculation"""
     def test_exact_match(self):
@@ -120,6 +168,46 @@ class TestMatchScore:
         assert score >= 0.90
 
 
+class TestMatchScorePruning:
+    """Test bound-based early exit"""
+    
+    def test_hopeless_name_skips_artist_scoring(self):
+        query = {'name': 'Bohemian Rhapsody', 'artists': ['Queen'], 'duration_ms': 354000}
+        candidate = {'name': 'Totally Different', 'artists': ['Queen'], 'duration_ms': 354000}
+        
+        with patch('backend.sync.matcher.calculate_artist_similarity') as mock_artists:
+            assert calculate_match_score(query, candidate, threshold=0.90) == 0.0
+            mock_artists.assert_not_called()
+    
+    def test_low_threshold_still_scores_artists(self):
+        query = {'name': 'Bohemian Rhapsody', 'artists': ['Queen'], 'duration_ms': 354000}
+        candidate = {'name': 'Totally Different', 'artists': ['Queen'], 'duration_ms': 354000}
+        
+        score = calculate_match_score(query, candidate, threshold=0.0)
+        assert score >= 0.35 + 0.05
+    
+    def test_artist_score_cutoff(self):
+        assert calculate_artist_similarity(["Taylor Swift"], ["Ed Sheeran"], score_cutoff=0.9) == 0.0
+        assert calculate_artist_similarity(["Taylor Swift"], ["Taylor Swift"], score_cutoff=0.9) == 1.0
+    
+    def test_artist_score_cutoff_multiple_artists(self):
+        # One artist matches perfectly, the other not at all: average 0.5
+        artists_a = ["Taylor Swift", "Zzzz"]
+        artists_b = ["Taylor Swift"]
+        exact = calculate_artist_similarity(artists_a, artists_b)
+        assert calculate_artist_similarity(artists_a, artists_b, score_cutoff=exact) == exact
+        assert calculate_artist_similarity(artists_a, artists_b, score_cutoff=0.9) == 0.0
+    
+    def test_exact_threshold_boundary_kept(self):
+        # Scores exactly 0.90; pruning cutoffs must not drop it
+        query = {'name': 'बिना बिना', 'artists': ['रात प्यार'], 'duration_ms': 183177}
+        candidate = {'name': 'बिना बिना', 'artists': ['प्यार सपना'], 'duration_ms': 180706}
+        
+        assert calculate_match_score(query, candidate, threshold=0.90) == 0.90
+        assert score_candidates(query, [candidate], threshold=0.90).tolist() == [0.90]
+        assert find_best_match(query, [candidate], threshold=0.90) is candidate
+
+
 class TestFindBestMatch:
     """Test best match finding"""
     
@@ -187,3 +275,59 @@ class TestFindBestMatch:
         best = find_best_match(query, candidates, threshold=0.90)
         assert best is not None
         assert best['videoId'] == 'good'
+
+
+class TestBatchMatching:
+    """Test vectorized batch scoring"""
+    
+    QUERY = {
+        'name': 'Shape of You',
+        'artists': ['Ed Sheeran'],
+        'duration_ms': 233000
+    }
+    CANDIDATES = [
+        {'name': 'Shape of You', 'artists': ['Ed Sheeran'], 'duration_ms': 233000},
+        {'name': 'Shape of You', 'artists': ['Different Artist'], 'duration_ms': 233000},
+        {'name': 'Shape Of You (Live)', 'artists': ['Ed Sheeran', 'Other'], 'duration_ms': 240000},
+        {'name': 'Shape of You', 'artists': [], 'duration_ms': 0},
+        {'name': '', 'artists': ['Ed Sheeran'], 'duration_ms': 233000},
+    ]
+    
+    def test_scores_match_single_candidate_scoring(self):
+        for threshold in (0.0, 0.5, 0.90):
+            scores = score_candidates(self.QUERY, self.CANDIDATES, threshold)
+            expected = [
+                calculate_match_score(self.QUERY, c, threshold) for c in self.CANDIDATES
+            ]
+            assert scores.tolist() == expected
+    
+    def test_empty_candidates(self):
+        assert len(score_candidates(self.QUERY, [])) == 0
+    
+    def test_score_matrix_shape_and_padding(self):
+        matrix = score_matrix(
+            [self.QUERY, self.QUERY],
+            [self.CANDIDATES, self.CANDIDATES[:1]],
+            threshold=0.90
+        )
+        assert isinstance(matrix, np.ndarray)
+        assert matrix.shape == (2, len(self.CANDIDATES))
+        assert matrix[1, 0] >= 0.90
+        assert (matrix[1, 1:] == 0.0).all()
+    
+    def test_find_best_matches(self):
+        other = {'name': 'Unknown Song', 'artists': ['Unknown'], 'duration_ms': 1000}
+        results = find_best_matches(
+            [self.QUERY, other, self.QUERY],
+            [self.CANDIDATES, self.CANDIDATES, []],
+            threshold=0.90
+        )
+        assert results[0][0] is self.CANDIDATES[0]
+        assert results[0][1] >= 0.90
+        assert results[1] == (None, 0.0)
+        assert results[2] == (None, 0.0)
+    
+    def test_find_best_match_with_score_agrees_with_find_best_match(self):
+        match, score = find_best_match_with_score(self.QUERY, self.CANDIDATES)
+        assert match is find_best_match(self.QUERY, self.CANDIDATES)
+        assert score == calculate_match_score(self.QUERY, match)
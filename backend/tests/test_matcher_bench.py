@@ -0,0 +1,41 @@
+import pytest
+from backend.benchmarks.matcher_bench import generate_catalogue, run_mode, main
+
+
+class TestSyntheticCatalogue:
+    """Test the synthetic benchmark catalogue"""
+    
+    def test_shape(self):
+        catalogue = list(generate_catalogue(50, candidates_per_query=4, seed=1))
+        assert len(catalogue) == 50
+        for query, candidates, true_index in catalogue:
+            assert set(query) == {'name', 'artists', 'duration_ms'}
+            assert len(candidates) == 4
+            assert true_index is None or 0 <= true_index < 4
+    
+    def test_deterministic(self):
+        first = list(generate_catalogue(20, seed=3))
+        second = list(generate_catalogue(20, seed=3))
+        assert first == second
+    
+    def test_contains_non_latin_scripts(self):
+        names = [q['name'] for q, _, _ in generate_catalogue(200, seed=1)]
+        assert any(not name.isascii() for name in names)
+
+
+class TestBenchmarkRun:
+    """Test benchmark modes agree and report metrics"""
+    
+    def test_modes_agree(self):
+        results = [run_mode(mode, 100, 5, 0.90, seed=1) for mode in ('scalar', 'batch', 'matrix')]
+        
+        for result in results:
+            assert result['pairs'] == 500
+            assert result['pairs_per_second'] > 0
+            assert result['latency_us']['p50'] <= result['latency_us']['p99']
+        
+        assert len({(r['precision'], r['recall']) for r in results}) == 1
+    
+    def test_regression_gate(self, capsys):
+        assert main(['--pairs', '100', '--modes', 'scalar', '--min-precision', '1.01']) == 1
+        assert 'REGRESSION' in capsys.readouterr().err
@@ -1,10 +1,23 @@
 import pytest
 import threading
+import time
 from unittest.mock import Mock, patch, MagicMock
-from datetime import datetime
+from datetime import datetime, timedelta
 from backend.database import db
-from backend.database.models import SyncJob, FailedTrack
+from backend.database.models import (
+    SyncJob, FailedTrack, PlaylistSnapshot, TrackMapping, NegativeMatch
+)
+from backend.sync.batch_writer import RejectedItemsError
+from backend.sync.events import job_events
+from backend.sync.negative_cache import NegativeMatchCache
+from backend.sync.progress import job_progress
 from backend.sync.orchestrator import SyncOrchestrator
+from backend.sync.spotify_client import SpotifyTrack
+
+
+def spotify_pages(items):
+    """Playlist items as SpotifyClient.iter_playlist_tracks yields them (one page)"""
+    return [[SpotifyTrack.from_item(item) for item in items]]
 
 
 class TestSyncOrchestrator:
@@ -45,7 +58,7 @@ class TestSyncOrchestrator:
             mock_spotify_instance.get_playlists.return_value = [
                 {'id': 'pl1', 'name': 'Test Playlist', 'description': 'A test'}
             ]
-            mock_spotify_instance.get_playlist_tracks.return_value = [
+            mock_spotify_instance.iter_playlist_tracks.return_value = spotify_pages([
                 {
                     'track': {
                         'name': 'Song 1',
@@ -58,7 +71,7 @@ class TestSyncOrchestrator:
                         }
                     }
                 }
-            ]
+            ])
             mock_ytmusic_instance.get_playlists.return_value = []
             mock_ytmusic_instance.create_playlist.return_value = {
                 'playlistId': 'yt_pl1'
@@ -77,7 +90,7 @@ class TestSyncOrchestrator:
             orch.sync_spotify_to_ytmusic()
 
             mock_spotify_instance.get_playlists.assert_called_once()
-            mock_spotify_instance.get_playlist_tracks.assert_called_once_with('pl1')
+            mock_spotify_instance.iter_playlist_tracks.assert_called_once_with('pl1')
             mock_ytmusic_instance.create_playlist.assert_called_once()
             mock_ytmusic_instance.add_playlist_items.assert_called_once()
 
@@ -106,7 +119,7 @@ class TestSyncOrchestrator:
             mock_spotify_instance.get_playlists.return_value = [
                 {'id': 'pl1', 'name': 'Existing Playlist'}
             ]
-            mock_spotify_instance.get_playlist_tracks.return_value = [
+            mock_spotify_instance.iter_playlist_tracks.return_value = spotify_pages([
                 {
                     'track': {
                         'name': 'Song 1',
@@ -114,7 +127,7 @@ class TestSyncOrchestrator:
                         'duration_ms': 200000
                     }
                 }
-            ]
+            ])
             mock_ytmusic_instance.get_playlists.return_value = [
                 {'playlistId': 'yt_existing', 'title': 'Existing Playlist'}
             ]
@@ -147,7 +160,7 @@ class TestSyncOrchestrator:
             mock_spotify_instance.get_playlists.return_value = [
                 {'id': 'pl1', 'name': 'Test Playlist'}
             ]
-            mock_spotify_instance.get_playlist_tracks.return_value = [
+            mock_spotify_instance.iter_playlist_tracks.return_value = spotify_pages([
                 {
                     'track': {
                         'name': 'Obscure Song',
@@ -155,7 +168,7 @@ class TestSyncOrchestrator:
                         'duration_ms': 200000
                     }
                 }
-            ]
+            ])
             mock_ytmusic_instance.get_playlists.return_value = []
             mock_ytmusic_instance.create_playlist.return_value = {
                 'playlistId': 'yt_pl1'
@@ -216,18 +229,16 @@ class TestSyncOrchestrator:
                     'description': 'From YouTube'
                 }
             ]
-            mock_ytmusic_instance.get_playlist.return_value = {
-                'tracks': [
-                    {
-                        'title': 'Song 1',
-                        'artists': [{'name': 'Artist 1'}],
-                        'duration_seconds': 200,
-                        'thumbnails': [
-                            {'url': 'https://example.com/yt_thumb.jpg', 'width': 120}
-                        ]
-                    }
-                ]
-            }
+            mock_ytmusic_instance.iter_playlist_tracks.return_value = [[
+                {
+                    'title': 'Song 1',
+                    'artists': [{'name': 'Artist 1'}],
+                    'duration_seconds': 200,
+                    'thumbnails': [
+                        {'url': 'https://example.com/yt_thumb.jpg', 'width': 120}
+                    ]
+                }
+            ]]
             mock_spotify_instance.get_playlists.return_value = []
             mock_spotify_instance.create_playlist.return_value = {
                 'id': 'sp_pl1'
@@ -274,7 +285,7 @@ class TestSyncOrchestrator:
                 {'id': 'pl1', 'name': 'First'},
                 {'id': 'pl2', 'name': 'Second'},
             ]
-            mock_spotify_instance.get_playlist_tracks.return_value = []
+            mock_spotify_instance.iter_playlist_tracks.return_value = spotify_pages([])
             mock_ytmusic_instance.get_playlists.return_value = []
             mock_ytmusic_instance.create_playlist.return_value = {
                 'playlistId': 'yt_pl'
@@ -300,6 +311,877 @@ class TestSyncOrchestrator:
             job_refreshed = db.session.get(SyncJob, job.id)
             assert job_refreshed.status == 'success'
 
+    @patch('backend.sync.orchestrator.SpotifyClient')
+    @patch('backend.sync.orchestrator.YTMusicClient')
+    def test_concurrent_matching_preserves_source_order(
+        self, mock_ytmusic, mock_spotify, app, default_user
+    ):
+        with app.app_context():
+            mock_spotify_instance = MagicMock()
+            mock_ytmusic_instance = MagicMock()
+            mock_spotify.return_value = mock_spotify_instance
+            mock_ytmusic.return_value = mock_ytmusic_instance
+
+            names = [f'Song {i}' for i in range(8)]
+            mock_spotify_instance.get_playlists.return_value = [
+                {'id': 'pl1', 'name': 'Test Playlist'}
+            ]
+            mock_spotify_instance.iter_playlist_tracks.return_value = spotify_pages([
+                {
+                    'track': {
+                        'name': name,
+                        'artists': [{'name': 'Artist'}],
+                        'duration_ms': 200000
+                    }
+                }
+                for name in names
+            ])
+            mock_ytmusic_instance.get_playlists.return_value = []
+            mock_ytmusic_instance.create_playlist.return_value = {
+                'playlistId': 'yt_pl1'
+            }
+
+            def search(query, limit=5):
+                # Earlier tracks finish last so completion order differs from source order
+                index = int(query.split()[1])
+                time.sleep(0.01 * (len(names) - index))
+                if index == 3:
+                    raise Exception("Search failed")
+                return [{
+                    'videoId': f'vid{index}',
+                    'title': f'Song {index}',
+                    'artists': [{'name': 'Artist'}],
+                    'durationMs': '200000'
+                }]
+
+            mock_ytmusic_instance.search.side_effect = search
+
+            orch = SyncOrchestrator('test_user')
+            orch.max_workers = 4
+            orch.sync_spotify_to_ytmusic()
+
+            mock_ytmusic_instance.add_playlist_items.assert_called_once_with(
+                'yt_pl1', ['vid0', 'vid1', 'vid2', 'vid4', 'vid5', 'vid6', 'vid7']
+            )
+
+            latest_job = SyncJob.query.filter_by(user_id='test_user').all()[-1]
+            assert latest_job.status == 'success'
+            assert latest_job.added_tracks == 7
+            assert latest_job.failed_tracks == 1
+            assert latest_job.current_track_name == 'Song 7'
+
+            failed = FailedTrack.query.filter_by(sync_job_id=latest_job.id).one()
+            assert failed.track_name == 'Song 3'
+            assert failed.reason == 'Search failed'
+
+    @patch('backend.sync.orchestrator.SpotifyClient')
+    @patch('backend.sync.orchestrator.YTMusicClient')
+    def test_target_playlists_fetched_once_per_job(
+        self, mock_ytmusic, mock_spotify, app, default_user
+    ):
+        with app.app_context():
+            mock_spotify_instance = MagicMock()
+            mock_ytmusic_instance = MagicMock()
+            mock_spotify.return_value = mock_spotify_instance
+            mock_ytmusic.return_value = mock_ytmusic_instance
+
+            mock_spotify_instance.get_playlists.return_value = [
+                {'id': 'pl1', 'name': 'Existing'},
+                {'id': 'pl2', 'name': 'New'},
+                {'id': 'pl3', 'name': 'New'},
+            ]
+            mock_spotify_instance.iter_playlist_tracks.return_value = spotify_pages([])
+            mock_ytmusic_instance.get_playlists.return_value = [
+                {'playlistId': 'yt_existing', 'title': 'Existing'}
+            ]
+            mock_ytmusic_instance.create_playlist.return_value = {
+                'playlistId': 'yt_new'
+            }
+
+            orch = SyncOrchestrator('test_user')
+            orch.sync_spotify_to_ytmusic()
+
+            mock_ytmusic_instance.get_playlists.assert_called_once()
+            # The playlist created for 'pl2' is reused for 'pl3'
+            mock_ytmusic_instance.create_playlist.assert_called_once()
+
+    @patch('backend.sync.orchestrator.SpotifyClient')
+    @patch('backend.sync.orchestrator.YTMusicClient')
+    def test_incremental_sync_only_matches_new_tracks(
+        self, mock_ytmusic, mock_spotify, app, default_user
+    ):
+        with app.app_context():
+            mock_spotify_instance = MagicMock()
+            mock_ytmusic_instance = MagicMock()
+            mock_spotify.return_value = mock_spotify_instance
+            mock_ytmusic.return_value = mock_ytmusic_instance
+
+            def spotify_track(index):
+                return {
+                    'track': {
+                        'uri': f'spotify:track:{index}',
+                        'name': f'Song {index}',
+                        'artists': [{'name': 'Artist'}],
+                        'duration_ms': 200000
+                    }
+                }
+
+            def search(query, limit=5):
+                index = int(query.split()[1])
+                if index == 2:
+                    return []
+                return [{
+                    'videoId': f'vid{index}',
+                    'title': f'Song {index}',
+                    'artists': [{'name': 'Artist'}],
+                    'durationMs': '200000'
+                }]
+
+            mock_spotify_instance.get_playlists.return_value = [
+                {'id': 'pl1', 'name': 'Existing Playlist'}
+            ]
+            mock_spotify_instance.iter_playlist_tracks.return_value = spotify_pages([
+                spotify_track(1), spotify_track(2)
+            ])
+            mock_ytmusic_instance.get_playlists.return_value = [
+                {'playlistId': 'yt_existing', 'title': 'Existing Playlist'}
+            ]
+            mock_ytmusic_instance.search.side_effect = search
+
+            SyncOrchestrator('test_user').sync_spotify_to_ytmusic()
+
+            snapshot = PlaylistSnapshot.query.filter_by(
+                user_id='test_user', service='spotify', playlist_id='pl1'
+            ).one()
+            assert snapshot.tracks == ['spotify:track:1']
+
+            # Second run: track 3 is new; track 2 is still pending but sits in the negative cache
+            mock_spotify_instance.iter_playlist_tracks.return_value = spotify_pages([
+                spotify_track(1), spotify_track(2), spotify_track(3)
+            ])
+            mock_ytmusic_instance.search.reset_mock()
+            mock_ytmusic_instance.add_playlist_items.reset_mock()
+
+            SyncOrchestrator('test_user').sync_spotify_to_ytmusic()
+
+            searched = [c.args[0] for c in mock_ytmusic_instance.search.call_args_list]
+            assert searched == ['Song 3 Artist']
+            mock_ytmusic_instance.add_playlist_items.assert_called_once_with(
+                'yt_existing', ['vid3']
+            )
+
+            latest_job = SyncJob.query.filter_by(user_id='test_user').order_by(
+                SyncJob.created_at.desc()
+            ).first()
+            assert latest_job.added_tracks == 1
+            assert latest_job.failed_tracks == 1
+
+            db.session.refresh(snapshot)
+            assert snapshot.tracks == ['spotify:track:1', 'spotify:track:3']
+
+    @patch('backend.sync.orchestrator.SpotifyClient')
+    @patch('backend.sync.orchestrator.YTMusicClient')
+    def test_unchanged_snapshot_id_skips_track_fetch(
+        self, mock_ytmusic, mock_spotify, app, default_user
+    ):
+        with app.app_context():
+            mock_spotify_instance = MagicMock()
+            mock_ytmusic_instance = MagicMock()
+            mock_spotify.return_value = mock_spotify_instance
+            mock_ytmusic.return_value = mock_ytmusic_instance
+
+            mock_spotify_instance.get_playlists.return_value = [
+                {'id': 'pl1', 'name': 'Existing Playlist', 'snapshot_id': 'snap1'}
+            ]
+            mock_spotify_instance.iter_playlist_tracks.return_value = spotify_pages([
+                {
+                    'track': {
+                        'uri': 'spotify:track:1',
+                        'name': 'Song 1',
+                        'artists': [{'name': 'Artist 1'}],
+                        'duration_ms': 200000
+                    }
+                }
+            ])
+            mock_ytmusic_instance.get_playlists.return_value = [
+                {'playlistId': 'yt_existing', 'title': 'Existing Playlist'}
+            ]
+            mock_ytmusic_instance.search.return_value = [
+                {
+                    'videoId': 'vid1',
+                    'title': 'Song 1',
+                    'artists': [{'name': 'Artist 1'}],
+                    'durationMs': '200000'
+                }
+            ]
+
+            SyncOrchestrator('test_user').sync_spotify_to_ytmusic()
+            SyncOrchestrator('test_user').sync_spotify_to_ytmusic()
+
+            mock_spotify_instance.iter_playlist_tracks.assert_called_once_with('pl1')
+            mock_ytmusic_instance.search.assert_called_once()
+
+            # A new snapshot_id means the playlist changed and must be fetched again
+            mock_spotify_instance.get_playlists.return_value = [
+                {'id': 'pl1', 'name': 'Existing Playlist', 'snapshot_id': 'snap2'}
+            ]
+            SyncOrchestrator('test_user').sync_spotify_to_ytmusic()
+
+            assert mock_spotify_instance.iter_playlist_tracks.call_count == 2
+
+    @staticmethod
+    def _two_track_playlist(mock_spotify_instance, mock_ytmusic_instance, search):
+        mock_spotify_instance.get_playlists.return_value = [
+            {'id': 'pl1', 'name': 'Existing Playlist', 'snapshot_id': 'snap1'}
+        ]
+        mock_spotify_instance.iter_playlist_tracks.return_value = spotify_pages([
+            {'track': {'uri': f'spotify:track:{n}', 'name': f'Song {n}',
+                       'artists': [{'name': 'Artist 1'}], 'duration_ms': 200000}}
+            for n in (1, 2)
+        ])
+        mock_ytmusic_instance.get_playlists.return_value = [
+            {'playlistId': 'yt_existing', 'title': 'Existing Playlist'}
+        ]
+        mock_ytmusic_instance.get_playlist_video_ids.return_value = set()
+        mock_ytmusic_instance.search.side_effect = search
+
+    @patch('backend.sync.orchestrator.SpotifyClient')
+    @patch('backend.sync.orchestrator.YTMusicClient')
+    def test_unmatched_tracks_keep_snapshot_id_until_retry_due(
+        self, mock_ytmusic, mock_spotify, app, default_user
+    ):
+        with app.app_context():
+            mock_spotify_instance = MagicMock()
+            mock_ytmusic_instance = MagicMock()
+            mock_spotify.return_value = mock_spotify_instance
+            mock_ytmusic.return_value = mock_ytmusic_instance
+
+            def search(query, limit):
+                if query.startswith('Song 2'):
+                    return []
+                return [{'videoId': 'vid1', 'title': 'Song 1', 'artists': [{'name': 'Artist 1'}],
+                         'durationMs': '200000'}]
+
+            self._two_track_playlist(mock_spotify_instance, mock_ytmusic_instance, search)
+
+            SyncOrchestrator('test_user').sync_spotify_to_ytmusic()
+
+            snapshot = PlaylistSnapshot.query.one()
+            miss = NegativeMatch.query.one()
+            assert snapshot.source_snapshot_id == 'snap1'
+            assert snapshot.tracks == ['spotify:track:1']
+            assert snapshot.retry_at == miss.expires_at
+
+            # Unchanged playlist, unmatched track not due yet: nothing is fetched
+            SyncOrchestrator('test_user').sync_spotify_to_ytmusic()
+            mock_spotify_instance.iter_playlist_tracks.assert_called_once_with('pl1')
+
+            # Once the negative entry expires the playlist is fetched and the track searched again
+            past = datetime.now() - timedelta(minutes=1)
+            snapshot.retry_at = past
+            miss.expires_at = past
+            db.session.commit()
+            search_calls = mock_ytmusic_instance.search.call_count
+
+            SyncOrchestrator('test_user').sync_spotify_to_ytmusic()
+
+            assert mock_spotify_instance.iter_playlist_tracks.call_count == 2
+            assert mock_ytmusic_instance.search.call_count == search_calls + 1
+
+    @patch('backend.sync.orchestrator.SpotifyClient')
+    @patch('backend.sync.orchestrator.YTMusicClient')
+    def test_errors_drop_snapshot_id(
+        self, mock_ytmusic, mock_spotify, app, default_user
+    ):
+        with app.app_context():
+            mock_spotify_instance = MagicMock()
+            mock_ytmusic_instance = MagicMock()
+            mock_spotify.return_value = mock_spotify_instance
+            mock_ytmusic.return_value = mock_ytmusic_instance
+
+            def search(query, limit):
+                if query.startswith('Song 2'):
+                    raise Exception("YouTube Music API error: HTTP 500")
+                return [{'videoId': 'vid1', 'title': 'Song 1', 'artists': [{'name': 'Artist 1'}],
+                         'durationMs': '200000'}]
+
+            self._two_track_playlist(mock_spotify_instance, mock_ytmusic_instance, search)
+
+            SyncOrchestrator('test_user').sync_spotify_to_ytmusic()
+
+            snapshot = PlaylistSnapshot.query.one()
+            assert snapshot.source_snapshot_id is None
+            assert snapshot.retry_at is None
+
+            SyncOrchestrator('test_user').sync_spotify_to_ytmusic()
+            assert mock_spotify_instance.iter_playlist_tracks.call_count == 2
+
+    @patch('backend.sync.orchestrator.SpotifyClient')
+    @patch('backend.sync.orchestrator.YTMusicClient')
+    def test_cached_match_skips_search_in_reverse_direction(
+        self, mock_ytmusic, mock_spotify, app, default_user
+    ):
+        with app.app_context():
+            mock_spotify_instance = MagicMock()
+            mock_ytmusic_instance = MagicMock()
+            mock_spotify.return_value = mock_spotify_instance
+            mock_ytmusic.return_value = mock_ytmusic_instance
+
+            mock_spotify_instance.get_playlists.return_value = [
+                {'id': 'pl1', 'name': 'Test Playlist'}
+            ]
+            mock_spotify_instance.iter_playlist_tracks.return_value = spotify_pages([
+                {
+                    'track': {
+                        'uri': 'spotify:track:abc123',
+                        'name': 'Song 1',
+                        'artists': [{'name': 'Artist 1'}],
+                        'duration_ms': 200000
+                    }
+                }
+            ])
+            mock_ytmusic_instance.get_playlists.return_value = []
+            mock_ytmusic_instance.create_playlist.return_value = {
+                'playlistId': 'yt_pl1'
+            }
+            mock_ytmusic_instance.search.return_value = [
+                {
+                    'videoId': 'vid1',
+                    'title': 'Song 1',
+                    'artists': [{'name': 'Artist 1'}],
+                    'durationMs': '200000'
+                }
+            ]
+
+            SyncOrchestrator('test_user').sync_spotify_to_ytmusic()
+
+            mapping = TrackMapping.query.one()
+            assert mapping.source_id == 'spotify:track:abc123'
+            assert mapping.target_id == 'vid1'
+            assert mapping.score >= 0.90
+
+            # The reverse sync reuses the stored match instead of searching Spotify
+            mock_ytmusic_instance.get_playlists.return_value = [
+                {'playlistId': 'yt_pl1', 'title': 'YT Playlist'}
+            ]
+            mock_ytmusic_instance.iter_playlist_tracks.return_value = [[
+                {
+                    'videoId': 'vid1',
+                    'title': 'Song 1',
+                    'artists': [{'name': 'Artist 1'}],
+                    'duration_seconds': 200
+                }
+            ]]
+            mock_spotify_instance.get_playlists.return_value = []
+            mock_spotify_instance.create_playlist.return_value = {'id': 'sp_pl1'}
+
+            SyncOrchestrator('test_user').sync_ytmusic_to_spotify()
+
+            mock_spotify_instance.search_track.assert_not_called()
+            mock_spotify_instance.add_tracks_to_playlist.assert_called_once_with(
+                'sp_pl1', ['spotify:track:abc123']
+            )
+
+    @patch('backend.sync.orchestrator.SpotifyClient')
+    @patch('backend.sync.orchestrator.YTMusicClient')
+    def test_isrc_exact_match_before_fuzzy_search(
+        self, mock_ytmusic, mock_spotify, app, default_user
+    ):
+        with app.app_context():
+            mock_spotify_instance = MagicMock()
+            mock_ytmusic_instance = MagicMock()
+            mock_spotify.return_value = mock_spotify_instance
+            mock_ytmusic.return_value = mock_ytmusic_instance
+
+            # Spotify → YouTube Music records the ISRC alongside the match
+            mock_spotify_instance.get_playlists.return_value = [
+                {'id': 'pl1', 'name': 'Test Playlist'}
+            ]
+            mock_spotify_instance.iter_playlist_tracks.return_value = spotify_pages([
+                {
+                    'track': {
+                        'uri': 'spotify:track:abc123',
+                        'name': 'Song 1',
+                        'artists': [{'name': 'Artist 1'}],
+                        'duration_ms': 200000,
+                        'external_ids': {'isrc': 'USRC17607839'}
+                    }
+                }
+            ])
+            mock_ytmusic_instance.get_playlists.return_value = []
+            mock_ytmusic_instance.create_playlist.return_value = {'playlistId': 'yt_pl1'}
+            mock_ytmusic_instance.search.return_value = [
+                {
+                    'videoId': 'vid1',
+                    'title': 'Song 1',
+                    'artists': [{'name': 'Artist 1'}],
+                    'duration_seconds': 200
+                }
+            ]
+
+            SyncOrchestrator('test_user').sync_spotify_to_ytmusic()
+
+            mapping = TrackMapping.query.one()
+            assert mapping.isrc == 'USRC17607839'
+
+            # Simulate a matcher upgrade: the cached pair is stale but the ISRC still applies
+            mapping.matcher_version -= 1
+            db.session.commit()
+
+            mock_ytmusic_instance.get_playlists.return_value = [
+                {'playlistId': 'yt_pl1', 'title': 'YT Playlist'}
+            ]
+            mock_ytmusic_instance.iter_playlist_tracks.return_value = [[
+                {
+                    'videoId': 'vid1',
+                    'title': 'Song 1 (Official Audio)',
+                    'artists': [{'name': 'Artist 1'}],
+                    'duration_seconds': 200
+                }
+            ]]
+            mock_spotify_instance.get_playlists.return_value = []
+            mock_spotify_instance.create_playlist.return_value = {'id': 'sp_pl1'}
+            mock_spotify_instance.search_isrc.return_value = {
+                'uri': 'spotify:track:abc123',
+                'name': 'Song 1',
+                'artists': [{'name': 'Artist 1'}],
+                'duration_ms': 200000,
+                'external_ids': {'isrc': 'USRC17607839'}
+            }
+
+            SyncOrchestrator('test_user').sync_ytmusic_to_spotify()
+
+            mock_spotify_instance.search_isrc.assert_called_once_with('USRC17607839')
+            mock_spotify_instance.search_track.assert_not_called()
+            mock_spotify_instance.add_tracks_to_playlist.assert_called_once_with(
+                'sp_pl1', ['spotify:track:abc123']
+            )
+            reverse = TrackMapping.query.filter_by(source_service='ytmusic').one()
+            assert reverse.score == 1.0
+            assert reverse.isrc == 'USRC17607839'
+
+    @patch('backend.sync.orchestrator.SpotifyClient')
+    @patch('backend.sync.orchestrator.YTMusicClient')
+    def test_isrc_miss_falls_back_to_fuzzy_search(
+        self, mock_ytmusic, mock_spotify, app, default_user
+    ):
+        with app.app_context():
+            mock_spotify_instance = MagicMock()
+            mock_ytmusic_instance = MagicMock()
+            mock_spotify.return_value = mock_spotify_instance
+            mock_ytmusic.return_value = mock_ytmusic_instance
+
+            db.session.add(TrackMapping(
+                source_service='spotify', source_id='spotify:track:old',
+                target_service='ytmusic', target_id='vid1',
+                score=0.95, matcher_version=0, isrc='USRC17607839'
+            ))
+            db.session.commit()
+
+            mock_ytmusic_instance.get_playlists.return_value = [
+                {'playlistId': 'yt_pl1', 'title': 'YT Playlist'}
+            ]
+            mock_ytmusic_instance.iter_playlist_tracks.return_value = [[
+                {
+                    'videoId': 'vid1',
+                    'title': 'Song 1',
+                    'artists': [{'name': 'Artist 1'}],
+                    'duration_seconds': 200
+                }
+            ]]
+            mock_spotify_instance.get_playlists.return_value = []
+            mock_spotify_instance.create_playlist.return_value = {'id': 'sp_pl1'}
+            mock_spotify_instance.search_isrc.return_value = None
+            mock_spotify_instance.search_track.return_value = {
+                'tracks': {'items': [{
+                    'uri': 'spotify:track:new',
+                    'name': 'Song 1',
+                    'artists': [{'name': 'Artist 1'}],
+                    'duration_ms': 200000
+                }]}
+            }
+
+            SyncOrchestrator('test_user').sync_ytmusic_to_spotify()
+
+            mock_spotify_instance.search_isrc.assert_called_once_with('USRC17607839')
+            mock_spotify_instance.search_track.assert_called_once()
+            mock_spotify_instance.add_tracks_to_playlist.assert_called_once_with(
+                'sp_pl1', ['spotify:track:new']
+            )
+
+    @patch('backend.sync.orchestrator.SpotifyClient')
+    @patch('backend.sync.orchestrator.YTMusicClient')
+    def test_isrc_lookup_error_falls_back_to_fuzzy_search(
+        self, mock_ytmusic, mock_spotify, app, default_user
+    ):
+        with app.app_context():
+            mock_spotify_instance = MagicMock()
+            mock_ytmusic_instance = MagicMock()
+            mock_spotify.return_value = mock_spotify_instance
+            mock_ytmusic.return_value = mock_ytmusic_instance
+
+            db.session.add(TrackMapping(
+                source_service='spotify', source_id='spotify:track:old',
+                target_service='ytmusic', target_id='vid1',
+                score=0.95, matcher_version=0, isrc='USRC17607839'
+            ))
+            db.session.commit()
+
+            mock_ytmusic_instance.get_playlists.return_value = [
+                {'playlistId': 'yt_pl1', 'title': 'YT Playlist'}
+            ]
+            mock_ytmusic_instance.iter_playlist_tracks.return_value = [[
+                {
+                    'videoId': 'vid1',
+                    'title': 'Song 1',
+                    'artists': [{'name': 'Artist 1'}],
+                    'duration_seconds': 200
+                }
+            ]]
+            mock_spotify_instance.get_playlists.return_value = []
+            mock_spotify_instance.create_playlist.return_value = {'id': 'sp_pl1'}
+            mock_spotify_instance.search_isrc.side_effect = Exception(
+                "Spotify API error: 429 Client Error: Too Many Requests"
+            )
+            mock_spotify_instance.search_track.return_value = {
+                'tracks': {'items': [{
+                    'uri': 'spotify:track:new',
+                    'name': 'Song 1',
+                    'artists': [{'name': 'Artist 1'}],
+                    'duration_ms': 200000
+                }]}
+            }
+
+            SyncOrchestrator('test_user').sync_ytmusic_to_spotify()
+
+            mock_spotify_instance.search_isrc.assert_called_once_with('USRC17607839')
+            mock_spotify_instance.search_track.assert_called_once()
+            mock_spotify_instance.add_tracks_to_playlist.assert_called_once_with(
+                'sp_pl1', ['spotify:track:new']
+            )
+            assert FailedTrack.query.count() == 0
+
+    @patch('backend.sync.orchestrator.SpotifyClient')
+    @patch('backend.sync.orchestrator.YTMusicClient')
+    def test_negative_cache_skips_search_until_expiry(
+        self, mock_ytmusic, mock_spotify, app, default_user
+    ):
+        with app.app_context():
+            mock_spotify_instance = MagicMock()
+            mock_ytmusic_instance = MagicMock()
+            mock_spotify.return_value = mock_spotify_instance
+            mock_ytmusic.return_value = mock_ytmusic_instance
+
+            mock_spotify_instance.get_playlists.return_value = [
+                {'id': 'pl1', 'name': 'Test Playlist'}
+            ]
+            mock_spotify_instance.iter_playlist_tracks.return_value = spotify_pages([
+                {
+                    'track': {
+                        'name': 'Obscure Song',
+                        'artists': [{'name': 'Unknown Artist'}],
+                        'duration_ms': 200000
+                    }
+                }
+            ])
+            mock_ytmusic_instance.get_playlists.return_value = []
+            mock_ytmusic_instance.create_playlist.return_value = {
+                'playlistId': 'yt_pl1'
+            }
+            mock_ytmusic_instance.search.return_value = []
+
+            SyncOrchestrator('test_user').sync_spotify_to_ytmusic()
+            SyncOrchestrator('test_user').sync_spotify_to_ytmusic()
+
+            mock_ytmusic_instance.search.assert_called_once()
+            entry = NegativeMatch.query.one()
+            assert entry.attempt_count == 1
+
+            latest_job = SyncJob.query.order_by(SyncJob.created_at.desc()).first()
+            assert latest_job.failed_tracks == 1
+
+            # Once the entry expires the track is searched again with a longer backoff
+            entry.expires_at = datetime.utcnow() - timedelta(minutes=1)
+            db.session.commit()
+
+            SyncOrchestrator('test_user').sync_spotify_to_ytmusic()
+
+            assert mock_ytmusic_instance.search.call_count == 2
+            db.session.refresh(entry)
+            assert entry.attempt_count == 2
+            assert entry.expires_at - entry.last_attempted_at == NegativeMatchCache.backoff(2)
+
+            failed = FailedTrack.query.all()
+            assert len(failed) == 1
+            assert failed[0].attempt_count == 2
+
+    @patch('backend.sync.orchestrator.SpotifyClient')
+    @patch('backend.sync.orchestrator.YTMusicClient')
+    def test_matching_starts_before_later_pages_load(
+        self, mock_ytmusic, mock_spotify, app, default_user
+    ):
+        with app.app_context():
+            mock_spotify_instance = MagicMock()
+            mock_ytmusic_instance = MagicMock()
+            mock_spotify.return_value = mock_spotify_instance
+            mock_ytmusic.return_value = mock_ytmusic_instance
+            events = []
+
+            def pages(playlist_id):
+                for n in (1, 2):
+                    events.append(f'page {n}')
+                    yield spotify_pages([{
+                        'track': {
+                            'uri': f'spotify:track:{n}',
+                            'name': f'Song {n}',
+                            'artists': [{'name': 'Artist'}],
+                            'duration_ms': 200000
+                        }
+                    }])[0]
+
+            def search(query, limit=5):
+                events.append(f'search {query}')
+                return []
+
+            mock_spotify_instance.get_playlists.return_value = [
+                {'id': 'pl1', 'name': 'Test Playlist'}
+            ]
+            mock_spotify_instance.iter_playlist_tracks.side_effect = pages
+            mock_ytmusic_instance.get_playlists.return_value = []
+            mock_ytmusic_instance.create_playlist.return_value = {'playlistId': 'yt_pl1'}
+            mock_ytmusic_instance.search.side_effect = search
+
+            SyncOrchestrator('test_user').sync_spotify_to_ytmusic()
+
+            assert events == ['page 1', 'search Song 1 Artist', 'page 2', 'search Song 2 Artist']
+            job = SyncJob.query.one()
+            assert job.total_tracks == 2
+            assert job.failed_tracks == 2
+
+    @patch('backend.sync.orchestrator.SpotifyClient')
+    @patch('backend.sync.orchestrator.YTMusicClient')
+    def test_failed_writes_are_retried_next_run(
+        self, mock_ytmusic, mock_spotify, app, default_user
+    ):
+        with app.app_context():
+            mock_spotify_instance = MagicMock()
+            mock_ytmusic_instance = MagicMock()
+            mock_spotify.return_value = mock_spotify_instance
+            mock_ytmusic.return_value = mock_ytmusic_instance
+
+            mock_ytmusic_instance.get_playlists.return_value = [
+                {'playlistId': 'yt_pl1', 'title': 'YT Playlist'}
+            ]
+            mock_ytmusic_instance.iter_playlist_tracks.return_value = [[
+                {'videoId': f'vid{n}', 'title': f'Song {n}', 'artists': [{'name': 'Artist'}], 'duration_seconds': 200}
+                for n in (1, 2)
+            ]]
+            mock_spotify_instance.get_playlists.return_value = []
+            mock_spotify_instance.create_playlist.return_value = {'id': 'sp_pl1'}
+            mock_spotify_instance.search_track.side_effect = lambda query, limit=5: {
+                'tracks': {'items': [{
+                    'uri': f"spotify:track:{query.split()[1]}",
+                    'name': ' '.join(query.split()[:2]),
+                    'artists': [{'name': 'Artist'}],
+                    'duration_ms': 200000
+                }]}
+            }
+
+            def add_tracks(playlist_id, uris):
+                if 'spotify:track:2' in uris:
+                    raise RejectedItemsError("Spotify API error: 400")
+
+            mock_spotify_instance.add_tracks_to_playlist.side_effect = add_tracks
+
+            SyncOrchestrator('test_user').sync_ytmusic_to_spotify()
+
+            job = SyncJob.query.one()
+            assert job.added_tracks == 1
+            assert job.failed_tracks == 1
+            failed = FailedTrack.query.one()
+            assert failed.track_name == 'Song 2'
+            assert 'Could not add to playlist' in failed.reason
+
+            snapshot = PlaylistSnapshot.query.one()
+            assert snapshot.tracks == ['vid1']
+
+    @patch('backend.sync.orchestrator.SpotifyClient')
+    @patch('backend.sync.orchestrator.YTMusicClient')
+    def test_existing_target_tracks_not_added_again(
+        self, mock_ytmusic, mock_spotify, app, default_user
+    ):
+        with app.app_context():
+            mock_spotify_instance = MagicMock()
+            mock_ytmusic_instance = MagicMock()
+            mock_spotify.return_value = mock_spotify_instance
+            mock_ytmusic.return_value = mock_ytmusic_instance
+
+            mock_spotify_instance.get_playlists.return_value = [
+                {'id': 'pl1', 'name': 'Test Playlist'}
+            ]
+            mock_spotify_instance.iter_playlist_tracks.return_value = spotify_pages([
+                {
+                    'track': {
+                        'uri': f'spotify:track:{n}',
+                        'name': f'Song {n}',
+                        'artists': [{'name': 'Artist'}],
+                        'duration_ms': 200000
+                    }
+                }
+                for n in (1, 2)
+            ])
+            mock_ytmusic_instance.get_playlists.return_value = [
+                {'playlistId': 'yt_existing', 'title': 'Test Playlist'}
+            ]
+            mock_ytmusic_instance.get_playlist_video_ids.return_value = {'vid1'}
+            mock_ytmusic_instance.search.side_effect = lambda query, limit=5: [{
+                'videoId': f"vid{query.split()[1]}",
+                'title': ' '.join(query.split()[:2]),
+                'artists': [{'name': 'Artist'}],
+                'duration_seconds': 200
+            }]
+
+            SyncOrchestrator('test_user').sync_spotify_to_ytmusic()
+
+            mock_ytmusic_instance.get_playlist_video_ids.assert_called_once_with('yt_existing')
+            mock_ytmusic_instance.add_playlist_items.assert_called_once_with('yt_existing', ['vid2'])
+            job = SyncJob.query.one()
+            assert job.added_tracks == 1
+            assert job.failed_tracks == 0
+            assert PlaylistSnapshot.query.one().tracks == ['spotify:track:1', 'spotify:track:2']
+
+    @patch('backend.sync.orchestrator.SpotifyClient')
+    @patch('backend.sync.orchestrator.YTMusicClient')
+    def test_new_target_playlist_not_read_back(
+        self, mock_ytmusic, mock_spotify, app, default_user
+    ):
+        with app.app_context():
+            mock_spotify_instance = MagicMock()
+            mock_ytmusic_instance = MagicMock()
+            mock_spotify.return_value = mock_spotify_instance
+            mock_ytmusic.return_value = mock_ytmusic_instance
+
+            mock_ytmusic_instance.get_playlists.return_value = [
+                {'playlistId': 'yt_pl1', 'title': 'YT Playlist'}
+            ]
+            mock_ytmusic_instance.iter_playlist_tracks.return_value = [[
+                {'videoId': 'vid1', 'title': 'Song 1', 'artists': [{'name': 'Artist 1'}], 'duration_seconds': 200}
+            ]]
+            mock_spotify_instance.get_playlists.return_value = []
+            mock_spotify_instance.create_playlist.return_value = {'id': 'sp_pl1'}
+            mock_spotify_instance.search_track.return_value = {
+                'tracks': {'items': [{
+                    'uri': 'spotify:track:abc123',
+                    'name': 'Song 1',
+                    'artists': [{'name': 'Artist 1'}],
+                    'duration_ms': 200000
+                }]}
+            }
+
+            SyncOrchestrator('test_user').sync_ytmusic_to_spotify()
+
+            mock_spotify_instance.get_playlist_track_uris.assert_not_called()
+            mock_spotify_instance.add_tracks_to_playlist.assert_called_once_with(
+                'sp_pl1', ['spotify:track:abc123']
+            )
+
+    @patch('backend.sync.orchestrator.SpotifyClient')
+    @patch('backend.sync.orchestrator.YTMusicClient')
+    def test_publishes_live_events(
+        self, mock_ytmusic, mock_spotify, app, default_user
+    ):
+        with app.app_context():
+            mock_spotify_instance = MagicMock()
+            mock_ytmusic_instance = MagicMock()
+            mock_spotify.return_value = mock_spotify_instance
+            mock_ytmusic.return_value = mock_ytmusic_instance
+
+            mock_spotify_instance.get_playlists.return_value = [{'id': 'pl1', 'name': 'Test Playlist'}]
+            mock_spotify_instance.iter_playlist_tracks.return_value = spotify_pages([
+                {'track': {'uri': 'spotify:track:1', 'name': 'Song 1',
+                           'artists': [{'name': 'Artist 1'}], 'duration_ms': 200000}},
+                {'track': {'uri': 'spotify:track:2', 'name': 'Unknown Song',
+                           'artists': [{'name': 'Nobody'}], 'duration_ms': 100000}},
+            ])
+            mock_ytmusic_instance.get_playlists.return_value = []
+            mock_ytmusic_instance.create_playlist.return_value = {'playlistId': 'yt_pl1'}
+            mock_ytmusic_instance.search.side_effect = lambda query, limit: [{
+                'videoId': 'vid1', 'title': 'Song 1', 'artists': [{'name': 'Artist 1'}],
+                'videoType': 'MUSIC_VIDEO_TYPE_ATV', 'durationMs': '200000'
+            }] if query.startswith('Song 1') else []
+
+            job = SyncJob(
+                user_id='test_user', job_type='sync', source_service='spotify',
+                target_service='ytmusic', status='running'
+            )
+            db.session.add(job)
+            db.session.commit()
+
+            subscriber = job_events.subscribe(job.id)
+            try:
+                SyncOrchestrator('test_user').sync_spotify_to_ytmusic(job_id=job.id)
+            finally:
+                job_events.unsubscribe(job.id, subscriber)
+
+            events = []
+            while not subscriber.empty():
+                events.append(subscriber.get_nowait())
+            types = [event for event, _ in events]
+
+            assert {'log', 'progress', 'track', 'matched', 'failed'} <= set(types)
+            assert types[-1] == 'status'
+            assert events[-1][1]['status'] == 'success'
+            assert events[-1][1]['added_tracks'] == 1
+            assert [data['name'] for event, data in events if event == 'track'] == ['Song 1', 'Unknown Song']
+            assert [data['id'] for event, data in events if event == 'matched'] == ['vid1']
+            assert [data['name'] for event, data in events if event == 'failed'] == ['Unknown Song']
+
+    @patch('backend.sync.orchestrator.SpotifyClient')
+    @patch('backend.sync.orchestrator.YTMusicClient')
+    def test_current_track_kept_in_memory_while_running(
+        self, mock_ytmusic, mock_spotify, app, default_user
+    ):
+        with app.app_context():
+            mock_spotify_instance = MagicMock()
+            mock_ytmusic_instance = MagicMock()
+            mock_spotify.return_value = mock_spotify_instance
+            mock_ytmusic.return_value = mock_ytmusic_instance
+
+            mock_spotify_instance.get_playlists.return_value = [{'id': 'pl1', 'name': 'Test Playlist'}]
+            mock_spotify_instance.iter_playlist_tracks.return_value = spotify_pages([
+                {'track': {'uri': 'spotify:track:1', 'name': 'Song 1',
+                           'artists': [{'name': 'Artist 1'}], 'duration_ms': 200000}}
+            ])
+            mock_ytmusic_instance.get_playlists.return_value = []
+            mock_ytmusic_instance.create_playlist.return_value = {'playlistId': 'yt_pl1'}
+            mock_ytmusic_instance.search.return_value = [{
+                'videoId': 'vid1', 'title': 'Song 1', 'artists': [{'name': 'Artist 1'}],
+                'videoType': 'MUSIC_VIDEO_TYPE_ATV', 'durationMs': '200000'
+            }]
+
+            job = SyncJob(
+                user_id='test_user', job_type='sync', source_service='spotify',
+                target_service='ytmusic', status='running'
+            )
+            db.session.add(job)
+            db.session.commit()
+
+            # Writes happen after matching, while the job is still running
+            live = {}
+            mock_ytmusic_instance.add_playlist_items.side_effect = (
+                lambda *args: live.update(job_progress.get(job.id))
+            )
+
+            orch = SyncOrchestrator('test_user')
+            orch.sync_spotify_to_ytmusic(job_id=job.id)
+
+            assert live['current_track_name'] == 'Song 1'
+            assert live['current_track_artist'] == 'Artist 1'
+            assert live['added_tracks'] == 1
+            # The last track is saved once the job finishes, and the live entry is dropped
+            assert job_progress.get(job.id) == {}
+            assert db.session.get(SyncJob, job.id).current_track_name == 'Song 1'
+
     def test_thread_safety(self, app, default_user):
         with app.app_context():
             orch = SyncOrchestrator('test_user')
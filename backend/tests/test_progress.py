@@ -0,0 +1,43 @@
+import os
+from backend.sync.progress import JobProgressRegistry
+
+
+class TestJobProgressRegistry:
+    """Test the live job progress registry"""
+    
+    def test_update_and_get(self):
+        registry = JobProgressRegistry(shared_dir='')
+        
+        registry.update('job1', current_track_name='Song 1', added_tracks=1)
+        registry.update('job1', current_track_name='Song 2')
+        
+        assert registry.get('job1') == {'current_track_name': 'Song 2', 'added_tracks': 1}
+        assert registry.get('job2') == {}
+    
+    def test_get_returns_copy(self):
+        registry = JobProgressRegistry(shared_dir='')
+        registry.update('job1', added_tracks=1)
+        
+        registry.get('job1')['added_tracks'] = 5
+        
+        assert registry.get('job1')['added_tracks'] == 1
+    
+    def test_pop_returns_last_fields_and_forgets_job(self):
+        registry = JobProgressRegistry(shared_dir='')
+        registry.update('job1', current_track_name='Song 1')
+        
+        assert registry.pop('job1') == {'current_track_name': 'Song 1'}
+        assert registry.get('job1') == {}
+        assert registry.pop('job1') == {}
+    
+    def test_shared_dir_visible_to_other_processes(self, tmp_path):
+        writer = JobProgressRegistry(shared_dir=str(tmp_path))
+        reader = JobProgressRegistry(shared_dir=str(tmp_path))
+        
+        writer.update('job1', current_track_name='Song 1', progress_percentage=40)
+        
+        assert reader.get('job1') == {'current_track_name': 'Song 1', 'progress_percentage': 40}
+        
+        writer.pop('job1')
+        assert reader.get('job1') == {}
+        assert os.listdir(tmp_path) == []
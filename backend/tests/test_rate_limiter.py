@@ -1,7 +1,21 @@
 import pytest
 import time
 import threading
-from backend.sync.rate_limiter import RateLimiter
+from unittest.mock import MagicMock, patch
+from backend.sync.rate_limiter import RateLimiter, SharedRateLimiter, RateLimiterRegistry
+
+
+class FakeClock:
+    """Stands in for the time module: monotonic() reads now, sleep() advances it"""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def monotonic(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.now += seconds
 
 
 class TestRateLimiter:
@@ -106,3 +120,244 @@ class TestRateLimiterNoRecursion:
         
         # Should wait approximately 1 second
         assert elapsed >= 0.9
+
+
+class TestRateLimiterAcquire:
+    """Test non-blocking, batch and burst-limited acquisition"""
+    
+    def test_try_acquire(self):
+        limiter = RateLimiter(max_calls=3, period_seconds=60)
+        
+        assert limiter.try_acquire() is True
+        assert limiter.try_acquire(2) is True
+        assert limiter.try_acquire() is False
+        assert len(limiter.calls) == 3
+    
+    def test_acquire_batch(self):
+        limiter = RateLimiter(max_calls=5, period_seconds=1)
+        
+        limiter.acquire(3)
+        assert len(limiter.calls) == 3
+        
+        # Needs 3 more slots but only 2 are free: waits for the window to roll
+        start = time.time()
+        limiter.acquire(3)
+        elapsed = time.time() - start
+        
+        assert elapsed >= 0.9
+        assert len(limiter.calls) == 3
+    
+    def test_acquire_larger_than_burst_rejected(self):
+        limiter = RateLimiter(max_calls=5, period_seconds=1)
+        
+        with pytest.raises(ValueError):
+            limiter.acquire(6)
+        with pytest.raises(ValueError):
+            limiter.try_acquire(0)
+    
+    def test_acquire_timeout(self):
+        limiter = RateLimiter(max_calls=1, period_seconds=60)
+        limiter.acquire()
+        
+        start = time.time()
+        assert limiter.acquire(timeout=0.2) is False
+        assert time.time() - start < 1
+    
+    def test_burst_smooths_calls(self):
+        limiter = RateLimiter(max_calls=10, period_seconds=1, burst=2)
+        
+        assert limiter.try_acquire() is True
+        assert limiter.try_acquire() is True
+        assert limiter.try_acquire() is False
+        
+        # One token refills every 0.1s
+        start = time.time()
+        limiter.acquire()
+        elapsed = time.time() - start
+        
+        assert 0.05 <= elapsed < 0.5
+    
+    def test_burst_thread_safety(self):
+        limiter = RateLimiter(max_calls=1000, period_seconds=1, burst=50)
+        acquired = []
+        
+        def make_calls():
+            for _ in range(25):
+                if limiter.try_acquire():
+                    acquired.append(1)
+        
+        threads = [threading.Thread(target=make_calls) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        # Bucket starts with 50 tokens; a few more may refill while threads run
+        assert 50 <= len(acquired) < 100
+        assert len(limiter.calls) == len(acquired)
+
+
+class TestSharedRateLimiter:
+    """Test the process-wide shared limiters"""
+    
+    def test_registry_shares_per_service_and_client(self):
+        registry = RateLimiterRegistry(max_calls=10, period_seconds=60)
+        
+        assert registry.get_shared('spotify', 'client_a') is registry.get_shared('spotify', 'client_a')
+        assert registry.get_shared('spotify', 'client_a') is not registry.get_shared('spotify', 'client_b')
+        assert registry.get_shared('spotify', 'client_a') is not registry.get_shared('ytmusic', 'client_a')
+        
+        user_a = registry.get('spotify', 'client_a', 'user_a')
+        user_b = registry.get('spotify', 'client_a', 'user_b')
+        assert user_a.shared is user_b.shared
+    
+    def test_registry_uses_config_limits(self):
+        from backend.config import API_RATE_LIMIT_REQUESTS, API_RATE_LIMIT_PERIOD_SECONDS
+        
+        shared = RateLimiterRegistry().get_shared('spotify', 'client')
+        assert shared.max_calls == API_RATE_LIMIT_REQUESTS
+        assert shared.period == API_RATE_LIMIT_PERIOD_SECONDS
+    
+    def test_app_wide_budget(self):
+        shared = SharedRateLimiter(max_calls=4, period_seconds=60)
+        
+        for _ in range(4):
+            assert shared.for_user().try_acquire() is True
+        assert shared.for_user().try_acquire() is False
+        assert len(shared.limiter.calls) == 4
+    
+    def test_single_user_can_use_full_budget(self):
+        shared = SharedRateLimiter(max_calls=5, period_seconds=60)
+        user = shared.for_user('user_a')
+        
+        assert all(user.try_acquire() for _ in range(5))
+        assert user.try_acquire() is False
+    
+    def test_fair_share_between_active_users(self):
+        shared = SharedRateLimiter(max_calls=10, period_seconds=60)
+        user_a = shared.for_user('user_a')
+        user_b = shared.for_user('user_b')
+        
+        assert user_b.try_acquire() is True
+        
+        # Two active users: each may use half the window
+        granted_a = sum(user_a.try_acquire() for _ in range(10))
+        assert granted_a == 5
+        
+        granted_b = sum(user_b.try_acquire() for _ in range(10))
+        assert granted_b == 4
+        assert len(shared.limiter.calls) == 10
+    
+    def test_fair_share_blocks_until_window_rolls(self):
+        shared = SharedRateLimiter(max_calls=4, period_seconds=1)
+        user_a = shared.for_user('user_a')
+        user_b = shared.for_user('user_b')
+        
+        user_b.acquire()
+        user_a.acquire(2)
+        
+        start = time.time()
+        user_a.wait_if_needed()
+        assert time.time() - start >= 0.9
+
+
+class TestAdaptiveRateLimiting:
+    """Test throttle feedback from providers"""
+    
+    def test_throttle_pauses_and_halves_limit(self):
+        limiter = RateLimiter(max_calls=10, period_seconds=60)
+        
+        limiter.throttle(retry_after=0.2)
+        assert limiter.limit == 5
+        assert limiter.try_acquire() is False
+        
+        time.sleep(0.25)
+        assert sum(limiter.try_acquire() for _ in range(10)) == 5
+    
+    def test_recovery_adds_about_one_call_per_window(self):
+        clock = FakeClock()
+        with patch('backend.sync.rate_limiter.time', clock):
+            limiter = RateLimiter(max_calls=100, period_seconds=60)
+            sent = []
+            
+            def run_until(end):
+                # Saturate the limiter, reporting every call as accepted
+                while clock.now < end:
+                    while limiter.try_acquire():
+                        sent.append(clock.now)
+                        limiter.recover()
+                    clock.now += 0.05
+            
+            run_until(10)
+            assert len(sent) == 100
+            
+            limiter.throttle(retry_after=1)
+            assert limiter.limit == 50
+            
+            # Once the pre-throttle calls have left the window, the rate tracks the
+            # allowance, which only grows by about one call per window
+            run_until(190)
+            per_window = [
+                sum(start <= t < start + 60 for t in sent) for start in (70, 130)
+            ]
+            assert 50 <= per_window[0] <= 52
+            assert 51 <= per_window[1] <= 53
+            assert 52 <= limiter.limit < 54
+    
+    def test_one_decrease_per_throttle_event(self):
+        limiter = RateLimiter(max_calls=100, period_seconds=60)
+        
+        # Five in-flight calls rejected together
+        for _ in range(5):
+            limiter.throttle(retry_after=1)
+        
+        assert limiter.limit == 50
+    
+    def test_throttle_pauses_all_users(self):
+        shared = SharedRateLimiter(max_calls=10, period_seconds=60)
+        
+        shared.for_user('user_a').throttle(retry_after=0.2)
+        assert shared.for_user('user_b').try_acquire() is False
+    
+    def test_spotify_retries_after_429(self):
+        from backend.sync.spotify_client import SpotifyClient
+        
+        throttled = MagicMock(status_code=429, headers={'Retry-After': '0.1'})
+        ok = MagicMock(status_code=200, headers={})
+        ok.json.return_value = {'id': 'playlist'}
+        
+        with patch('backend.sync.spotify_client.TokenManager') as token_manager, \
+             patch('backend.sync.spotify_client.get_session') as get_session:
+            request = get_session.return_value.request
+            request.side_effect = [throttled, ok]
+            token_manager.get_access_token.return_value = 'token'
+            client = SpotifyClient('user_a')
+            client.rate_limiter = SharedRateLimiter(max_calls=10, period_seconds=60).for_user('user_a')
+            
+            start = time.time()
+            assert client._make_request('GET', 'playlists/1') == {'id': 'playlist'}
+            
+            assert time.time() - start >= 0.1
+            assert request.call_count == 2
+            # Halved by the 429, then 1/limit back up for the success
+            assert client.rate_limiter.shared.limiter.limit == pytest.approx(5.2)
+    
+    def test_ytmusic_retries_quota_errors(self):
+        from backend.sync.ytmusic_client import YTMusicClient, YTMusicPool
+        
+        ytmusic = MagicMock()
+        ytmusic.search.side_effect = [
+            Exception("Server returned HTTP 429: Too Many Requests.\nQuota exceeded"),
+            [{'videoId': 'abc'}]
+        ]
+        
+        with patch('backend.sync.ytmusic_client.TokenManager') as token_manager, \
+             patch('backend.sync.ytmusic_client.YTMusic', return_value=ytmusic), \
+             patch('backend.sync.rate_limiter.DEFAULT_RETRY_AFTER_SECONDS', 0.05):
+            client = YTMusicClient('user_a')
+            client.rate_limiter = SharedRateLimiter(max_calls=10, period_seconds=60).for_user('user_a')
+            client.pool = YTMusicPool()
+            
+            assert client.search('song') == [{'videoId': 'abc'}]
+            assert ytmusic.search.call_count == 2
+            token_manager.refresh_youtube_token.assert_not_called()
@@ -0,0 +1,167 @@
+import re
+import threading
+import pytest
+import requests
+from unittest.mock import MagicMock, patch
+from backend.sync.batch_writer import RejectedItemsError
+from backend.sync.spotify_client import SpotifyClient, SpotifyTrack, PLAYLIST_TRACK_FIELDS
+
+
+def fake_playlist_api(total, calls):
+    """_make_request stand-in serving `total` numbered items page by page"""
+    lock = threading.Lock()
+    
+    def make_request(method, endpoint, **kwargs):
+        limit = int(re.search(r'limit=(\d+)', endpoint).group(1))
+        offset = int(re.search(r'offset=(\d+)', endpoint).group(1))
+        with lock:
+            calls.append(offset)
+        return {
+            'items': [
+                {'n': i, 'track': {'id': str(i), 'name': f'Song {i}'}}
+                for i in range(offset, min(offset + limit, total))
+            ],
+            'total': total
+        }
+    
+    return make_request
+
+
+class TestSpotifyPagination:
+    """Test offset-based concurrent pagination"""
+    
+    def test_playlist_tracks_fetched_concurrently_in_order(self):
+        client = SpotifyClient('user_a')
+        calls = []
+        
+        with patch.object(client, '_make_request', side_effect=fake_playlist_api(1050, calls)):
+            tracks = client.get_playlist_tracks('playlist_1')
+        
+        assert [t.id for t in tracks] == [str(i) for i in range(1050)]
+        assert calls[0] == 0
+        assert sorted(calls) == list(range(0, 1100, 100))
+    
+    def test_single_page_makes_one_request(self):
+        client = SpotifyClient('user_a')
+        calls = []
+        
+        with patch.object(client, '_make_request', side_effect=fake_playlist_api(30, calls)):
+            playlists = client.get_playlists()
+        
+        assert len(playlists) == 30
+        assert calls == [0]
+    
+    def test_playlists_use_offsets(self):
+        client = SpotifyClient('user_a')
+        calls = []
+        
+        with patch.object(client, '_make_request', side_effect=fake_playlist_api(120, calls)) as request:
+            playlists = client.get_playlists(limit=50)
+        
+        assert [p['n'] for p in playlists] == list(range(120))
+        assert sorted(calls) == [0, 50, 100]
+        assert request.call_args_list[0].args[1] == "me/playlists?limit=50&offset=0"
+
+
+class TestSpotifyTrackProjection:
+    """Test field-projected playlist track records"""
+    
+    def test_requests_projected_fields(self):
+        client = SpotifyClient('user_a')
+        
+        with patch.object(client, '_make_request', return_value={'items': [], 'total': 0}) as request:
+            client.get_playlist_tracks('playlist_1')
+        
+        endpoint = request.call_args.args[1]
+        assert endpoint.startswith(f"playlists/playlist_1/tracks?fields={PLAYLIST_TRACK_FIELDS}&")
+    
+    def test_record_from_item(self):
+        track = SpotifyTrack.from_item({
+            'track': {
+                'id': 'abc',
+                'uri': 'spotify:track:abc',
+                'name': 'Song',
+                'artists': [{'name': 'Artist 1'}, {'name': 'Artist 2'}],
+                'duration_ms': 200000,
+                'album': {'images': [{'url': 'https://example.com/big.jpg'}, {'url': 'https://example.com/small.jpg'}]},
+                'external_ids': {'isrc': 'USRC17607839'}
+            }
+        })
+        
+        assert track == SpotifyTrack(
+            'abc', 'spotify:track:abc', 'Song', ('Artist 1', 'Artist 2'), 200000,
+            'https://example.com/big.jpg', 'USRC17607839'
+        )
+    
+    def test_removed_and_local_tracks(self):
+        client = SpotifyClient('user_a')
+        items = [
+            {'track': None},
+            {'track': {'id': None, 'uri': 'spotify:local:a:b:c:180', 'name': 'Local', 'artists': [], 'album': {}}},
+        ]
+        
+        with patch.object(client, '_make_request', return_value={'items': items, 'total': 2}):
+            tracks = client.get_playlist_tracks('playlist_1')
+        
+        assert len(tracks) == 1
+        assert tracks[0].name == 'Local'
+        assert tracks[0].image_url is None
+        assert tracks[0].duration_ms == 0
+
+
+class TestSpotifyStreaming:
+    """Test page-by-page track streaming"""
+    
+    def test_iter_playlist_tracks_yields_pages(self):
+        client = SpotifyClient('user_a')
+        calls = []
+        
+        with patch.object(client, '_make_request', side_effect=fake_playlist_api(250, calls)):
+            pages = client.iter_playlist_tracks('playlist_1')
+            first = next(pages)
+            
+            # Later pages are not requested until the first one is consumed
+            assert calls == [0]
+            assert [t.id for t in first] == [str(i) for i in range(100)]
+            assert [len(page) for page in pages] == [100, 50]
+    
+    def test_existing_track_uris_fetch_only_uris(self):
+        client = SpotifyClient('user_a')
+        items = [
+            {'track': {'uri': 'spotify:track:1'}},
+            {'track': None},
+            {'track': {'uri': 'spotify:track:2'}},
+        ]
+        
+        with patch.object(client, '_make_request', return_value={'items': items, 'total': 3}) as request:
+            uris = client.get_playlist_track_uris('playlist_1')
+        
+        assert uris == {'spotify:track:1', 'spotify:track:2'}
+        assert request.call_args.args[1].startswith("playlists/playlist_1/tracks?fields=items(track(uri)),total&")
+
+
+class TestSpotifyPlaylistWrites:
+    """Test how failed playlist additions are reported"""
+    
+    @staticmethod
+    def _response(status_code):
+        response = requests.Response()
+        response.status_code = status_code
+        response.url = 'https://api.spotify.com/v1/playlists/pl1/tracks'
+        return response
+    
+    def _add(self, status_code):
+        client = SpotifyClient('user_a')
+        client.rate_limiter = MagicMock()
+        with patch.object(SpotifyClient, '_get_headers', return_value={}), \
+             patch.object(SpotifyClient, '_send', return_value=self._response(status_code)):
+            client.add_tracks_to_playlist('pl1', ['spotify:track:bad'])
+    
+    def test_bad_request_rejects_items(self):
+        with pytest.raises(RejectedItemsError, match="400"):
+            self._add(400)
+    
+    def test_other_errors_are_request_errors(self):
+        with pytest.raises(Exception, match="403") as excinfo:
+            self._add(403)
+        assert not isinstance(excinfo.value, RejectedItemsError)
@@ -1,4 +1,7 @@
 import pytest
+import threading
+import time
+from unittest.mock import patch
 from backend.database import db
 from backend.database.models import User, Credential
 from backend.auth.token_manager import TokenManager
@@ -120,3 +123,92 @@ class TestTokenManager:
     def test_is_token_valid_no_credential(self, app):
         with app.app_context():
             assert TokenManager.is_token_valid('test_user', 'spotify') == False
+
+
+
+class TestAccessTokenCache:
+    """Test the in-memory access token cache"""
+    
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        TokenManager.clear_token_cache()
+        yield
+        TokenManager.clear_token_cache()
+    
+    @staticmethod
+    def expiring_in(**kwargs):
+        return datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(**kwargs)
+    
+    def test_cached_token_skips_refresh_and_db(self):
+        with patch.object(TokenManager, '_refresh_spotify', return_value=('token_1', self.expiring_in(hours=1))) as refresh, \
+             patch.object(TokenManager, 'get_credential') as get_credential:
+            assert TokenManager.get_access_token('user_a', 'spotify') == 'token_1'
+            assert TokenManager.get_access_token('user_a', 'spotify') == 'token_1'
+            
+            refresh.assert_called_once_with('user_a')
+            get_credential.assert_not_called()
+    
+    def test_resaved_credential_drops_cached_token(self, app, default_user):
+        def refresh(user_id):
+            refresh_token = TokenManager.get_refresh_token(user_id, 'spotify')
+            return f'access_for_{refresh_token}', self.expiring_in(hours=1)
+        
+        with app.app_context(), \
+             patch.object(TokenManager, '_refresh_spotify', side_effect=refresh) as refresh_spotify:
+            TokenManager.save_credential('test_user', 'spotify', 'refresh_a')
+            assert TokenManager.get_access_token('test_user', 'spotify') == 'access_for_refresh_a'
+            
+            # Re-linking the account, as the OAuth callback does
+            TokenManager.save_credential('test_user', 'spotify', 'refresh_b')
+            assert TokenManager.get_access_token('test_user', 'spotify') == 'access_for_refresh_b'
+            assert refresh_spotify.call_count == 2
+    
+    def test_refreshes_proactively_before_expiry(self):
+        tokens = [('token_1', self.expiring_in(minutes=2)), ('token_2', self.expiring_in(hours=1))]
+        
+        with patch.object(TokenManager, '_refresh_youtube', side_effect=tokens) as refresh:
+            assert TokenManager.get_access_token('user_a', 'ytmusic') == 'token_1'
+            # Within the refresh margin: replaced before it actually expires
+            assert TokenManager.get_access_token('user_a', 'ytmusic') == 'token_2'
+            assert refresh.call_count == 2
+    
+    def test_concurrent_refreshes_are_collapsed(self):
+        def slow_refresh(user_id):
+            time.sleep(0.1)
+            return 'token_1', self.expiring_in(hours=1)
+        
+        results = []
+        with patch.object(TokenManager, '_refresh_spotify', side_effect=slow_refresh) as refresh:
+            threads = [
+                threading.Thread(target=lambda: results.append(TokenManager.get_access_token('user_a', 'spotify')))
+                for _ in range(5)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            
+            refresh.assert_called_once()
+        assert results == ['token_1'] * 5
+    
+    def test_stale_token_forces_single_refresh(self):
+        tokens = [('token_1', self.expiring_in(hours=1)), ('token_2', self.expiring_in(hours=1))]
+        
+        with patch.object(TokenManager, '_refresh_spotify', side_effect=tokens) as refresh:
+            TokenManager.get_access_token('user_a', 'spotify')
+            
+            # The first caller that saw token_1 rejected refreshes...
+            assert TokenManager.refresh_spotify_token('user_a', stale_token='token_1') == 'token_2'
+            # ...later callers with the same stale token reuse the new one
+            assert TokenManager.refresh_spotify_token('user_a', stale_token='token_1') == 'token_2'
+            assert refresh.call_count == 2
+    
+    def test_tokens_cached_per_user_and_service(self):
+        with patch.object(TokenManager, '_refresh_spotify', side_effect=lambda u: (f'sp_{u}', self.expiring_in(hours=1))), \
+             patch.object(TokenManager, '_refresh_youtube', side_effect=lambda u: (f'yt_{u}', self.expiring_in(hours=1))):
+            assert TokenManager.get_access_token('user_a', 'spotify') == 'sp_user_a'
+            assert TokenManager.get_access_token('user_b', 'spotify') == 'sp_user_b'
+            assert TokenManager.get_access_token('user_a', 'ytmusic') == 'yt_user_a'
+        
+        with pytest.raises(ValueError):
+            TokenManager.get_access_token('user_a', 'tidal')
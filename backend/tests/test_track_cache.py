@@ -0,0 +1,104 @@
+import pytest
+from backend.database import db
+from backend.database.models import TrackMapping
+from backend.sync.matcher import MATCHER_VERSION
+from backend.sync.track_cache import TrackMappingCache
+
+
+class TestTrackMappingCache:
+    """Test the cross-job track mapping cache"""
+    
+    def test_store_and_lookup(self, app):
+        with app.app_context():
+            TrackMappingCache.store('spotify', 'spotify:track:1', 'ytmusic', 'vid1', 0.95)
+            db.session.commit()
+            
+            matches = TrackMappingCache.lookup_many('spotify', ['spotify:track:1', 'spotify:track:2'], 'ytmusic')
+            assert matches == {'spotify:track:1': 'vid1'}
+    
+    def test_lookup_reverse_direction(self, app):
+        with app.app_context():
+            TrackMappingCache.store('spotify', 'spotify:track:1', 'ytmusic', 'vid1', 0.95)
+            db.session.commit()
+            
+            matches = TrackMappingCache.lookup_many('ytmusic', ['vid1'], 'spotify')
+            assert matches == {'vid1': 'spotify:track:1'}
+    
+    def test_store_updates_existing_mapping(self, app):
+        with app.app_context():
+            TrackMappingCache.store('spotify', 'spotify:track:1', 'ytmusic', 'vid1', 0.91)
+            TrackMappingCache.store('spotify', 'spotify:track:1', 'ytmusic', 'vid2', 0.97)
+            db.session.commit()
+            
+            mappings = TrackMapping.query.all()
+            assert len(mappings) == 1
+            assert mappings[0].target_id == 'vid2'
+            assert mappings[0].score == 0.97
+            assert mappings[0].matcher_version == MATCHER_VERSION
+    
+    def test_stale_matcher_version_ignored(self, app):
+        with app.app_context():
+            db.session.add(TrackMapping(
+                source_service='spotify',
+                source_id='spotify:track:1',
+                target_service='ytmusic',
+                target_id='vid1',
+                score=0.95,
+                matcher_version=MATCHER_VERSION - 1
+            ))
+            db.session.commit()
+            
+            assert TrackMappingCache.lookup_many('spotify', ['spotify:track:1'], 'ytmusic') == {}
+    
+    def test_missing_ids_are_not_stored(self, app):
+        with app.app_context():
+            assert TrackMappingCache.store('spotify', None, 'ytmusic', 'vid1', 0.95) is None
+            assert TrackMappingCache.lookup_many('spotify', [None], 'ytmusic') == {}
+    
+    def test_isrc_lookup_from_either_side(self, app):
+        with app.app_context():
+            for n in (1, 2):
+                db.session.add(TrackMapping(
+                    source_service='spotify', source_id=f'spotify:track:{n}',
+                    target_service='ytmusic', target_id=f'vid{n}', score=0.95,
+                    matcher_version=MATCHER_VERSION - 1, isrc='USRC17607839' if n == 1 else None
+                ))
+            db.session.commit()
+            
+            assert TrackMappingCache.lookup_with_isrcs('ytmusic', ['vid1', 'vid2'], 'spotify') == (
+                {}, {'vid1': 'USRC17607839'}
+            )
+            assert TrackMappingCache.lookup_with_isrcs('spotify', ['spotify:track:1'], 'ytmusic') == (
+                {}, {'spotify:track:1': 'USRC17607839'}
+            )
+    
+    def test_current_matches_need_no_isrc_lookup(self, app):
+        with app.app_context():
+            TrackMappingCache.store('spotify', 'spotify:track:1', 'ytmusic', 'vid1', 0.95, isrc='USRC17607839')
+            db.session.commit()
+            
+            assert TrackMappingCache.lookup_with_isrcs('ytmusic', ['vid1'], 'spotify') == (
+                {'vid1': 'spotify:track:1'}, {}
+            )
+    
+    def test_isrc_survives_matcher_version_and_updates(self, app):
+        with app.app_context():
+            db.session.add(TrackMapping(
+                source_service='spotify',
+                source_id='spotify:track:1',
+                target_service='ytmusic',
+                target_id='vid1',
+                score=0.95,
+                matcher_version=MATCHER_VERSION - 1,
+                isrc='USRC17607839'
+            ))
+            db.session.commit()
+            
+            assert TrackMappingCache.lookup_with_isrcs('ytmusic', ['vid1'], 'spotify') == (
+                {}, {'vid1': 'USRC17607839'}
+            )
+            
+            # Re-storing without an ISRC keeps the known one
+            TrackMappingCache.store('spotify', 'spotify:track:1', 'ytmusic', 'vid1', 0.97)
+            db.session.commit()
+            assert TrackMapping.query.one().isrc == 'USRC17607839'
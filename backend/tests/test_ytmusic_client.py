@@ -0,0 +1,86 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from backend.sync.batch_writer import RejectedItemsError
+from backend.sync.rate_limiter import SharedRateLimiter
+from backend.sync.ytmusic_client import YTMusicClient, YTMusicPool
+
+
+def make_client(pool, user_id='user_a'):
+    client = YTMusicClient(user_id)
+    client.rate_limiter = SharedRateLimiter(max_calls=100, period_seconds=60).for_user(user_id)
+    client.pool = pool
+    return client
+
+
+class TestYTMusicPool:
+    """Test the pooled YTMusic instances"""
+    
+    def test_instances_reused_across_calls_and_clients(self):
+        pool = YTMusicPool()
+        
+        with patch('backend.sync.ytmusic_client.TokenManager') as token_manager, \
+             patch('backend.sync.ytmusic_client.YTMusic') as ytmusic_cls:
+            token_manager.get_access_token.return_value = 'token_1'
+            ytmusic_cls.return_value.headers = {}
+            
+            make_client(pool).search('song')
+            make_client(pool).get_playlists()
+            
+            ytmusic_cls.assert_called_once()
+            assert ytmusic_cls.return_value.headers['Authorization'] == 'Bearer token_1'
+    
+    def test_concurrent_checkouts_get_separate_instances(self):
+        pool = YTMusicPool()
+        
+        with patch('backend.sync.ytmusic_client.YTMusic', side_effect=lambda: MagicMock(headers={})):
+            first = pool.acquire('user_a', 'token')
+            second = pool.acquire('user_a', 'token')
+            assert first is not second
+            
+            pool.release('user_a', first)
+            assert pool.acquire('user_a', 'token') is first
+            assert pool.acquire('user_b', 'token') is not first
+    
+    def test_auth_error_swaps_headers_in_place(self):
+        pool = YTMusicPool()
+        ytmusic = MagicMock(headers={})
+        ytmusic.search.side_effect = [Exception("Server returned HTTP 401: Unauthorized."), ['result']]
+        
+        with patch('backend.sync.ytmusic_client.TokenManager') as token_manager, \
+             patch('backend.sync.ytmusic_client.YTMusic', return_value=ytmusic) as ytmusic_cls:
+            token_manager.get_access_token.return_value = 'old_token'
+            token_manager.refresh_youtube_token.return_value = 'new_token'
+            
+            assert make_client(pool).search('song') == ['result']
+            
+            token_manager.refresh_youtube_token.assert_called_once_with('user_a', stale_token='old_token')
+            ytmusic_cls.assert_called_once()
+            assert ytmusic.headers['Authorization'] == 'Bearer new_token'
+    
+    def test_other_errors_do_not_refresh(self):
+        pool = YTMusicPool()
+        ytmusic = MagicMock(headers={})
+        ytmusic.search.side_effect = Exception("Server returned HTTP 500: Internal Server Error.")
+        
+        with patch('backend.sync.ytmusic_client.TokenManager') as token_manager, \
+             patch('backend.sync.ytmusic_client.YTMusic', return_value=ytmusic):
+            token_manager.get_access_token.return_value = 'token'
+            
+            with pytest.raises(Exception, match="HTTP 500"):
+                make_client(pool).search('song')
+            
+            token_manager.refresh_youtube_token.assert_not_called()
+            # The instance is still healthy and goes back to the pool
+            assert pool.acquire('user_a', 'token') is ytmusic
+    
+    def test_failed_add_status_rejects_items(self):
+        pool = YTMusicPool()
+        ytmusic = MagicMock(headers={})
+        ytmusic.add_playlist_items.return_value = {'status': 'STATUS_FAILED'}
+        
+        with patch('backend.sync.ytmusic_client.TokenManager') as token_manager, \
+             patch('backend.sync.ytmusic_client.YTMusic', return_value=ytmusic):
+            token_manager.get_access_token.return_value = 'token'
+            
+            with pytest.raises(RejectedItemsError, match="STATUS_FAILED"):
+                make_client(pool).add_playlist_items('pl1', ['vid1'])
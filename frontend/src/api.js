@@ -10,6 +10,15 @@ export const api = axios.create({
   },
 })
 
+// Dispatched on window once the backend has accepted a new sync job
+export const SYNC_STARTED_EVENT = 'musync:sync-started'
+
+const startSync = (path) =>
+  api.post(path, { user_id: USER_ID }).then((response) => {
+    window.dispatchEvent(new Event(SYNC_STARTED_EVENT))
+    return response
+  })
+
 export const endpoints = {
   health: () => api.get('/api/health'),
   
@@ -20,13 +29,14 @@ export const endpoints = {
   },
   
   sync: {
-    spotifyToYt: () => api.post('/api/sync/spotify-to-ytmusic', { user_id: USER_ID }),
-    ytToSpotify: () => api.post('/api/sync/ytmusic-to-spotify', { user_id: USER_ID }),
+    spotifyToYt: () => startSync('/api/sync/spotify-to-ytmusic'),
+    ytToSpotify: () => startSync('/api/sync/ytmusic-to-spotify'),
   },
   
   jobs: {
     getById: (jobId) => api.get(`/api/jobs/${jobId}`),
     getByUser: () => api.get(`/api/jobs/user/${USER_ID}`),
+    eventsUrl: (jobId) => `${API_BASE}/api/jobs/${jobId}/events`,
   },
   
   scheduler: {
@@ -1,5 +1,8 @@
-import { useState, useEffect } from 'react'
-import { endpoints } from '../api'
+import { useState, useEffect, useRef } from 'react'
+import { endpoints, SYNC_STARTED_EVENT } from '../api'
+
+// The active job is streamed over SSE; the job list itself only needs an occasional refresh
+const JOB_LIST_REFRESH_MS = 30000
 
 function useDashboardData() {
   const [stats, setStats] = useState({ total: 0, success: 0, failed: 0, running: 0 })
@@ -14,8 +17,8 @@ function useDashboardData() {
       const jobsRes = await endpoints.jobs.getByUser()
       const jobs = jobsRes.data
       const active = jobs.find(j => j.status === 'running' || j.status === 'pending')
-      setActiveJob(active || null)
-      setImgError(false)
+      // Keep the live fields the event stream has filled in for the same job
+      setActiveJob(prev => (active && prev && prev.id === active.id ? { ...prev, ...active } : active || null))
       const filtered = filter === 'all' ? jobs : jobs.filter(j => j.status === filter)
       setRecentJobs(filtered.slice(0, 20))
       setStats({
@@ -31,12 +34,53 @@ function useDashboardData() {
     }
   }
 
+  // Long-lived listeners call the latest loadData, which sees the current filter
+  const loadDataRef = useRef(loadData)
+  loadDataRef.current = loadData
+
   useEffect(() => {
     loadData()
-    const interval = setInterval(loadData, 3000)
+    const interval = setInterval(loadData, JOB_LIST_REFRESH_MS)
     return () => clearInterval(interval)
   }, [filter])
 
+  useEffect(() => {
+    // A newly started job should show up (and get streamed) without waiting for the next refresh
+    const reload = () => loadDataRef.current()
+    window.addEventListener(SYNC_STARTED_EVENT, reload)
+    return () => window.removeEventListener(SYNC_STARTED_EVENT, reload)
+  }, [])
+
+  const activeJobId = activeJob?.id
+  useEffect(() => {
+    if (!activeJobId) return
+    setImgError(false)
+    const source = new EventSource(endpoints.jobs.eventsUrl(activeJobId))
+    const update = (fields) => setActiveJob(job => (job && job.id === activeJobId ? { ...job, ...fields } : job))
+    const finish = () => {
+      source.close()
+      loadDataRef.current()
+    }
+
+    source.addEventListener('snapshot', (e) => {
+      const job = JSON.parse(e.data)
+      update(job)
+      if (job.status !== 'running' && job.status !== 'pending') finish()
+    })
+    source.addEventListener('progress', (e) => update(JSON.parse(e.data)))
+    source.addEventListener('track', (e) => {
+      const track = JSON.parse(e.data)
+      setImgError(false)
+      update({
+        current_track_name: track.name,
+        current_track_artist: track.artist,
+        current_track_image_url: track.image_url,
+      })
+    })
+    source.addEventListener('status', finish)
+    return () => source.close()
+  }, [activeJobId])
+
   return { stats, recentJobs, activeJob, imgError, setImgError, filter, setFilter, loading }
 }
 
@@ -1,4 +1,4 @@
-import { render, screen, waitFor } from "@testing-library/react";
+import { render, screen, waitFor, act } from "@testing-library/react";
 import { describe, it, expect, vi, beforeEach } from "vitest";
 import Dashboard from "../components/Dashboard";
 
@@ -48,10 +48,14 @@ const mockJobs = [
   },
 ];
 
+const mockGetByUser = vi.fn(() => Promise.resolve({ data: mockJobs }));
+
 vi.mock("../api", () => ({
+  SYNC_STARTED_EVENT: "musync:sync-started",
   endpoints: {
     jobs: {
-      getByUser: () => Promise.resolve({ data: mockJobs }),
+      getByUser: () => mockGetByUser(),
+      eventsUrl: (jobId) => `/api/jobs/${jobId}/events`,
     },
     sync: {
       spotifyToYt: vi.fn().mockResolvedValue({}),
@@ -60,6 +64,13 @@ vi.mock("../api", () => ({
   },
 }));
 
+// jsdom has no EventSource; the running job's stream just stays quiet
+class MockEventSource {
+  addEventListener() {}
+  close() {}
+}
+vi.stubGlobal("EventSource", MockEventSource);
+
 describe("Dashboard", () => {
   beforeEach(() => {
     vi.clearAllMocks();
@@ -168,4 +179,18 @@ describe("Dashboard", () => {
       expect(screen.getByText(/2 failed/)).toBeInTheDocument();
     });
   });
+
+  it("reloads the job list when a sync is started", async () => {
+    render(<Dashboard />);
+    await waitFor(() => {
+      expect(screen.getByText("Total Syncs")).toBeInTheDocument();
+    });
+    const calls = mockGetByUser.mock.calls.length;
+    act(() => {
+      window.dispatchEvent(new Event("musync:sync-started"));
+    });
+    await waitFor(() => {
+      expect(mockGetByUser.mock.calls.length).toBe(calls + 1);
+    });
+  });
 });